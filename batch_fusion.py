@@ -0,0 +1,267 @@
+"""
+Неинтерактивный режим: комбинирование свидетельств из файлов и пакетная обработка заданий
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
+
+from dempster_core import DempsterShafer, format_subset, parse_subset, sort_elements
+from data_adapters import JsonAdapter, NdjsonWriter, load_sources, make_source
+
+# Поддерживаемые правила комбинирования
+RULES = ('dempster', 'yager')
+
+
+def run_fusion(sources: List[Dict[str, Any]], rule: str = 'dempster',
+               discounts: Optional[Sequence[float]] = None,
+               queries: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Комбинирование источников и расчет Bel/Pl
+
+    Args:
+        sources: Источники, полученные из load_sources
+        rule: Правило комбинирования ('dempster' или 'yager')
+        discounts: Коэффициенты дисконтирования - один общий или по одному на источник
+        queries: События вида "{1,2}"; по умолчанию - все одноэлементные события
+
+    Returns:
+        Dict[str, Any]: Комбинированная BPA и значения Bel/Pl в сериализуемом виде
+    """
+    if rule not in RULES:
+        raise ValueError(f"Неизвестное правило комбинирования: {rule}")
+    if not sources:
+        raise ValueError("Не задано ни одного источника")
+
+    discounts = list(discounts or [])
+    if len(discounts) == 1:
+        discounts = discounts * len(sources)
+    if discounts and len(discounts) != len(sources):
+        raise ValueError(
+            f"Число коэффициентов дисконтирования ({len(discounts)}) "
+            f"не совпадает с числом источников ({len(sources)})"
+        )
+
+    # Фрейм - объединение заявленных фреймов и элементов фокальных множеств
+    frame = set()
+    parsed = []
+    for source in sources:
+        frame.update(source['frame_of_discernment'])
+        bpa = {}
+        for subset_str, mass in source['bpa'].items():
+            # Разные записи одного подмножества ("{1,2}", "{2,1}") объединяются
+            subset = parse_subset(subset_str)
+            bpa[subset] = bpa.get(subset, 0.0) + mass
+            frame.update(subset)
+        parsed.append(bpa)
+
+    ds = DempsterShafer(frame)
+    if rule == 'dempster':
+        if discounts:
+            combined = ds.dempster_combine_discounted(parsed, discounts)
+        else:
+            combined = ds.dempster_combine_multiple(*parsed)
+    else:
+        if discounts:
+            parsed = ds.discount_many(parsed, discounts)
+        combined = ds.yager_combine_multiple(*parsed)
+
+    if queries:
+        events = [parse_subset(query) for query in queries]
+    else:
+        events = [frozenset({element}) for element in sort_elements(frame)]
+
+    return {
+        'frame_of_discernment': sort_elements(frame),
+        'rule': rule,
+        'sources': [source['name'] for source in sources],
+        'discounts': discounts,
+        'combined': bpa_to_json(combined),
+        'queries': [
+            {
+                'event': format_subset(event),
+                'belief': ds.belief(event, combined),
+                'plausibility': ds.plausibility(event, combined),
+            }
+            for event in events
+        ],
+    }
+
+
+def bpa_to_json(bpa: Dict[FrozenSet, float]) -> Dict[str, float]:
+    """Преобразует BPA с ключами frozenset в словарь со строковыми ключами (без нулевых масс)"""
+    return {format_subset(subset): mass for subset, mass in bpa.items() if mass > 0}
+
+
+def run_job_file(job_path: str, output_dir: Optional[str] = None,
+                 default_rule: str = 'dempster') -> Dict[str, Any]:
+    """
+    Выполнение одного задания комбинирования из JSON файла
+
+    Задание имеет формат data/example_2_6.json: 'frame_of_discernment', 'sources'
+    (с данными 'data' или путем 'path' к файлу свидетельств относительно задания)
+    и необязательные 'parameters' с ключами 'method', 'discount', 'queries'.
+    Неизвестное правило 'method' - ошибка задания (статус 'error' в сводке).
+
+    Returns:
+        Dict[str, Any]: Сводка по заданию со статусом и временем выполнения
+    """
+    job_path = Path(job_path)
+    summary = {'job': job_path.name, 'status': 'ok'}
+    start = time.perf_counter()
+
+    try:
+        with open(job_path, 'r', encoding='utf-8') as f:
+            job = json.load(f)
+
+        parameters = job.get('parameters', {})
+        rule = parameters.get('method', default_rule)
+        if rule not in RULES:
+            raise ValueError(f"Неизвестное правило комбинирования: {rule}. Доступны: {', '.join(RULES)}")
+        discount = parameters.get('discount')
+        if isinstance(discount, (int, float)):
+            discount = [discount]
+
+        # Источники со ссылками на файлы загружаются через адаптеры,
+        # встроенные данные проходят ту же валидацию, что и JSON файлы
+        frame = job.get('frame_of_discernment', [])
+        json_adapter = JsonAdapter()
+        sources = []
+        for i, source in enumerate(job.get('sources', [])):
+            name = source.get('name', f"{job_path.stem}[{i}]")
+            if 'path' in source:
+                loaded = load_sources([str(job_path.parent / source['path'])])
+                for entry in loaded:
+                    entry['name'] = name if len(loaded) == 1 else entry['name']
+                sources.extend(loaded)
+            else:
+                entry = {'frame_of_discernment': frame, 'data': source.get('data')}
+                sources.append(make_source(json_adapter, name, entry, str(job_path)))
+        if 'data' in job:
+            sources.append(make_source(json_adapter, job_path.stem, job, str(job_path)))
+        load_time = time.perf_counter() - start
+
+        result = run_fusion(sources, rule, discount, parameters.get('queries'))
+        summary['load_seconds'] = load_time
+        summary['fusion_seconds'] = time.perf_counter() - start - load_time
+
+        if output_dir is not None:
+            output_path = Path(output_dir) / f"{job_path.stem}.result.json"
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            summary['output'] = str(output_path)
+        else:
+            summary['result'] = result
+
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        summary['status'] = 'error'
+        summary['error'] = str(e)
+
+    summary['total_seconds'] = time.perf_counter() - start
+    return summary
+
+
+def run_job_directory(jobs_dir: str, output_dir: Optional[str], workers: int = 1,
+                      default_rule: str = 'dempster',
+                      ndjson_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Выполнение всех заданий (*.json) из директории
+
+    Args:
+        jobs_dir: Директория с файлами заданий
+        output_dir: Директория для результатов (файл на задание)
+        workers: Число процессов; 1 - выполнение в текущем процессе
+        ndjson_path: Вместо файлов в output_dir - один NDJSON файл, в который
+            результаты дописываются строками по мере готовности
+
+    Returns:
+        List[Dict[str, Any]]: Сводки по заданиям в порядке имен файлов
+    """
+    job_paths = sorted(str(path) for path in Path(jobs_dir).glob('*.json'))
+    if ndjson_path is not None:
+        output_dir = None
+    else:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    writer = NdjsonWriter(ndjson_path) if ndjson_path is not None else None
+    summaries = []
+
+    def collect(summary: Dict[str, Any]):
+        if writer is not None and summary['status'] == 'ok':
+            writer.write({'job': summary['job'], **summary.pop('result')})
+            summary['output'] = ndjson_path
+        summaries.append(summary)
+
+    try:
+        if workers <= 1:
+            for path in job_paths:
+                collect(run_job_file(path, output_dir, default_rule))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_job_file, path, output_dir, default_rule) for path in job_paths]
+                for future in as_completed(futures):
+                    collect(future.result())
+    finally:
+        if writer is not None:
+            writer.close()
+
+    summaries.sort(key=lambda summary: summary['job'])
+    return summaries
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создает парсер аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="Комбинирование свидетельств теории Демпстера-Шейфера без интерактивного меню",
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    combine = subparsers.add_parser('combine', help="Комбинирование источников из файлов JSON/CSV")
+    combine.add_argument('files', nargs='+', help="Файлы свидетельств или каталоги")
+    combine.add_argument('--rule', choices=RULES, default='dempster', help="Правило комбинирования")
+    combine.add_argument('--discount', type=float, nargs='+',
+                         help="Коэффициенты дисконтирования (один общий или по одному на источник)")
+    combine.add_argument('--query', nargs='+', help="События для расчета Bel/Pl, например \"{1,2}\"")
+    combine.add_argument('--output', help="Файл результата (по умолчанию - stdout)")
+
+    batch = subparsers.add_parser('batch', help="Обработка директории заданий")
+    batch.add_argument('jobs_dir', help="Директория с заданиями *.json")
+    output = batch.add_mutually_exclusive_group(required=True)
+    output.add_argument('--output-dir', help="Директория для результатов (файл на задание)")
+    output.add_argument('--ndjson', help="Один NDJSON файл со строкой результата на задание")
+    batch.add_argument('--workers', type=int, default=1, help="Число процессов")
+    batch.add_argument('--rule', choices=RULES, default='dempster',
+                       help="Правило по умолчанию для заданий без 'method'")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входа неинтерактивного режима; возвращает код завершения"""
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'combine':
+        start = time.perf_counter()
+        try:
+            sources = load_sources(args.files)
+            result = run_fusion(sources, args.rule, args.discount, args.query)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка: {e}", file=sys.stderr)
+            return 1
+        result['elapsed_seconds'] = time.perf_counter() - start
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+        else:
+            json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+            print()
+        return 0
+
+    summaries = run_job_directory(args.jobs_dir, args.output_dir, args.workers, args.rule, args.ndjson)
+    for summary in summaries:
+        print(json.dumps(summary, ensure_ascii=False))
+    return 0 if all(summary['status'] == 'ok' for summary in summaries) else 1
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк путей комбинирования на синтетических нагрузках
+
+Для каждого набора параметров замеряется время эталона (float64) и путей из
+differential.ENGINES, а также максимальное расхождение с эталоном.
+
+Пример:
+    python benchmarks/bench_engines.py --sources 2 8 32 --frame-size 8 --seeds 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Добавляем путь к проекту
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from differential import ENGINES, generate_workloads, reference_combine, run_differential
+from synthetic_workload import CARDINALITIES, WorkloadSpec
+
+
+def _total_time(function, workloads) -> float:
+    """Суммарное время пути по нагрузкам (нагрузки с полным конфликтом учитываются тоже)"""
+    elapsed = 0.0
+    for workload in workloads:
+        start = time.perf_counter()
+        try:
+            function(workload)
+        except ValueError:
+            pass
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк путей комбинирования на синтетических нагрузках")
+    parser.add_argument('--sources', type=int, nargs='+', default=[2, 8, 32], help="Число источников")
+    parser.add_argument('--frame-size', type=int, default=8, help="Размер фрейма")
+    parser.add_argument('--focal', type=int, default=6, help="Число фокальных элементов источника")
+    parser.add_argument('--cardinality', choices=CARDINALITIES, default='uniform')
+    parser.add_argument('--conflict', type=float, nargs='+', default=[0.0, 0.5, 0.9], help="Уровни конфликта")
+    parser.add_argument('--seeds', type=int, default=3, help="Число зерен на набор параметров")
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    args = parser.parse_args(argv)
+
+    header = f"{'источники':>9} {'конфликт':>8} {'путь':<18} {'время, с':>10} {'расхождение':>12}"
+    print(header)
+    print('-' * len(header))
+    for sources in args.sources:
+        for conflict in args.conflict:
+            spec = WorkloadSpec(frame_size=args.frame_size, source_count=sources, focal_count=args.focal,
+                                cardinality=args.cardinality, conflict=conflict)
+            workloads = generate_workloads([spec], range(args.seeds))
+
+            elapsed = _total_time(reference_combine, workloads)
+            print(f"{sources:>9} {conflict:>8.2f} {'float64':<18} {elapsed:>10.4f} {'-':>12}")
+
+            for name in args.engines:
+                engine, metric, tolerance = ENGINES[name]
+                elapsed = _total_time(engine, workloads)
+                report = run_differential(engine, workloads, tolerance, metric, name)
+                mark = '' if report.ok else ' !'
+                print(f"{'':>9} {'':>8} {name:<18} {elapsed:>10.4f} {report.max_error:>12.3g}{mark}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
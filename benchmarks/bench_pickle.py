@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сериализации: размер и время pickle/unpickle объектов проекта
+
+Сравниваются BPA-словарь, FrozenBPA и PackedBPA (протокол 5, в том числе
+с внеполосными буферами), а также DempsterShafer с построенным all_subsets.
+
+Пример:
+    python benchmarks/bench_pickle.py --frame-size 16 --sources 6 --repeat 20
+"""
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+# Добавляем путь к проекту
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from numeric_modes import MAX_COMMONALITY_FRAME, MAX_PACKED_FRAME, PackedBPA
+from synthetic_workload import WorkloadSpec, generate_workload
+
+
+def round_trip(obj, repeat: int, out_of_band: bool):
+    """Размер (основной поток, буферы) и среднее время dumps и loads"""
+    buffers = []
+    callback = buffers.append if out_of_band else None
+    data = pickle.dumps(obj, protocol=5, buffer_callback=callback)
+    buffer_bytes = sum(buffer.raw().nbytes for buffer in buffers)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        buffers = []
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append if out_of_band else None)
+    dumps_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        pickle.loads(data, buffers=buffers)
+    loads_time = (time.perf_counter() - start) / repeat
+    return len(data), buffer_bytes, dumps_time, loads_time
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк сериализации объектов проекта")
+    parser.add_argument('--frame-size', type=int, default=16, help="Размер фрейма")
+    parser.add_argument('--sources', type=int, default=6, help="Число комбинируемых источников")
+    parser.add_argument('--focal', type=int, default=12, help="Число фокальных элементов источника")
+    parser.add_argument('--repeat', type=int, default=20, help="Число повторов замера")
+    parser.add_argument('--seed', type=int, default=0, help="Зерно нагрузки")
+    args = parser.parse_args(argv)
+
+    spec = WorkloadSpec(frame_size=args.frame_size, source_count=args.sources, focal_count=args.focal)
+    workload = generate_workload(spec, args.seed)
+    ds = workload.ds()
+    bpa = ds.dempster_combine_multiple(*workload.bpas)
+    frozen = ds.freeze(bpa)
+    frozen.belief(set())
+
+    objects = [
+        ('dict BPA', bpa, False),
+        ('FrozenBPA', frozen, False),
+        ('FrozenBPA (буферы)', frozen, True),
+    ]
+    if args.frame_size <= MAX_PACKED_FRAME:
+        objects.append(('PackedBPA (буферы)', PackedBPA.from_bpa(ds, bpa, 'float64'), True))
+    # all_subsets строится только для фреймов, где 2^n подмножеств помещаются в память
+    if args.frame_size <= MAX_COMMONALITY_FRAME:
+        ds.all_subsets
+        objects.append((f'DempsterShafer (2^{args.frame_size})', ds, False))
+    print(f"Фокальных элементов: {len(frozen)}")
+    header = f"{'объект':<24} {'поток, Б':>10} {'буферы, Б':>10} {'dumps, мс':>10} {'loads, мс':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, obj, out_of_band in objects:
+        size, buffer_bytes, dumps_time, loads_time = round_trip(obj, args.repeat, out_of_band)
+        print(f"{name:<24} {size:>10} {buffer_bytes:>10} {dumps_time * 1e3:>10.3f} {loads_time * 1e3:>10.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
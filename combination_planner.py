@@ -0,0 +1,345 @@
+"""
+Планировщик порядка комбинирования нескольких источников
+
+Правило Демпстера (и ненормированное правило Сметса) ассоциативно и
+коммутативно: результат не зависит от порядка, а время - зависит. Шаг
+X ⊕ Y перебирает |F_X|·|F_Y| пар фокальных элементов, и если первыми
+объединить "размытые" источники, промежуточные BPA разрастаются.
+
+Оценка размера промежуточной BPA строится по структуре фокальных элементов
+(маски без масс):
+    - если пар не больше EXACT_PAIRS, различные пересечения считаются точно,
+      и узел хранит весь набор масок;
+    - иначе из пар берется случайная выборка SAMPLE_PAIRS и по числу
+      различных пересечений d и частотам f_j (число масок, встреченных в
+      выборке j раз) берется большая из двух оценок:
+        GEE (Charikar et al., 2000): D ≈ sqrt(N/m)·f1 + Σ_{j≥2} f_j;
+        равночастотная: D из уравнения d = D·(1 - exp(-m/D)).
+      GEE занижает оценку при почти неповторяющихся пересечениях, вторая -
+      при сильно неравных частотах. Узел хранит встреченные маски как
+      образец структуры, поэтому на следующих уровнях погрешность растет;
+      фактические размеры после execute позволяют подобрать параметры.
+    Оценка ограничена N = |F_X|·|F_Y| и 2^|ядро X ∩ ядро Y| (+1 для ∅).
+
+Стратегии:
+    given     - свертка в порядке аргументов (как dempster_combine_multiple)
+    left_deep - свертка по возрастанию числа фокальных элементов источника
+    greedy    - дерево: на каждом шаге объединяется пара узлов с наименьшей
+                оценкой стоимости |F_X|·|F_Y| (при равенстве - с меньшим
+                результатом); пара ищется среди GREEDY_WINDOW наименьших
+                узлов кучи, поэтому планирование - O(N log N) шагов кучи
+                и O(GREEDY_WINDOW²) оценок пар на шаг вместо O(N²)
+
+Правило Ягера не ассоциативно: перестановка источников меняет результат,
+поэтому для него доступна только стратегия given - план оценивает стоимость
+свертки в порядке аргументов (перенос конфликта на Ω не меняет структуру
+фокальных элементов, кроме добавления Ω).
+"""
+import heapq
+import math
+import random
+import time
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from combination_rules import EMPTY, conjunctive_pass, rescale_nonempty
+
+# Стратегии планирования
+STRATEGIES = ('given', 'left_deep', 'greedy')
+
+# Правила, для которых порядок не влияет на результат
+PLANNABLE_RULES = ('dempster', 'smets')
+
+# Все правила планировщика (yager - только в порядке аргументов)
+RULES = PLANNABLE_RULES + ('yager',)
+
+# Точный подсчет пересечений до этого числа пар, иначе выборка
+EXACT_PAIRS = 1 << 16
+SAMPLE_PAIRS = 4096
+
+# Число наименьших узлов, среди пар которых жадная стратегия выбирает шаг
+GREEDY_WINDOW = 6
+
+# Узлы плана нумеруются числами: источники - 0..n-1, результат шага k - n+k
+
+
+class _Structure:
+    """Оценка структуры узла: число фокальных элементов, образец масок, ядро"""
+
+    def __init__(self, size: float, masks: List[int], exact: bool, core: int):
+        self.size = size
+        self.masks = masks
+        self.exact = exact
+        self.core = core
+
+
+class PlanStep:
+    """Шаг плана: комбинирование двух узлов с оценками и фактическими значениями"""
+
+    def __init__(self, left: int, right: int, estimated_pairs: float, estimated_size: float):
+        self.left = left
+        self.right = right
+        self.estimated_pairs = estimated_pairs
+        self.estimated_size = estimated_size
+        # Заполняются при выполнении
+        self.actual_pairs: Optional[int] = None
+        self.actual_size: Optional[int] = None
+        self.seconds: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            'left': self.left, 'right': self.right,
+            'estimated_pairs': self.estimated_pairs, 'estimated_size': self.estimated_size,
+            'actual_pairs': self.actual_pairs, 'actual_size': self.actual_size,
+            'seconds': self.seconds,
+        }
+
+
+class CombinationPlan:
+    """
+    План комбинирования: шаги в порядке выполнения
+
+    Шаг k объединяет узлы step.left и step.right; источники - узлы 0..n-1,
+    результат шага k - узел n+k, итог - результат последнего шага.
+    """
+
+    def __init__(self, rule: str, strategy: str, steps: List[PlanStep]):
+        self.rule = rule
+        self.strategy = strategy
+        self.steps = steps
+
+    @property
+    def tree(self) -> str:
+        """Дерево плана в виде вложенных пар номеров источников"""
+        n = len(self.steps) + 1
+        # Строится без рекурсии: глубина дерева может быть порядка числа источников
+        texts = [str(i) for i in range(n)]
+        for step in self.steps:
+            texts.append(f"({texts[step.left]}, {texts[step.right]})")
+        return texts[-1]
+
+    @property
+    def estimated_cost(self) -> float:
+        """Оценка общего числа перебираемых пар"""
+        return sum(step.estimated_pairs for step in self.steps)
+
+    @property
+    def actual_cost(self) -> Optional[int]:
+        """Фактическое число перебранных пар (после execute)"""
+        if any(step.actual_pairs is None for step in self.steps):
+            return None
+        return sum(step.actual_pairs for step in self.steps)
+
+    def report(self) -> str:
+        """Таблица оценок и фактических значений по шагам"""
+        lines = [f"Правило {self.rule}, стратегия {self.strategy}: дерево {self.tree}",
+                 f"{'шаг':>4} {'пары (оценка)':>14} {'пары':>10} {'размер (оценка)':>16} {'размер':>8} {'время, с':>9}"]
+        for i, step in enumerate(self.steps, 1):
+            lines.append(f"{i:>4} {step.estimated_pairs:>14.0f} {_fmt(step.actual_pairs):>10} "
+                         f"{step.estimated_size:>16.1f} {_fmt(step.actual_size):>8} "
+                         f"{_fmt(step.seconds, '.4f'):>9}")
+        lines.append(f"Итого пар: оценка {self.estimated_cost:.0f}, факт {_fmt(self.actual_cost)}")
+        return '\n'.join(lines)
+
+    def execute(self, ds, bpas: Sequence[Dict[FrozenSet, float]]) -> Dict[FrozenSet, float]:
+        """
+        Выполнение плана; шаги получают фактическое число пар, размер и время
+
+        Для dempster и smets узел хранит непустую часть ненормированного
+        конъюнктивного произведения, нормированную к сумме 1, и логарифм ее
+        исходной суммы (от непустых частей входов зависит только непустая
+        часть результата), поэтому длинные цепочки не уходят в ноль.
+        Для yager каждый шаг - ds.yager_combine.
+        """
+        if len(bpas) != len(self.steps) + 1:
+            raise ValueError(f"План составлен для {len(self.steps) + 1} источников, передано {len(bpas)}")
+        nodes: Dict[int, Tuple[Dict[FrozenSet, float], float]] = {
+            i: rescale_nonempty(bpa, 0.0) if self.rule != 'yager' else
+            ({subset: mass for subset, mass in bpa.items() if mass != 0}, 0.0)
+            for i, bpa in enumerate(bpas)
+        }
+        for node_id, step in enumerate(self.steps, len(bpas)):
+            (left, left_scale), (right, right_scale) = nodes.pop(step.left), nodes.pop(step.right)
+            start = time.perf_counter()
+            if self.rule == 'yager':
+                combined = {subset: mass for subset, mass in ds.yager_combine(left, right).items() if mass != 0}
+                size, node = len(combined), (combined, 0.0)
+            elif not left or not right:
+                # Полный конфликт уже в одном из входов
+                size, node = 1, ({}, -math.inf)
+            else:
+                intersections = conjunctive_pass(left, right).intersections
+                size = sum(1 for mass in intersections.values() if mass != 0)
+                node = rescale_nonempty(intersections, left_scale + right_scale)
+            step.seconds = time.perf_counter() - start
+            step.actual_pairs = len(left) * len(right)
+            step.actual_size = size
+            nodes[node_id] = node
+
+        (masses, log_scale), = nodes.values()
+        if self.rule == 'yager':
+            result = dict(masses)
+        elif self.rule == 'smets':
+            scale = math.exp(log_scale)
+            result = {subset: mass * scale for subset, mass in masses.items()}
+            result[EMPTY] = max(0.0, 1.0 - scale)
+            return result
+        else:
+            if not masses:
+                raise ValueError("Полный конфликт между источниками!")
+            # Непустая часть уже нормирована на сумму непустых масс
+            result = dict(masses)
+        result[EMPTY] = 0.0
+        return result
+
+
+def _fmt(value, spec: str = 'd') -> str:
+    return '-' if value is None else format(value, spec)
+
+
+def _leaf_structure(ds, bpa: Dict[FrozenSet, float]) -> _Structure:
+    masks = sorted({ds.subset_to_mask(subset) for subset, mass in bpa.items() if mass != 0})
+    core = 0
+    for mask in masks:
+        core |= mask
+    return _Structure(len(masks), masks, True, core)
+
+
+def _node_structure(structure: _Structure, omega: int) -> _Structure:
+    """Структура узла как входа следующего шага: dempster и smets не хранят ∅ (см. execute)"""
+    if omega or 0 not in structure.masks:
+        return structure
+    masks = [mask for mask in structure.masks if mask != 0]
+    return _Structure(max(structure.size - 1, float(len(masks))), masks, structure.exact, structure.core)
+
+
+def _merge_structure(x: _Structure, y: _Structure, rng: random.Random, omega: int = 0) -> _Structure:
+    """Оценка структуры X ⊕ Y по образцам масок (omega - маска Ω для правила Ягера)"""
+    merged = _intersection_structure(x, y, rng)
+    if omega and 0 in merged.masks:
+        # Конфликт по Ягеру переносится с ∅ на Ω; ядро - уже весь фрейм
+        masks = [mask for mask in merged.masks if mask != 0]
+        size = merged.size - 1
+        if omega not in masks:
+            masks.append(omega)
+            size += 1
+        return _Structure(size, sorted(masks), merged.exact, omega)
+    return merged
+
+
+def _intersection_structure(x: _Structure, y: _Structure, rng: random.Random) -> _Structure:
+    """Оценка структуры конъюнктивной комбинации X ⊗ Y"""
+    core = x.core & y.core
+    pairs = x.size * y.size
+    # Различных непустых подмножеств общего ядра не больше 2^|ядро|, плюс ∅
+    limit = min(pairs, 2.0 ** bin(core).count('1') + 1)
+
+    if x.exact and y.exact and pairs <= EXACT_PAIRS:
+        masks = sorted({a & b for a in x.masks for b in y.masks})
+        return _Structure(len(masks), masks, True, core)
+
+    counts: Dict[int, int] = {}
+    for _ in range(SAMPLE_PAIRS):
+        mask = rng.choice(x.masks) & rng.choice(y.masks)
+        counts[mask] = counts.get(mask, 0) + 1
+    distinct = len(counts)
+    f1 = sum(1 for count in counts.values() if count == 1)
+    gee = math.sqrt(pairs / SAMPLE_PAIRS) * f1 + (distinct - f1)
+    estimate = max(gee, _uniform_estimate(distinct, SAMPLE_PAIRS, pairs))
+    size = max(float(distinct), min(estimate, limit))
+    return _Structure(size, sorted(counts), False, core)
+
+
+def _uniform_estimate(distinct: int, sample: int, population: float) -> float:
+    """Решение d = D·(1 - exp(-m/D)) относительно D бисекцией (D ≤ population)"""
+    if distinct >= sample:
+        return population
+    low, high = float(distinct), float(population)
+    for _ in range(60):
+        middle = (low + high) / 2
+        if middle * -math.expm1(-sample / middle) < distinct:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def plan_combination(ds, bpas: Sequence[Dict[FrozenSet, float]], rule: str = 'dempster',
+                     strategy: str = 'greedy', seed: Optional[int] = 0) -> CombinationPlan:
+    """
+    Выбор порядка (дерева) комбинирования источников
+
+    Args:
+        ds: Экземпляр DempsterShafer
+        bpas: BPA источников
+        rule: Правило из RULES
+        strategy: Стратегия из STRATEGIES (для yager - только given)
+        seed: Зерно выборки пар при оценке больших узлов
+
+    Returns:
+        CombinationPlan: Дерево, шаги с оценками (execute выполняет план)
+    """
+    if rule not in RULES:
+        raise ValueError(f"Неизвестное правило: {rule}. Доступны: {', '.join(RULES)}")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия: {strategy}. Доступны: {', '.join(STRATEGIES)}")
+    if rule not in PLANNABLE_RULES and strategy != 'given':
+        raise ValueError(f"Правило {rule} не ассоциативно, порядок комбинирования менять нельзя")
+    if not bpas:
+        raise ValueError("Нет источников для комбинирования")
+    rng = random.Random(seed)
+    omega = ds.subset_to_mask(ds.frame) if rule == 'yager' else 0
+    structures: Dict[int, _Structure] = {i: _node_structure(_leaf_structure(ds, bpa), omega)
+                                         for i, bpa in enumerate(bpas)}
+    steps: List[PlanStep] = []
+
+    def merge(left: int, right: int, merged: Optional[_Structure] = None) -> int:
+        x, y = structures.pop(left), structures.pop(right)
+        if merged is None:
+            merged = _merge_structure(x, y, rng, omega)
+        steps.append(PlanStep(left, right, x.size * y.size, merged.size))
+        node = len(bpas) + len(steps) - 1
+        structures[node] = _node_structure(merged, omega)
+        return node
+
+    if strategy in ('given', 'left_deep'):
+        order = list(range(len(bpas)))
+        if strategy == 'left_deep':
+            order.sort(key=lambda i: (structures[i].size, bin(structures[i].core).count('1')))
+        node = order[0]
+        for i in order[1:]:
+            node = merge(node, i)
+        return CombinationPlan(rule, strategy, steps)
+
+    # greedy: стоимость |F_X|·|F_Y| минимальна у пары самых маленьких узлов,
+    # поэтому пара выбирается среди GREEDY_WINDOW наименьших узлов кучи
+    # (при равной стоимости - с меньшей оценкой результата); оценки пар кешируются
+    heap = [(structure.size, i) for i, structure in enumerate(structures.values())]
+    heapq.heapify(heap)
+    estimates: Dict[Tuple[int, int], _Structure] = {}
+
+    def estimate(a: int, b: int) -> _Structure:
+        pair = (min(a, b), max(a, b))
+        if pair not in estimates:
+            estimates[pair] = _merge_structure(structures[a], structures[b], rng)
+        return estimates[pair]
+
+    while len(heap) > 1:
+        window = [heapq.heappop(heap) for _ in range(min(GREEDY_WINDOW, len(heap)))]
+        best = None
+        for i in range(len(window)):
+            for j in range(i + 1, len(window)):
+                a, b = window[i][1], window[j][1]
+                merged = estimate(a, b)
+                key = (window[i][0] * window[j][0], merged.size, i, j)
+                if best is None or key < best[0]:
+                    best = (key, i, j, merged)
+        _, i, j, merged = best
+        left, right = window[i][1], window[j][1]
+        node = merge(left, right, merged)
+        for k, item in enumerate(window):
+            if k != i and k != j:
+                heapq.heappush(heap, item)
+        heapq.heappush(heap, (structures[node].size, node))
+        for pair in [pair for pair in estimates if left in pair or right in pair]:
+            del estimates[pair]
+    return CombinationPlan(rule, strategy, steps)
@@ -0,0 +1,169 @@
+"""
+Ядро правил комбинирования: один конъюнктивный проход - несколько правил
+
+Все правила комбинирования двух источников строятся из одних и тех же
+попарных пересечений фокальных элементов. conjunctive_pass вычисляет их
+один раз, а функции правил только перераспределяют массу конфликта:
+
+    dempster      - нормировка на сумму непустых масс, в точной арифметике
+                    равную 1 - K (раздел 2.6.1)
+    yager         - конфликт переносится на Ω (раздел 2.6.3)
+    smets         - ненормированное правило, конфликт остается на ∅
+    dubois_prade  - масса конфликтующей пары переносится на A ∪ B
+    pcr5          - пропорциональное перераспределение конфликта (PCR5)
+
+Новые правила подключаются через register_rule.
+"""
+import math
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+EMPTY = frozenset()
+
+
+class ConjunctivePass:
+    """Результат конъюнктивного прохода по парам фокальных элементов двух источников"""
+
+    def __init__(self, intersections: Dict[FrozenSet, float], conflict: float,
+                 conflicting_pairs: Optional[List[Tuple[FrozenSet, float, FrozenSet, float]]]):
+        # Массы всех пересечений, включая пустое (его масса равна конфликту)
+        self.intersections = intersections
+        # Конфликт K = Σ m1(A)·m2(B) по парам с A ∩ B = ∅
+        self.conflict = conflict
+        # Конфликтующие пары (A, m1(A), B, m2(B)); None, если не запрашивались
+        self.conflicting_pairs = conflicting_pairs
+
+
+def conjunctive_pass(bpa1: Dict[FrozenSet, float], bpa2: Dict[FrozenSet, float],
+                     keep_conflicting_pairs: bool = False) -> ConjunctivePass:
+    """
+    Вычисляет массы пересечений и конфликт за один проход по парам
+
+    Args:
+        bpa1, bpa2: Комбинируемые BPA
+        keep_conflicting_pairs: Сохранять конфликтующие пары (нужны Dubois-Prade и PCR5)
+    """
+    intersections = {}
+    conflict = 0.0
+    pairs = [] if keep_conflicting_pairs else None
+
+    for s1, m1 in bpa1.items():
+        for s2, m2 in bpa2.items():
+            product = m1 * m2
+            intersection = s1 & s2
+            intersections[intersection] = intersections.get(intersection, 0.0) + product
+            if not intersection:
+                conflict += product
+                if pairs is not None and product > 0:
+                    pairs.append((s1, m1, s2, m2))
+
+    return ConjunctivePass(intersections, conflict, pairs)
+
+
+def rescale_nonempty(masses: Dict[FrozenSet, float], log_scale: float = 0.0) -> Tuple[Dict[FrozenSet, float], float]:
+    """
+    Нормировка непустой части BPA к сумме 1 с переносом суммы в логарифм масштаба
+
+    Длинные цепочки ненормированных конъюнктивных комбинаций хранятся как пара
+    (непустая часть с суммой 1, логарифм ее исходной суммы), поэтому массы не
+    уходят в ноль. Полный конфликт - ({}, -inf).
+    """
+    masses = {subset: mass for subset, mass in masses.items() if subset and mass != 0}
+    total = sum(masses.values())
+    if total <= 0:
+        return {}, -math.inf
+    return {subset: mass / total for subset, mass in masses.items()}, log_scale + math.log(total)
+
+
+def dempster_rule(result: ConjunctivePass, omega: FrozenSet) -> Dict[FrozenSet, float]:
+    """Правило Демпстера - совпадает с DempsterShafer.dempster_combine"""
+    # Нормировка на сумму непустых масс (в точной арифметике 1 - K)
+    z = sum(mass for subset, mass in result.intersections.items() if subset)
+    if z <= 0:
+        raise ValueError("Полный конфликт между источниками!")
+    combined = {subset: mass / z for subset, mass in result.intersections.items() if subset}
+    combined[EMPTY] = 0.0
+    return combined
+
+
+def yager_rule(result: ConjunctivePass, omega: FrozenSet) -> Dict[FrozenSet, float]:
+    """Правило Ягера - совпадает с DempsterShafer.yager_combine"""
+    combined = dict(result.intersections)
+    combined[omega] = combined.get(omega, 0.0) + result.conflict
+    combined[EMPTY] = 0.0
+    return combined
+
+
+def smets_rule(result: ConjunctivePass, omega: FrozenSet) -> Dict[FrozenSet, float]:
+    """Ненормированное правило Сметса (TBM): масса конфликта остается на ∅"""
+    combined = dict(result.intersections)
+    combined[EMPTY] = result.conflict
+    return combined
+
+
+def dubois_prade_rule(result: ConjunctivePass, omega: FrozenSet) -> Dict[FrozenSet, float]:
+    """Правило Дюбуа-Прада: m1(A)·m2(B) конфликтующей пары переносится на A ∪ B"""
+    combined = dict(result.intersections)
+    for s1, m1, s2, m2 in result.conflicting_pairs:
+        union = s1 | s2
+        combined[union] = combined.get(union, 0.0) + m1 * m2
+    combined[EMPTY] = 0.0
+    return combined
+
+
+def pcr5_rule(result: ConjunctivePass, omega: FrozenSet) -> Dict[FrozenSet, float]:
+    """
+    Правило PCR5: конфликт пары (A, B) делится между A и B пропорционально массам
+
+        m(A) += m1(A)² · m2(B) / (m1(A) + m2(B))
+        m(B) += m2(B)² · m1(A) / (m1(A) + m2(B))
+    """
+    combined = dict(result.intersections)
+    for s1, m1, s2, m2 in result.conflicting_pairs:
+        total = m1 + m2
+        combined[s1] = combined.get(s1, 0.0) + m1 * m1 * m2 / total
+        combined[s2] = combined.get(s2, 0.0) + m2 * m2 * m1 / total
+    combined[EMPTY] = 0.0
+    return combined
+
+
+# Реестр правил: имя -> (функция правила, нужны ли конфликтующие пары)
+RULES: Dict[str, Tuple[Callable[[ConjunctivePass, FrozenSet], Dict[FrozenSet, float]], bool]] = {
+    'dempster': (dempster_rule, False),
+    'yager': (yager_rule, False),
+    'smets': (smets_rule, False),
+    'dubois_prade': (dubois_prade_rule, True),
+    'pcr5': (pcr5_rule, True),
+}
+
+
+def register_rule(name: str, rule: Callable[[ConjunctivePass, FrozenSet], Dict[FrozenSet, float]],
+                  needs_conflicting_pairs: bool = False):
+    """Регистрация пользовательского правила, работающего поверх конъюнктивного прохода"""
+    RULES[name] = (rule, needs_conflicting_pairs)
+
+
+def combine(bpa1: Dict[FrozenSet, float], bpa2: Dict[FrozenSet, float],
+            rules: Iterable[str] = ('dempster',),
+            omega: Optional[FrozenSet] = None) -> Dict[str, Dict[FrozenSet, float]]:
+    """
+    Комбинирование двух источников сразу несколькими правилами
+
+    Args:
+        bpa1, bpa2: Комбинируемые BPA
+        rules: Имена правил из RULES
+        omega: Универсальное множество (по умолчанию - объединение фокальных элементов)
+
+    Returns:
+        Dict[str, Dict]: Результат каждого запрошенного правила
+    """
+    rules = list(rules)
+    unknown = [name for name in rules if name not in RULES]
+    if unknown:
+        raise ValueError(f"Неизвестные правила комбинирования: {', '.join(unknown)}")
+
+    if omega is None:
+        omega = frozenset().union(*bpa1, *bpa2)
+
+    needs_pairs = any(RULES[name][1] for name in rules)
+    result = conjunctive_pass(bpa1, bpa2, keep_conflicting_pairs=needs_pairs)
+    return {name: RULES[name][0](result, omega) for name in rules}
@@ -2,5 +2,25 @@ from .base_adapter import BaseDataAdapter
 from .json_adapter import JsonAdapter
 from .csv_adapter import CsvAdapter
 from .dict_adapter import DictAdapter
+from .registry import adapter_for_file, create_adapter, format_for_file, register_adapter, registered_formats
+from .directory_loader import DirectoryLoad, FileError, LoadedSource, load_directory
+from .ndjson_stream import NdjsonWriter, iter_ndjson, bpa_to_record, record_to_bpa
+from .source_loader import load_sources, make_source, parse_bpa, validate_bpa
 
-__all__ = ['BaseDataAdapter', 'JsonAdapter', 'CsvAdapter', 'DictAdapter']
\ No newline at end of file
+# Асинхронный загрузчик тянет asyncio, поэтому импортируется при первом обращении
+_ASYNC_LOADER_NAMES = ('iter_sources_as_completed', 'load_sources_async', 'load_and_combine')
+
+
+def __getattr__(name):
+    if name in _ASYNC_LOADER_NAMES:
+        from . import async_loader
+        return getattr(async_loader, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['BaseDataAdapter', 'JsonAdapter', 'CsvAdapter', 'DictAdapter', 'adapter_for_file',
+           'create_adapter', 'format_for_file', 'register_adapter', 'registered_formats',
+           'DirectoryLoad', 'FileError', 'LoadedSource', 'load_directory',
+           'NdjsonWriter', 'iter_ndjson', 'bpa_to_record', 'record_to_bpa',
+           'load_sources', 'make_source', 'parse_bpa', 'validate_bpa',
+           *_ASYNC_LOADER_NAMES]
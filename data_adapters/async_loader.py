@@ -0,0 +1,115 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .base_adapter import BaseDataAdapter
+from .directory_loader import LoadedSource
+from .registry import adapter_for_file
+
+
+async def _load_one(index: int, filepath: str, executor: ThreadPoolExecutor,
+                    adapter_factory: Callable[[str], BaseDataAdapter]) -> LoadedSource:
+    """Загрузка, валидация и преобразование одного файла"""
+    adapter = adapter_factory(filepath)
+    data = await adapter.load_async(filepath, executor)
+    try:
+        # Проверка и нормировка выполняются за один проход по значениям
+        bpa = await adapter.transform_to_bpa_async(data, executor)
+    except ValueError as e:
+        raise ValueError(f"Некорректные данные в файле {filepath}: {e}") from None
+    return LoadedSource(index, filepath, data, bpa)
+
+
+async def iter_sources_as_completed(
+        filepaths: Sequence[str], max_workers: int = 8,
+        adapter_factory: Callable[[str], BaseDataAdapter] = adapter_for_file
+) -> AsyncIterator[LoadedSource]:
+    """
+    Одновременная загрузка источников с выдачей в порядке готовности
+
+    Чтение файлов выполняется в пуле из max_workers потоков, поэтому общее время
+    загрузки приближается к времени самого медленного файла, а не к их сумме.
+    При первой ошибке или досрочном закрытии генератора оставшиеся загрузки
+    отменяются, а уже начатые чтения дорабатывают в фоне.
+
+    Args:
+        filepaths: Пути к файлам свидетельств
+        max_workers: Максимальное число одновременных чтений
+        adapter_factory: Выбор адаптера по пути файла
+
+    Yields:
+        LoadedSource: Источники по мере готовности (index - позиция в filepaths)
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='source-load')
+    tasks = [
+        asyncio.ensure_future(_load_one(i, str(path), executor, adapter_factory))
+        for i, path in enumerate(filepaths)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Без ожидания идущих чтений: досрочное закрытие не блокирует цикл событий
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def load_sources_async(filepaths: Sequence[str], max_workers: int = 8,
+                             adapter_factory: Callable[[str], BaseDataAdapter] = adapter_for_file
+                             ) -> List[LoadedSource]:
+    """Одновременная загрузка источников; результат в порядке filepaths"""
+    sources = [None] * len(filepaths)
+    async for source in iter_sources_as_completed(filepaths, max_workers, adapter_factory):
+        sources[source.index] = source
+    return sources
+
+
+async def load_and_combine(ds, filepaths: Sequence[str], rule: str = 'dempster',
+                           max_workers: int = 8,
+                           adapter_factory: Callable[[str], BaseDataAdapter] = adapter_for_file
+                           ) -> Tuple[Dict[FrozenSet, float], List[LoadedSource]]:
+    """
+    Загрузка источников с комбинированием по мере их поступления
+
+    Правило Демпстера ассоциативно и коммутативно, поэтому источники
+    комбинируются в порядке готовности. Правило Ягера не ассоциативно:
+    для совпадения с yager_combine_multiple комбинируется готовый префикс
+    источников в порядке filepaths.
+
+    Args:
+        ds: Экземпляр DempsterShafer с фреймом, покрывающим все источники
+        filepaths: Пути к файлам свидетельств
+        rule: 'dempster' или 'yager'
+
+    Returns:
+        Tuple: Комбинированная BPA и загруженные источники в порядке filepaths
+    """
+    if rule == 'dempster':
+        combine = ds.dempster_combine
+    elif rule == 'yager':
+        combine = ds.yager_combine
+    else:
+        raise ValueError(f"Неизвестное правило комбинирования: {rule}")
+
+    sources = [None] * len(filepaths)
+    bpas = [None] * len(filepaths)
+    combined = None
+    next_index = 0
+
+    async for source in iter_sources_as_completed(filepaths, max_workers, adapter_factory):
+        sources[source.index] = source
+        bpa = ds.calculate_bpa(source.bpa)
+        if rule == 'dempster':
+            combined = bpa if combined is None else combine(combined, bpa)
+            continue
+
+        bpas[source.index] = bpa
+        while next_index < len(bpas) and bpas[next_index] is not None:
+            ready = bpas[next_index]
+            combined = ready if combined is None else combine(combined, ready)
+            bpas[next_index] = None
+            next_index += 1
+
+    return (combined if combined is not None else {}), sources
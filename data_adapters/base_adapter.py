@@ -1,6 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any
+import math
+import threading
+
+from dempster_core import canonical_subset
+
+# Размер общего пула потоков для асинхронного чтения файлов
+DEFAULT_IO_WORKERS = 8
+
+# Начиная с этого числа записей проверка и нормировка выполняются в NumPy
+NUMPY_THRESHOLD = 10000
+
+# Допустимые типы значений (bool исключается явно)
+_NUMBER_TYPES = (int, float)
+
+_io_executor = None
+_io_executor_lock = threading.Lock()
+
+
+def get_io_executor():
+    """Общий ограниченный пул потоков для асинхронных операций адаптеров"""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _io_executor = ThreadPoolExecutor(max_workers=DEFAULT_IO_WORKERS,
+                                              thread_name_prefix='adapter-io')
+        return _io_executor
+
 
 class BaseDataAdapter(ABC):
     """Абстрактный базовый класс для адаптеров данных"""
@@ -23,4 +50,96 @@ class BaseDataAdapter(ABC):
     @abstractmethod
     def save(self, data: Dict[str, Any], filepath: str):
         """Сохранение данных в файл"""
-        pass
\ No newline at end of file
+        pass
+
+    def canonical_key(self, key: str) -> str:
+        """Каноническая запись подмножества: элементы без пробелов, без повторов, по порядку"""
+        if not isinstance(key, str):
+            raise ValueError(f"Ключ подмножества должен быть строкой: {key!r}")
+        return canonical_subset(key)
+
+    def counts_are_valid(self, counts: Any) -> bool:
+        """Непустой словарь с конечными неотрицательными числовыми значениями"""
+        if not isinstance(counts, dict) or not counts:
+            return False
+        return all(
+            type(value) in _NUMBER_TYPES and value >= 0 and value != math.inf
+            for value in counts.values()
+        )
+
+    def normalize_counts(self, counts: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Проверка значений, канонизация ключей и нормировка за один проход
+
+        Значения должны быть конечными неотрицательными числами (bool, NaN и
+        бесконечность отвергаются). Ключи с одинаковой канонической записью
+        объединяются суммированием. Для больших входов используется NumPy.
+
+        Args:
+            counts: Словарь {подмножество: количество или масса}
+
+        Returns:
+            Dict[str, float]: Нормированные базовые вероятности
+
+        Raises:
+            ValueError: Некорректное значение или нулевая сумма
+        """
+        if not isinstance(counts, dict) or not counts:
+            raise ValueError("Данные должны быть непустым словарем {подмножество: значение}")
+        if len(counts) >= NUMPY_THRESHOLD:
+            return self._normalize_counts_numpy(counts)
+
+        merged = {}
+        total = 0.0
+        for key, value in counts.items():
+            if type(value) not in _NUMBER_TYPES or not value >= 0 or value == math.inf:
+                raise ValueError(f"Некорректное значение {value!r} для подмножества {key}")
+            key = self.canonical_key(key)
+            merged[key] = merged.get(key, 0) + value
+            total += value
+
+        if total == 0:
+            raise ValueError("Сумма базовых вероятностей равна 0")
+        return {key: value / total for key, value in merged.items()}
+
+    def _normalize_counts_numpy(self, counts: Dict[str, Any]) -> Dict[str, float]:
+        """Векторный вариант normalize_counts для больших входов"""
+        import numpy as np
+
+        keys = list(counts)
+        values = list(counts.values())
+        if not set(map(type, values)) <= set(_NUMBER_TYPES):
+            bad = next(i for i, value in enumerate(values) if type(value) not in _NUMBER_TYPES)
+            raise ValueError(f"Некорректное значение {values[bad]!r} для подмножества {keys[bad]}")
+
+        array = np.asarray(values, dtype=np.float64)
+        invalid = ~(array >= 0) | np.isinf(array)
+        if invalid.any():
+            bad = int(np.argmax(invalid))
+            raise ValueError(f"Некорректное значение {values[bad]!r} для подмножества {keys[bad]}")
+
+        total = array.sum()
+        if total == 0:
+            raise ValueError("Сумма базовых вероятностей равна 0")
+
+        keys = list(map(self.canonical_key, keys))
+        unique = dict.fromkeys(keys)
+        if len(unique) != len(keys):
+            # Объединение дубликатов: индекс первого вхождения каждого ключа
+            index = {key: i for i, key in enumerate(unique)}
+            array = np.bincount([index[key] for key in keys], weights=array, minlength=len(index))
+            keys = list(unique)
+        return dict(zip(keys, (array / total).tolist()))
+
+    # asyncio импортируется в методах, чтобы не замедлять импорт адаптеров
+    async def load_async(self, filepath: str, executor=None) -> Dict[str, Any]:
+        """Асинхронная загрузка: чтение файла выполняется в ограниченном пуле потоков"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor or get_io_executor(), self.load, filepath)
+
+    async def transform_to_bpa_async(self, data: Dict[str, Any], executor=None) -> Dict[str, float]:
+        """Асинхронное преобразование данных в BPA без блокировки цикла событий"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor or get_io_executor(), self.transform_to_bpa, data)
@@ -1,5 +1,6 @@
 import csv
 from typing import Dict, Any, List
+from dempster_core import parse_subset
 from .base_adapter import BaseDataAdapter
 
 class CsvAdapter(BaseDataAdapter):
@@ -31,15 +32,14 @@ class CsvAdapter(BaseDataAdapter):
                     except ValueError:
                         raise ValueError(f"Некорректное значение count для subset {subset}")
                     
-                    data['data'][subset] = count
+                    # Разные записи одного подмножества ("{2,1}", "{1, 2}") объединяются
+                    subset = self.canonical_key(subset)
+                    data['data'][subset] = data['data'].get(subset, 0.0) + count
             
             # Извлекаем frame_of_discernment из данных
             all_elements = set()
             for subset_str in data['data'].keys():
-                # Убираем фигурные скобки и разбиваем по запятым
-                elements = subset_str.strip("{}").split(",")
-                elements = [e.strip() for e in elements if e.strip()]
-                all_elements.update(elements)
+                all_elements.update(parse_subset(subset_str))
             
             data['frame_of_discernment'] = list(all_elements)
             
@@ -61,16 +61,8 @@ class CsvAdapter(BaseDataAdapter):
         if 'data' not in data or not data['data']:
             raise ValueError("Отсутствуют данные в CSV")
         
-        # Нормализация базовых вероятностей
-        bpa_data = data['data']
-        total = sum(bpa_data.values())
-        
-        if total == 0:
-            raise ValueError("Сумма базовых вероятностей равна 0")
-        
-        # Нормализация до суммы 1
-        normalized_bpa = {k: v/total for k, v in bpa_data.items()}
-        return normalized_bpa
+        # Проверка значений и нормализация до суммы 1 за один проход
+        return self.normalize_counts(data['data'])
     
     def validate(self, data: Dict[str, Any]) -> bool:
         """
@@ -88,12 +80,8 @@ class CsvAdapter(BaseDataAdapter):
         if not data['data']:
             return False
         
-        # Проверка что все значения числовые
-        for value in data['data'].values():
-            if not isinstance(value, (int, float)):
-                return False
-        
-        return True
+        # Проверка что все значения - конечные неотрицательные числа
+        return self.counts_are_valid(data['data'])
     
     def save(self, data: Dict[str, Any], filepath: str):
         """
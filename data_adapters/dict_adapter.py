@@ -33,16 +33,8 @@ class DictAdapter(BaseDataAdapter):
         if 'data' not in data:
             raise ValueError("Отсутствует ключ 'data' в словаре")
         
-        # Нормализация базовых вероятностей
-        bpa_data = data['data']
-        total = sum(bpa_data.values())
-        
-        if total == 0:
-            raise ValueError("Сумма базовых вероятностей равна 0")
-        
-        # Нормализация до суммы 1
-        normalized_bpa = {k: v/total for k, v in bpa_data.items()}
-        return normalized_bpa
+        # Проверка значений и нормализация до суммы 1 за один проход
+        return self.normalize_counts(data['data'])
     
     def validate(self, data: Dict[str, Any]) -> bool:
         """
@@ -64,12 +56,8 @@ class DictAdapter(BaseDataAdapter):
         if not isinstance(data['data'], dict):
             return False
         
-        # Проверка что все значения числовые
-        for value in data['data'].values():
-            if not isinstance(value, (int, float)):
-                return False
-        
-        return True
+        # Проверка что все значения - конечные неотрицательные числа
+        return self.counts_are_valid(data['data'])
     
     def save(self, data: Dict[str, Any], filepath: Optional[str] = None):
         """
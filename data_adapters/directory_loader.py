@@ -0,0 +1,183 @@
+"""
+Параллельная загрузка всех файлов свидетельств из дерева каталогов
+
+Файлы читаются в ограниченном пуле потоков; в работе одновременно не больше
+2·max_workers файлов, поэтому число незавершенных чтений не зависит от
+размера дерева. Загруженные источники выдаются по мере готовности и
+сохраняются в DirectoryLoad.sources (память под сами источники растет с
+числом файлов), ошибки отдельных файлов собираются в DirectoryLoad.errors и
+не прерывают загрузку остальных.
+
+Формат файла выбирается реестром (adapter_for_file): по расширению или по
+содержимому. Файлы нераспознанного формата и скрытые файлы пропускаются.
+JSON файл с ключом 'sources' (как data/library_selection.json) дает по
+источнику на элемент списка.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .base_adapter import DEFAULT_IO_WORKERS
+from .registry import create_adapter, format_for_file
+
+# Ошибки отдельного файла, которые не прерывают загрузку каталога
+FILE_ERRORS = (OSError, ValueError, KeyError, TypeError)
+
+
+class LoadedSource:
+    """Загруженный и провалидированный источник свидетельств"""
+
+    def __init__(self, index: int, filepath: str, data: Dict[str, Any], bpa: Dict[str, float],
+                 name: Optional[str] = None):
+        self.index = index
+        self.filepath = filepath
+        self.data = data
+        self.bpa = bpa
+        # Имя источника: из 'sources' или имя файла без расширения
+        self.name = name if name is not None else Path(filepath).stem
+
+    def __repr__(self) -> str:
+        return f"LoadedSource(index={self.index}, filepath={self.filepath!r})"
+
+
+class FileError:
+    """Ошибка загрузки одного файла"""
+
+    def __init__(self, filepath: str, error: BaseException):
+        self.filepath = filepath
+        self.error = error
+
+    @property
+    def message(self) -> str:
+        return f"{self.filepath}: {self.error}"
+
+    def __repr__(self) -> str:
+        return f"FileError({self.filepath!r}, {self.error!r})"
+
+
+def _load_file(index: int, filepath: str) -> Optional[List[LoadedSource]]:
+    """Загрузка файла (задача для пула); None - формат не распознан"""
+    fmt = format_for_file(filepath)
+    if fmt is None:
+        return None
+    adapter = create_adapter(fmt)
+    data = adapter.load(filepath)
+
+    if isinstance(data, dict) and 'sources' in data:
+        frame = data.get('frame_of_discernment', [])
+        if not isinstance(data['sources'], list):
+            raise ValueError("Ключ 'sources' должен содержать список источников")
+        sources = []
+        for i, source in enumerate(data['sources']):
+            if not isinstance(source, dict):
+                raise ValueError(f"Источник {i} должен быть объектом с ключами 'name' и 'data': {source!r}")
+            name = source.get('name', f"{Path(filepath).stem}[{i}]")
+            entry = {'frame_of_discernment': frame, 'data': source.get('data')}
+            try:
+                bpa = adapter.transform_to_bpa(entry)
+            except ValueError as e:
+                raise ValueError(f"Некорректные данные источника '{name}': {e}") from None
+            sources.append(LoadedSource(index, filepath, entry, bpa, name))
+        return sources
+    return [LoadedSource(index, filepath, data, adapter.transform_to_bpa(data))]
+
+
+class DirectoryLoad:
+    """
+    Загрузка каталога: итерация выдает LoadedSource по мере готовности
+
+    После (или во время) итерации доступны sources, errors и skipped.
+    Повторная итерация после завершения выдает уже загруженные источники;
+    после досрочного закрытия каталог загружается заново. Одновременная
+    итерация одной загрузки не допускается.
+    """
+
+    def __init__(self, files: List[str], max_workers: int):
+        self.files = files
+        self.max_workers = max_workers
+        self.sources: List[LoadedSource] = []
+        self.errors: List[FileError] = []
+        # Файлы нераспознанного формата
+        self.skipped: List[str] = []
+        self._done = False
+        self._running = False
+
+    def __iter__(self) -> Iterator[LoadedSource]:
+        if self._done:
+            yield from self.sources
+            return
+        if self._running:
+            raise ValueError("Каталог уже загружается: дождитесь завершения первой итерации")
+        self._running = True
+        self.sources, self.errors, self.skipped = [], [], []
+        pending = iter(enumerate(self.files))
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='directory-load')
+        running = {}
+
+        def submit():
+            # Не больше 2·max_workers файлов в работе
+            while len(running) < 2 * self.max_workers:
+                item = next(pending, None)
+                if item is None:
+                    return
+                index, filepath = item
+                running[executor.submit(_load_file, index, filepath)] = filepath
+
+        try:
+            submit()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    filepath = running.pop(future)
+                    try:
+                        loaded = future.result()
+                    except FILE_ERRORS as e:
+                        self.errors.append(FileError(filepath, e))
+                        continue
+                    if loaded is None:
+                        self.skipped.append(filepath)
+                        continue
+                    for source in loaded:
+                        self.sources.append(source)
+                        yield source
+                submit()
+            self._done = True
+        finally:
+            self._running = False
+            # При досрочном закрытии ожидающие файлы отменяются, идущие чтения не ждем
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def wait(self) -> 'DirectoryLoad':
+        """Загрузка всех файлов; источники упорядочиваются по пути файла"""
+        for _ in self:
+            pass
+        self.sources.sort(key=lambda source: source.index)
+        return self
+
+
+def load_directory(directory: str, pattern: str = '*', recursive: bool = True,
+                   max_workers: int = DEFAULT_IO_WORKERS) -> DirectoryLoad:
+    """
+    Загрузка всех файлов свидетельств каталога
+
+    Args:
+        directory: Каталог (например, data/)
+        pattern: Шаблон имен файлов
+        recursive: Обходить вложенные каталоги
+        max_workers: Размер пула потоков
+
+    Returns:
+        DirectoryLoad: Итерация выдает источники по мере готовности;
+            errors - ошибки отдельных файлов
+    """
+    root = Path(directory)
+    if not root.is_dir():
+        raise ValueError(f"Каталог не найден: {directory}")
+    if max_workers < 1:
+        raise ValueError("Число потоков должно быть положительным")
+    paths = root.rglob(pattern) if recursive else root.glob(pattern)
+    files = sorted(
+        str(path) for path in paths
+        if path.is_file() and not any(part.startswith('.') for part in path.relative_to(root).parts)
+    )
+    return DirectoryLoad(files, max_workers)
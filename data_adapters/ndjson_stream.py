@@ -0,0 +1,120 @@
+import json
+from typing import Any, Dict, FrozenSet, Iterator, Optional
+
+from dempster_core import format_subset, parse_subset
+
+# Число строк, накапливаемых перед записью на диск
+DEFAULT_BUFFER_LINES = 1000
+
+# Компактная запись без пробелов после разделителей
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def bpa_to_record(bpa: Dict[FrozenSet, float]) -> Dict[str, float]:
+    """BPA с ключами frozenset -> словарь с каноническими строками "{1,2}" (без нулевых масс)"""
+    return {format_subset(subset): mass for subset, mass in bpa.items() if mass != 0}
+
+
+def record_to_bpa(record: Dict[str, float]) -> Dict[FrozenSet, float]:
+    """Словарь со строковыми ключами -> BPA с ключами frozenset"""
+    bpa = {}
+    for subset_str, mass in record.items():
+        subset = parse_subset(subset_str)
+        bpa[subset] = bpa.get(subset, 0.0) + mass
+    return bpa
+
+
+class NdjsonWriter:
+    """
+    Потоковая запись результатов в NDJSON: одна компактная JSON строка на запись
+
+    Строки накапливаются в буфере и записываются блоками по buffer_lines,
+    поэтому память не зависит от числа записей.
+    """
+
+    def __init__(self, filepath: str, buffer_lines: int = DEFAULT_BUFFER_LINES, append: bool = False):
+        """
+        Args:
+            filepath: Путь к файлу .ndjson
+            buffer_lines: Число строк в одном блоке записи
+            append: Дописывать в существующий файл
+        """
+        self.filepath = filepath
+        self.buffer_lines = max(1, buffer_lines)
+        self.count = 0
+        self._buffer = []
+        self._file = open(filepath, 'a' if append else 'w', encoding='utf-8', newline='\n')
+
+    def write(self, record: Dict[str, Any]):
+        """
+        Запись одного результата
+
+        Значения-словари с ключами frozenset (BPA) преобразуются в словари
+        с каноническими строками подмножеств.
+        """
+        record = {
+            key: bpa_to_record(value) if _is_frozenset_keyed(value) else value
+            for key, value in record.items()
+        }
+        self._buffer.append(_ENCODER.encode(record))
+        self.count += 1
+        if len(self._buffer) >= self.buffer_lines:
+            self.flush()
+
+    def write_bpa(self, bpa: Dict[FrozenSet, float], **fields: Any):
+        """Запись BPA в поле 'bpa' вместе с дополнительными полями"""
+        self.write({**fields, 'bpa': bpa})
+
+    def flush(self):
+        """Запись накопленного блока строк в файл"""
+        if self._buffer:
+            self._buffer.append('')
+            self._file.write('\n'.join(self._buffer))
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        """Запись остатка буфера и закрытие файла"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> 'NdjsonWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _is_frozenset_keyed(value: Any) -> bool:
+    if not isinstance(value, dict) or not value:
+        return False
+    return isinstance(next(iter(value)), frozenset)
+
+
+def iter_ndjson(filepath: str, bpa_field: Optional[str] = 'bpa') -> Iterator[Dict[str, Any]]:
+    """
+    Потоковое чтение NDJSON по одной записи
+
+    Args:
+        filepath: Путь к файлу .ndjson
+        bpa_field: Поле с BPA, ключи которого преобразуются в frozenset
+            (None - оставить строковые ключи)
+
+    Yields:
+        Dict[str, Any]: Записи в порядке файла; пустые строки пропускаются
+    """
+    decoder = json.JSONDecoder()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = decoder.decode(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Ошибка парсинга NDJSON в строке {line_number}: {e}")
+            if bpa_field is not None and isinstance(record, dict) and isinstance(record.get(bpa_field), dict):
+                record[bpa_field] = record_to_bpa(record[bpa_field])
+            yield record
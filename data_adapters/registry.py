@@ -0,0 +1,116 @@
+"""
+Реестр адаптеров: выбор формата по расширению файла или по содержимому
+
+Для каждого формата регистрируются фабрика адаптера, расширения и функция
+распознавания начала файла. adapter_for_file сначала ищет адаптер по
+расширению, а для неизвестного расширения (или без него) читает первые
+SNIFF_BYTES байт и опрашивает функции распознавания в порядке регистрации.
+"""
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .base_adapter import BaseDataAdapter
+from .json_adapter import JsonAdapter
+from .csv_adapter import CsvAdapter
+
+# Размер начала файла, по которому распознается формат
+SNIFF_BYTES = 4096
+
+
+class _Format:
+    """Зарегистрированный формат файлов свидетельств"""
+
+    def __init__(self, name: str, factory: Callable[[], BaseDataAdapter],
+                 extensions: Tuple[str, ...], sniff: Optional[Callable[[str], bool]]):
+        self.name = name
+        self.factory = factory
+        self.extensions = extensions
+        self.sniff = sniff
+
+
+_FORMATS: Dict[str, _Format] = {}
+
+
+def register_adapter(name: str, factory: Callable[[], BaseDataAdapter],
+                     extensions: Sequence[str] = (),
+                     sniff: Optional[Callable[[str], bool]] = None):
+    """
+    Регистрация формата файлов свидетельств
+
+    Args:
+        name: Имя формата (повторная регистрация заменяет формат)
+        factory: Создает адаптер формата
+        extensions: Расширения файлов, например ('.json',)
+        sniff: Проверка начала файла (текст до SNIFF_BYTES байт)
+    """
+    extensions = tuple(extension.lower() for extension in extensions)
+    if not extensions and sniff is None:
+        raise ValueError(f"Для формата {name} нужно задать расширения или функцию распознавания")
+    _FORMATS[name] = _Format(name, factory, extensions, sniff)
+
+
+def registered_formats() -> List[str]:
+    """Имена зарегистрированных форматов в порядке регистрации"""
+    return list(_FORMATS)
+
+
+def _sniff_json(head: str) -> bool:
+    return head.lstrip().startswith('{')
+
+
+def _sniff_csv(head: str) -> bool:
+    header = head.lstrip().split('\n', 1)[0]
+    columns = {column.strip().strip('"') for column in header.split(',')}
+    return {'subset', 'count'} <= columns
+
+
+register_adapter('json', JsonAdapter, ('.json',), _sniff_json)
+register_adapter('csv', CsvAdapter, ('.csv',), _sniff_csv)
+
+
+def format_for_file(filepath: str) -> Optional[str]:
+    """
+    Имя формата файла или None, если формат не распознан
+
+    Файл читается только при неизвестном расширении.
+    """
+    suffix = Path(filepath).suffix.lower()
+    for fmt in _FORMATS.values():
+        if suffix in fmt.extensions:
+            return fmt.name
+
+    sniffers = [fmt for fmt in _FORMATS.values() if fmt.sniff is not None]
+    if not sniffers:
+        return None
+    with open(filepath, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+    # Начало может оборвать многобайтовый символ UTF-8
+    text = head.decode('utf-8', errors='ignore').lstrip('\ufeff')
+    for fmt in sniffers:
+        if fmt.sniff(text):
+            return fmt.name
+    return None
+
+
+def create_adapter(name: str) -> BaseDataAdapter:
+    """Адаптер зарегистрированного формата по имени"""
+    fmt = _FORMATS.get(name)
+    if fmt is None:
+        raise ValueError(f"Неизвестный формат: {name}. Доступны: {', '.join(_FORMATS)}")
+    return fmt.factory()
+
+
+def adapter_for_file(filepath: str) -> BaseDataAdapter:
+    """
+    Выбор адаптера по расширению файла или по его содержимому
+
+    Args:
+        filepath: Путь к файлу свидетельств
+
+    Returns:
+        BaseDataAdapter: Адаптер, подходящий для файла
+    """
+    name = format_for_file(filepath)
+    if name is None:
+        raise ValueError(f"Неподдерживаемый формат файла: {filepath}")
+    return create_adapter(name)
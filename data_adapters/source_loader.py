@@ -0,0 +1,115 @@
+"""
+Источники свидетельств для комбинирования: загрузка файлов и проверка BPA
+
+load_sources загружает файлы и каталоги в источники {'name',
+'frame_of_discernment', 'bpa'}; validate_bpa и parse_bpa проверяют и
+нормируют BPA, заданные не файлом (запросы сервиса, узлы графа), той же
+normalize_counts, что и данные адаптеров.
+"""
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Sequence
+
+from dempster_core import format_subset, parse_subset
+from .base_adapter import BaseDataAdapter
+from .json_adapter import JsonAdapter
+from .registry import adapter_for_file
+from .directory_loader import load_directory
+
+# Проверка и нормировка масс BPA, заданных не файлом
+_ADAPTER = JsonAdapter()
+
+
+def load_sources(filepaths: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Загрузка источников свидетельств из файлов
+
+    JSON файл с ключом 'sources' (как data/example_2_6.json) раскрывается
+    в несколько источников; остальные файлы дают по одному источнику.
+    Каталог загружается целиком (load_directory) в порядке путей файлов.
+
+    Args:
+        filepaths: Пути к JSON/CSV файлам или каталогам
+
+    Returns:
+        List[Dict[str, Any]]: Источники с ключами 'name', 'frame_of_discernment', 'bpa'
+    """
+    sources = []
+    for filepath in filepaths:
+        if Path(filepath).is_dir():
+            sources.extend(_load_directory_sources(str(filepath)))
+            continue
+        adapter = adapter_for_file(filepath)
+        data = adapter.load(str(filepath))
+        frame = data.get('frame_of_discernment', [])
+
+        if 'sources' in data:
+            entries = [
+                (source.get('name', f"{Path(filepath).stem}[{i}]"),
+                 {'frame_of_discernment': frame, 'data': source.get('data')})
+                for i, source in enumerate(data['sources'])
+            ]
+        else:
+            entries = [(Path(filepath).stem, data)]
+
+        for name, entry in entries:
+            entry.setdefault('frame_of_discernment', frame)
+            sources.append(make_source(adapter, name, entry, filepath))
+    return sources
+
+
+def _load_directory_sources(directory: str) -> List[Dict[str, Any]]:
+    """Источники всех файлов каталога; ошибки файлов объединяются в одну"""
+    loaded = load_directory(directory).wait()
+    if loaded.errors:
+        raise ValueError("Ошибки загрузки каталога:\n" + "\n".join(error.message for error in loaded.errors))
+    return [
+        {'name': source.name, 'frame_of_discernment': list(source.data.get('frame_of_discernment', [])),
+         'bpa': source.bpa}
+        for source in loaded.sources
+    ]
+
+
+def make_source(adapter: BaseDataAdapter, name: str, entry: Dict[str, Any],
+                origin: str) -> Dict[str, Any]:
+    """Валидация данных источника и преобразование их в BPA (один проход по значениям)"""
+    try:
+        bpa = adapter.transform_to_bpa(entry)
+    except ValueError as e:
+        raise ValueError(f"Некорректные данные источника '{name}' в файле {origin}: {e}") from None
+    return {
+        'name': name,
+        'frame_of_discernment': list(entry['frame_of_discernment']),
+        'bpa': bpa,
+    }
+
+
+def validate_bpa(raw: Dict[Any, Any], name: str = 'BPA') -> Dict[str, float]:
+    """
+    Проверка и нормировка BPA с ключами-строками "{1,2}" или множествами
+
+    Массы должны быть конечными неотрицательными числами; разные записи одного
+    подмножества ("{1,2}", "{2, 1}", frozenset) объединяются суммированием.
+
+    Returns:
+        Dict[str, float]: BPA с каноническими строковыми ключами и суммой масс 1
+    """
+    if not isinstance(raw, dict) or not raw:
+        raise ValueError(f"{name} должна быть непустым объектом {{\"{{1,2}}\": масса}}")
+    counts: Dict[str, Any] = {}
+    for subset, mass in raw.items():
+        key = subset if isinstance(subset, str) else format_subset(frozenset(subset))
+        if key in counts:
+            # Одно подмножество задано и строкой, и множеством
+            if not (_ADAPTER.counts_are_valid({key: mass}) and _ADAPTER.counts_are_valid({key: counts[key]})):
+                raise ValueError(f"Некорректная {name}: некорректное значение для подмножества {key}")
+            mass = counts[key] + mass
+        counts[key] = mass
+    try:
+        return _ADAPTER.normalize_counts(counts)
+    except ValueError as e:
+        raise ValueError(f"Некорректная {name}: {e}") from None
+
+
+def parse_bpa(raw: Dict[Any, Any], name: str = 'BPA') -> Dict[FrozenSet, float]:
+    """Проверенная и нормированная BPA (validate_bpa) с ключами frozenset"""
+    return {parse_subset(subset): mass for subset, mass in validate_bpa(raw, name).items()}
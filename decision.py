@@ -0,0 +1,163 @@
+"""
+Принятие решений на основе BPA: пигнистическая вероятность, контурная функция
+правдоподобия и ранжирование по доминированию интервалов
+
+Все меры для одноэлементных событий считаются за один проход по фокальным
+элементам (O(|F|·средний размер фокального элемента)) с векторным накоплением
+в NumPy; булеан фрейма не перебирается.
+"""
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from dempster_core import DempsterShafer, sort_elements
+
+# Критерии ранжирования гипотез
+CRITERIA = ('pignistic', 'plausibility', 'belief')
+
+
+class SingletonMeasures:
+    """Bel, Pl и BetP всех одноэлементных событий фрейма"""
+
+    def __init__(self, elements: List[str], belief: np.ndarray, plausibility: np.ndarray,
+                 pignistic: np.ndarray, conflict: float):
+        self.elements = elements
+        self.belief = belief
+        self.plausibility = plausibility
+        self.pignistic = pignistic
+        self.conflict = conflict
+
+    def scores(self, criterion: str) -> np.ndarray:
+        """Массив значений выбранного критерия в порядке elements"""
+        if criterion not in CRITERIA:
+            raise ValueError(f"Неизвестный критерий: {criterion}. Доступны: {', '.join(CRITERIA)}")
+        return getattr(self, criterion)
+
+    def as_dict(self, criterion: str) -> Dict[str, float]:
+        """Значения критерия в виде словаря {элемент: значение}"""
+        return dict(zip(self.elements, self.scores(criterion).tolist()))
+
+
+class DecisionEngine:
+    """Меры для принятия решений над фреймом экземпляра DempsterShafer"""
+
+    def __init__(self, ds: DempsterShafer):
+        self.ds = ds
+        self.elements = sort_elements(ds.frame)
+        self._index = {element: i for i, element in enumerate(self.elements)}
+
+    def singleton_measures(self, bpa: Dict[FrozenSet, float]) -> SingletonMeasures:
+        """
+        Bel, Pl и BetP всех одноэлементных событий за один проход по BPA
+
+        BetP(x) = Σ_{A ∋ x} m(A) / (|A| · (1 - m(∅)))
+        Pl({x}) = Σ_{A ∋ x} m(A),  Bel({x}) = m({x})
+        """
+        n = len(self.elements)
+        positions = []
+        masses = []
+        sizes = []
+        conflict = 0.0
+
+        for subset, mass in bpa.items():
+            if mass == 0:
+                continue
+            if not subset:
+                conflict += mass
+                continue
+            try:
+                positions.extend(self._index[element] for element in subset)
+            except KeyError as e:
+                raise ValueError(f"Элемент {e} не принадлежит фрейму") from None
+            masses.append(mass)
+            sizes.append(len(subset))
+
+        if not masses:
+            zeros = np.zeros(n)
+            return SingletonMeasures(self.elements, zeros, zeros.copy(), zeros.copy(), conflict)
+
+        masses = np.asarray(masses, dtype=float)
+        sizes = np.asarray(sizes, dtype=np.int64)
+        positions = np.asarray(positions, dtype=np.int64)
+
+        # Масса каждого фокального элемента повторяется для всех его элементов
+        owner_masses = np.repeat(masses, sizes)
+        owner_sizes = np.repeat(sizes, sizes)
+
+        plausibility = np.bincount(positions, weights=owner_masses, minlength=n)
+        pignistic = np.bincount(positions, weights=owner_masses / owner_sizes, minlength=n)
+        singleton = owner_sizes == 1
+        belief = np.bincount(positions[singleton], weights=owner_masses[singleton], minlength=n)
+
+        if conflict >= 1:
+            raise ValueError("Пигнистическая вероятность не определена: вся масса на пустом множестве")
+        if conflict > 0:
+            pignistic /= (1 - conflict)
+
+        return SingletonMeasures(self.elements, belief, plausibility, pignistic, conflict)
+
+    def pignistic_probability(self, bpa: Dict[FrozenSet, float]) -> Dict[str, float]:
+        """Пигнистическая вероятность BetP для всех элементов фрейма"""
+        return self.singleton_measures(bpa).as_dict('pignistic')
+
+    def plausibility_contour(self, bpa: Dict[FrozenSet, float]) -> Dict[str, float]:
+        """Контурная функция правдоподобия pl(x) = Pl({x})"""
+        return self.singleton_measures(bpa).as_dict('plausibility')
+
+    def top_k(self, bpa: Dict[FrozenSet, float], k: int,
+              criterion: str = 'pignistic') -> List[Tuple[str, float]]:
+        """
+        k лучших гипотез по критерию
+
+        Используется частичная сортировка (argpartition), поэтому для фреймов
+        из тысяч элементов полностью упорядочиваются только k лучших.
+        Выбранные гипотезы с равными значениями идут в порядке элементов фрейма.
+        """
+        scores = self.singleton_measures(bpa).scores(criterion)
+        return self._select_top(scores, k)
+
+    def rank(self, bpa: Dict[FrozenSet, float], criterion: str = 'pignistic') -> List[Tuple[str, float]]:
+        """Все гипотезы, упорядоченные по убыванию критерия"""
+        scores = self.singleton_measures(bpa).scores(criterion)
+        return self._select_top(scores, len(scores))
+
+    def interval_dominance(self, bpa: Dict[FrozenSet, float],
+                           candidates: Optional[List[str]] = None) -> List[Tuple[str, float, float]]:
+        """
+        Недоминируемые гипотезы по интервалам [Bel, Pl]
+
+        Гипотеза x доминируется, если существует y с Bel({y}) > Pl({x}).
+        Поэтому недоминируемы ровно те x, у которых Pl({x}) >= max Bel({y}),
+        и проверка выполняется за линейное время.
+
+        Returns:
+            List[Tuple[str, float, float]]: (элемент, Bel, Pl) в порядке убывания Pl
+        """
+        measures = self.singleton_measures(bpa)
+        if candidates is None:
+            selected = np.arange(len(self.elements))
+        else:
+            selected = np.asarray([self._index[element] for element in candidates], dtype=np.int64)
+        if selected.size == 0:
+            return []
+
+        best_belief = measures.belief[selected].max()
+        keep = selected[measures.plausibility[selected] >= best_belief]
+        keep = keep[np.argsort(-measures.plausibility[keep], kind='stable')]
+        return [
+            (self.elements[i], float(measures.belief[i]), float(measures.plausibility[i]))
+            for i in keep
+        ]
+
+    def _select_top(self, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Индексы k наибольших значений с частичной сортировкой"""
+        n = len(scores)
+        k = max(0, min(k, n))
+        if k == 0:
+            return []
+        if k < n:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(n)
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(self.elements[i], float(scores[i])) for i in order]
@@ -2,14 +2,137 @@
 Ядро теории Демпстера-Шейфера - реализация основных функций из главы 2
 """
 import itertools
-from typing import Set, Dict, List, FrozenSet
+import sys
+from typing import Set, Dict, List, FrozenSet, Iterable, Sequence
+
+import combination_rules
+
+# Численные режимы комбинирования (см. numeric_modes)
+NUMERIC_MODES = ('float64', 'float32', 'log_commonality')
+
+# Отклонение суммы от 1, при котором данные считаются уже нормированными
+NORMALIZED_TOLERANCE = 1e-12
+
+# Таблицы интернирования подмножеств: исходная строка -> frozenset / каноническая
+# строка, frozenset -> общий экземпляр. При переполнении таблицы очищаются.
+MAX_INTERNED = 1 << 20
+_SUBSET_TABLE: Dict[str, FrozenSet[str]] = {}
+_CANONICAL_TABLE: Dict[str, str] = {}
+_FROZENSET_TABLE: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+
+def _element_sort_key(element: str):
+    """Ключ сортировки элементов: числовые коды по значению, остальные - по строке"""
+    return (0, int(element), '') if element.isdecimal() else (1, 0, element)
+
+
+def parse_subset(subset_str: str) -> FrozenSet[str]:
+    """
+    Преобразует строку вида "{1,2}" в frozenset
+
+    Пробелы вокруг элементов и пустые элементы отбрасываются, поэтому
+    "{1,2}", "{2,1}" и "{1, 2}" дают одно и то же подмножество. Результат
+    интернируется: повторяющиеся ключи разделяют один объект frozenset.
+    """
+    subset = _SUBSET_TABLE.get(subset_str)
+    if subset is None:
+        elements = (element.strip() for element in subset_str.strip().strip("{}").split(","))
+        subset = frozenset(element for element in elements if element)
+        if len(_SUBSET_TABLE) >= MAX_INTERNED:
+            _SUBSET_TABLE.clear()
+            _FROZENSET_TABLE.clear()
+        subset = _FROZENSET_TABLE.setdefault(subset, subset)
+        _SUBSET_TABLE[subset_str] = subset
+    return subset
+
+
+def canonical_subset(subset_str: str) -> str:
+    """Каноническая запись подмножества: "{ 2, 1,1}" -> "{1,2}" (интернированная строка)"""
+    canonical = _CANONICAL_TABLE.get(subset_str)
+    if canonical is None:
+        canonical = sys.intern(format_subset(parse_subset(subset_str)))
+        if len(_CANONICAL_TABLE) >= MAX_INTERNED:
+            _CANONICAL_TABLE.clear()
+        _CANONICAL_TABLE[subset_str] = canonical
+    return canonical
+
+
+def sort_elements(elements: Iterable[str]) -> List[str]:
+    """Упорядочивает элементы фрейма: числовые коды по значению, остальные - по строке"""
+    return sorted(elements, key=_element_sort_key)
+
+
+def format_subset(subset: Iterable[str]) -> str:
+    """Преобразует подмножество в строку вида "{1,2}" с упорядоченными элементами"""
+    return "{" + ",".join(sort_elements(subset)) + "}"
+
 
 class DempsterShafer:
     """Реализация основных функций теории Демпстера-Шейфера"""
     
-    def __init__(self, frame_of_discernment: Set[str]):
+    def __init__(self, frame_of_discernment: Set[str], numeric_mode: str = 'float64'):
+        """
+        Args:
+            frame_of_discernment: Фрейм различения
+            numeric_mode: Численный режим комбинирования по Демпстеру
+                'float64' - словари с float (по умолчанию);
+                'float32' - векторное комбинирование с хранением масс в float32
+                    (экономия памяти, погрешность до numeric_modes.FLOAT32_TOLERANCE);
+                'log_commonality' - произведение функций общности в логарифмах с одной
+                    нормировкой в конце, устойчиво для тысяч источников
+                    (погрешность до numeric_modes.LOG_COMMONALITY_TOLERANCE)
+        """
+        if numeric_mode not in NUMERIC_MODES:
+            raise ValueError(f"Неизвестный численный режим: {numeric_mode}. "
+                             f"Доступны: {', '.join(NUMERIC_MODES)}")
         self.frame = frame_of_discernment
-        self.all_subsets = self._generate_all_subsets()
+        self.numeric_mode = numeric_mode
+        self._all_subsets = None
+        self._elements = None
+        self._bits = None
+    
+    def __reduce__(self):
+        # Сериализуются только фрейм и режим; кеши (в том числе 2^n подмножеств
+        # all_subsets) строятся заново при первом обращении
+        return self.__class__, (set(self.frame), self.numeric_mode)
+    
+    @property
+    def elements(self) -> List[str]:
+        """Упорядоченные элементы фрейма; i-й элемент соответствует биту 1 << i"""
+        if self._elements is None:
+            self._elements = sort_elements(self.frame)
+        return self._elements
+    
+    def subset_to_mask(self, subset: Iterable[str]) -> int:
+        """Битовая маска подмножества фрейма"""
+        if self._bits is None:
+            self._bits = {element: 1 << i for i, element in enumerate(self.elements)}
+        mask = 0
+        for element in subset:
+            try:
+                mask |= self._bits[element]
+            except KeyError:
+                raise ValueError(f"Элемент {element!r} не принадлежит фрейму") from None
+        return mask
+    
+    def mask_to_subset(self, mask: int) -> FrozenSet[str]:
+        """Подмножество фрейма по битовой маске"""
+        elements = self.elements
+        subset = []
+        i = 0
+        while mask:
+            if mask & 1:
+                subset.append(elements[i])
+            mask >>= 1
+            i += 1
+        return frozenset(subset)
+    
+    @property
+    def all_subsets(self) -> List[FrozenSet]:
+        """Все подмножества фрейма (2^n штук, генерируются при первом обращении)"""
+        if self._all_subsets is None:
+            self._all_subsets = self._generate_all_subsets()
+        return self._all_subsets
     
     def _generate_all_subsets(self) -> List[FrozenSet]:
         """Генерирует все подмножества фрейма"""
@@ -22,38 +145,71 @@ class DempsterShafer:
     
     def calculate_bpa(self, data: Dict[str, int]) -> Dict[FrozenSet, float]:
         """Вычисляет BPA по формуле (2.1) из книги"""
-        total = sum(data.values())
+        total = 0
         bpa = {}
-        
+
         for subset_str, count in data.items():
             # Конвертируем строку "{1,2}" в frozenset
-            elements = subset_str.strip("{}").split(",")
-            subset = frozenset() if elements == [''] else frozenset(elements)
-            bpa[subset] = count / total
-            
+            subset = parse_subset(subset_str)
+            # Разные записи одного подмножества ("{1,2}", "{2, 1}") объединяются
+            bpa[subset] = bpa.get(subset, 0) + count
+            total += count
+
+        # Данные, уже нормированные адаптером, повторно не делятся
+        if abs(total - 1) > NORMALIZED_TOLERANCE:
+            for subset in bpa:
+                bpa[subset] /= total
+
         return bpa
     
+    def freeze(self, bpa: Dict[FrozenSet, float]):
+        """Неизменяемая копия BPA над фреймом экземпляра с кешем Bel/Pl/Q (см. frozen_bpa)"""
+        # NumPy и frozen_bpa импортируются только при первом использовании
+        from frozen_bpa import FrozenBPA
+        return FrozenBPA(bpa, self.frame)
+    
+    def index(self, bpa: Dict[FrozenSet, float]):
+        """
+        Индекс фокальных элементов BPA (см. focal_index)
+        
+        Индекс передается в belief/plausibility вместо BPA; для разреженных BPA
+        с тысячами фокальных элементов запросы не просматривают всю BPA.
+        """
+        from focal_index import FocalIndex
+        return FocalIndex(bpa, self.frame)
+    
     def belief(self, event: Set[str], bpa: Dict[FrozenSet, float]) -> float:
-        """Функция доверия Bel(A) - формула (2.2)"""
+        """
+        Функция доверия Bel(A) - формула (2.2)
+        
+        Обычный словарь просматривается целиком (O(F) на запрос): индекс для
+        него не строится и не кешируется, так как словарь может измениться
+        между вызовами. Для больших BPA (от focal_index.INDEX_THRESHOLD
+        фокальных элементов) с многими запросами передайте вместо словаря
+        self.index(bpa) или self.freeze(bpa).
+        """
+        # FrozenBPA и FocalIndex отвечают без просмотра всех фокальных элементов
+        if hasattr(bpa, 'belief'):
+            return bpa.belief(event)
         event_fs = frozenset(event)
         return sum(mass for subset, mass in bpa.items() if subset.issubset(event_fs))
     
     def plausibility(self, event: Set[str], bpa: Dict[FrozenSet, float]) -> float:
-        """Функция правдоподобия Pl(A) - формула (2.2)"""
+        """
+        Функция правдоподобия Pl(A) - формула (2.2)
+        
+        Как и в belief, обычный словарь просматривается целиком; ускорение
+        дают self.index(bpa) или self.freeze(bpa), переданные вместо BPA.
+        """
+        if hasattr(bpa, 'plausibility'):
+            return bpa.plausibility(event)
         event_fs = frozenset(event)
         return sum(mass for subset, mass in bpa.items() if subset.intersection(event_fs))
     
     def dempster_combine(self, bpa1: Dict[FrozenSet, float], bpa2: Dict[FrozenSet, float]) -> Dict[FrozenSet, float]:
         """Правило комбинирования Демпстера - раздел 2.6.1"""
-        # Вычисляем конфликт K
-        conflict = 0.0
-        for s1, m1 in bpa1.items():
-            for s2, m2 in bpa2.items():
-                if s1.isdisjoint(s2):
-                    conflict += m1 * m2
-        
-        if conflict == 1:
-            raise ValueError("Полный конфликт между источниками!")
+        if self.numeric_mode != 'float64':
+            return self._combine_numeric(bpa1, bpa2)
         
         # Комбинируем
         combined = {}
@@ -64,24 +220,40 @@ class DempsterShafer:
                     combined[intersection] = 0.0
                 combined[intersection] += m1 * m2
         
-        # Нормализуем
-        z = 1 - conflict
+        # Нормализуем на сумму непустых масс (в точной арифметике 1 - K);
+        # 1 - K теряет точность при K близком к 1, и ошибка накапливается
+        # при последовательном комбинировании многих источников
+        combined.pop(frozenset(), None)
+        z = sum(combined.values())
+        if z <= 0:
+            raise ValueError("Полный конфликт между источниками!")
         for key in combined:
             combined[key] /= z
         
         combined[frozenset()] = 0.0  # Пустое множество всегда 0
         return combined
     
-    def dempster_combine_multiple(self, *bpas: Dict[FrozenSet, float]) -> Dict[FrozenSet, float]:
+    def dempster_combine_multiple(self, *bpas: Dict[FrozenSet, float],
+                                  order: str = 'given') -> Dict[FrozenSet, float]:
         """
         Правило комбинирования Демпстера для произвольного числа источников
         Использует ассоциативное свойство: m12...n = ((m1 ⊕ m2) ⊕ m3) ⊕ ... ⊕ mn
+        
+        order: 'given' - порядок аргументов; 'left_deep' или 'greedy' - порядок
+        (дерево) выбирает combination_planner по оценке размера промежуточных BPA
         """
         if len(bpas) == 0:
             return {}
         elif len(bpas) == 1:
             return bpas[0]
         
+        if self.numeric_mode != 'float64':
+            return self._combine_numeric(*bpas)
+        
+        if order != 'given':
+            from combination_planner import plan_combination
+            return plan_combination(self, bpas, strategy=order).execute(self, bpas)
+        
         # Начинаем с первого источника
         result = bpas[0]
         
@@ -91,6 +263,14 @@ class DempsterShafer:
         
         return result
     
+    def _combine_numeric(self, *bpas: Dict[FrozenSet, float]) -> Dict[FrozenSet, float]:
+        """Комбинирование по Демпстеру в режимах 'float32' и 'log_commonality'"""
+        # NumPy импортируется только при выборе численного режима
+        import numeric_modes
+        if self.numeric_mode == 'float32':
+            return numeric_modes.float32_combine(self, bpas)
+        return numeric_modes.log_commonality_combine(self, bpas)
+    
     def discount(self, bpa: Dict[FrozenSet, float], alpha: float) -> Dict[FrozenSet, float]:
         """Правило дисконтирования - раздел 2.6.2"""
         discounted = {}
@@ -102,6 +282,156 @@ class DempsterShafer:
         discounted[omega] = discounted.get(omega, 0.0) + alpha
         return discounted
     
+    def _check_alphas(self, bpas: Sequence[Dict[FrozenSet, float]], alphas: Sequence[float]) -> List[float]:
+        """Проверяет коэффициенты дисконтирования (список, кортеж или массив NumPy)"""
+        alphas = [float(alpha) for alpha in alphas]
+        if len(alphas) != len(bpas):
+            raise ValueError(
+                f"Число коэффициентов дисконтирования ({len(alphas)}) "
+                f"не совпадает с числом источников ({len(bpas)})"
+            )
+        for alpha in alphas:
+            if not 0.0 <= alpha <= 1.0:
+                raise ValueError(f"Коэффициент дисконтирования должен лежать в [0, 1]: {alpha}")
+        return alphas
+    
+    def discount_many(self, bpas: Sequence[Dict[FrozenSet, float]],
+                      alphas: Sequence[float]) -> List[Dict[FrozenSet, float]]:
+        """Пакетное дисконтирование: alphas[i] применяется к bpas[i]"""
+        alphas = self._check_alphas(bpas, alphas)
+        omega = frozenset(self.frame)
+        discounted_all = []
+        for bpa, alpha in zip(bpas, alphas):
+            reliability = 1 - alpha
+            discounted = {subset: reliability * mass for subset, mass in bpa.items()}
+            discounted[omega] = discounted.get(omega, 0.0) + alpha
+            discounted_all.append(discounted)
+        return discounted_all
+    
+    def dempster_combine_discounted(self, bpas: Sequence[Dict[FrozenSet, float]],
+                                    alphas: Sequence[float]) -> Dict[FrozenSet, float]:
+        """
+        Дисконтирование и комбинирование по Демпстеру за один проход
+        
+        Эквивалентно dempster_combine_multiple(*discount_many(bpas, alphas)),
+        но дисконтированные копии источников не создаются. Дисконтированная
+        BPA равна (1 - alpha) * m + alpha * m_Ω, а комбинирование с вакуумной
+        m_Ω не меняет результат, поэтому шаг свертки с i-м источником:
+            R ∩ m_i' = (1 - alpha_i) * (R ∩ m_i) + alpha_i * R
+        """
+        if len(bpas) == 0:
+            return {}
+        alphas = self._check_alphas(bpas, alphas)
+        empty = frozenset()
+        
+        # Аккумулятор - единственная материализованная BPA
+        result = self.discount(bpas[0], alphas[0])
+        
+        for bpa, alpha in zip(bpas[1:], alphas[1:]):
+            reliability = 1 - alpha
+            combined = {}
+            if reliability > 0:
+                for s1, m1 in result.items():
+                    if m1 == 0:
+                        continue
+                    weight = reliability * m1
+                    for s2, m2 in bpa.items():
+                        intersection = s1 & s2
+                        combined[intersection] = combined.get(intersection, 0.0) + weight * m2
+            if alpha > 0:
+                for s1, m1 in result.items():
+                    combined[s1] = combined.get(s1, 0.0) + alpha * m1
+            
+            # Масса пустого пересечения - конфликт K; нормировка на сумму
+            # непустых масс (в точной арифметике 1 - K)
+            combined.pop(empty, None)
+            z = sum(combined.values())
+            if z <= 0:
+                raise ValueError("Полный конфликт между источниками!")
+            
+            result = {subset: mass / z for subset, mass in combined.items()}
+            result[empty] = 0.0
+        
+        return result
+    
+    def condition(self, bpa: Dict[FrozenSet, float], event: Set[str]) -> Dict[FrozenSet, float]:
+        """Условная BPA m(·|E) по Демпстеру (комбинирование с категорической m_E)"""
+        return self.condition_many(bpa, [event])[0]
+    
+    def condition_many(self, bpa: Dict[FrozenSet, float],
+                       events: Sequence[Set[str]]) -> List[Dict[FrozenSet, float]]:
+        """
+        Условные BPA m(·|E) для каждого события E
+        
+        Эквивалентно dempster_combine(bpa, {E: 1}) для каждого события, но
+        фокальные элементы переводятся в битовые маски один раз, а пересечения
+        B ∩ E считаются операцией & над целыми числами:
+            m(C|E) = Σ_{B ∩ E = C} m(B) / Pl(E),  C ≠ ∅
+        Подмножества-результаты общие для всех событий.
+        """
+        focal = [(self.subset_to_mask(subset), mass) for subset, mass in bpa.items() if mass != 0]
+        subsets: Dict[int, FrozenSet[str]] = {}
+        empty = frozenset()
+        
+        conditioned_all = []
+        for event in events:
+            event_mask = self.subset_to_mask(event)
+            grouped: Dict[int, float] = {}
+            for mask, mass in focal:
+                intersection = mask & event_mask
+                if intersection:
+                    grouped[intersection] = grouped.get(intersection, 0.0) + mass
+            
+            # Нормировка на Pl(E) - массу непустых пересечений
+            z = sum(grouped.values())
+            if z <= 0:
+                raise ValueError(f"Полный конфликт с событием {format_subset(event)}: Pl = 0")
+            
+            conditioned = {}
+            for mask, mass in grouped.items():
+                subset = subsets.get(mask)
+                if subset is None:
+                    subset = subsets[mask] = self.mask_to_subset(mask)
+                conditioned[subset] = mass / z
+            conditioned[empty] = 0.0
+            conditioned_all.append(conditioned)
+        return conditioned_all
+    
+    def conditional_measures(self, bpa: Dict[FrozenSet, float], events: Sequence[Set[str]],
+                             targets: Sequence[Set[str]]) -> List[Dict[FrozenSet, Dict[str, float]]]:
+        """
+        Bel/Pl целевых событий после обусловливания на каждое событие E
+        
+        Условные BPA не строятся: по формулам обусловливания Демпстера
+            Bel(T|E) = (Bel(T ∪ Ē) - Bel(Ē)) / Pl(E)
+            Pl(T|E)  = Pl(T ∩ E) / Pl(E)
+        значения берутся из одной FrozenBPA (таблицы Bel или индекс фокальных
+        элементов), построенной для всех событий.
+        
+        Returns:
+            List[Dict]: Для каждого события {T: {'belief': ..., 'plausibility': ...}}
+        """
+        frozen = bpa if hasattr(bpa, 'belief') else self.freeze(bpa)
+        omega = frozenset(self.frame)
+        targets = [frozenset(target) for target in targets]
+        
+        measures_all = []
+        for event in events:
+            event = frozenset(event)
+            complement = omega - event
+            pl_event = frozen.plausibility(event)
+            if pl_event <= 0:
+                raise ValueError(f"Полный конфликт с событием {format_subset(event)}: Pl = 0")
+            bel_complement = frozen.belief(complement)
+            measures_all.append({
+                target: {
+                    'belief': (frozen.belief(target | complement) - bel_complement) / pl_event,
+                    'plausibility': frozen.plausibility(target & event) / pl_event,
+                }
+                for target in targets
+            })
+        return measures_all
+    
     def yager_combine(self, bpa1: Dict[FrozenSet, float], bpa2: Dict[FrozenSet, float]) -> Dict[FrozenSet, float]:
         """Правило комбинирования Ягера - раздел 2.6.3"""
         combined = {}
@@ -144,4 +474,15 @@ class DempsterShafer:
         for bpa in bpas[1:]:
             result = self.yager_combine(result, bpa)
         
-        return result
\ No newline at end of file
+        return result
+    
+    def combine(self, bpa1: Dict[FrozenSet, float], bpa2: Dict[FrozenSet, float],
+                rules: Iterable[str] = ('dempster',)) -> Dict[str, Dict[FrozenSet, float]]:
+        """
+        Комбинирование двух источников несколькими правилами за один проход
+        
+        Пересечения фокальных элементов и конфликт вычисляются один раз,
+        после чего из них выводится результат каждого правила
+        ('dempster', 'yager', 'smets', 'dubois_prade', 'pcr5').
+        """
+        return combination_rules.combine(bpa1, bpa2, rules, omega=frozenset(self.frame))
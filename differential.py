@@ -0,0 +1,171 @@
+"""
+Дифференциальная проверка оптимизированных путей против эталонного DempsterShafer
+
+Эталон - DempsterShafer.dempster_combine_multiple в режиме float64. Проверяемый
+путь (engine) получает Workload и возвращает либо BPA (метрика bpa_error), либо
+оценки Bel/Pl событий {событие: {'belief': ..., 'plausibility': ...}}
+(метрика query_error). Если эталон сообщает о полном конфликте, проверяемый
+путь тоже должен завершиться с ValueError.
+
+ENGINES содержит готовые проверки путей, реализованных в проекте; они
+используются тестами (tests/test_differential.py) и бенчмарками (benchmarks/).
+"""
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from numeric_modes import FLOAT32_TOLERANCE, LOG_COMMONALITY_TOLERANCE
+from synthetic_workload import Workload, WorkloadSpec, generate_workload
+
+Engine = Callable[[Workload], object]
+Metric = Callable[[Workload, Dict[FrozenSet, float], object], float]
+
+
+def reference_combine(workload: Workload) -> Dict[FrozenSet, float]:
+    """Эталонное комбинирование по Демпстеру"""
+    return workload.ds().dempster_combine_multiple(*workload.bpas)
+
+
+def bpa_error(workload: Workload, reference: Dict[FrozenSet, float], output: Dict[FrozenSet, float]) -> float:
+    """Наибольшее абсолютное расхождение масс (нулевые массы не учитываются)"""
+    subsets = {s for s, m in reference.items() if m} | {s for s, m in output.items() if m}
+    return max((abs(reference.get(s, 0.0) - output.get(s, 0.0)) for s in subsets), default=0.0)
+
+
+def query_error(workload: Workload, reference: Dict[FrozenSet, float], output: Dict[FrozenSet, dict]) -> float:
+    """Наибольшее абсолютное расхождение Bel/Pl запрошенных событий"""
+    ds = workload.ds()
+    error = 0.0
+    for event, estimate in output.items():
+        error = max(error,
+                    abs(ds.belief(event, reference) - estimate['belief']),
+                    abs(ds.plausibility(event, reference) - estimate['plausibility']))
+    return error
+
+
+class DifferentialReport:
+    """Результат дифференциальной проверки одного пути"""
+
+    def __init__(self, engine: str, tolerance: float):
+        self.engine = engine
+        self.tolerance = tolerance
+        self.cases = 0
+        self.max_error = 0.0
+        # (нагрузка, описание расхождения)
+        self.failures: List[Tuple[Workload, str]] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def summary(self) -> str:
+        """Краткий отчет для вывода в консоль"""
+        lines = [f"{self.engine}: {self.cases} нагрузок, макс. расхождение {self.max_error:.3g} "
+                 f"(допуск {self.tolerance:g}), ошибок {len(self.failures)}"]
+        lines.extend(f"  {workload!r}: {message}" for workload, message in self.failures)
+        return '\n'.join(lines)
+
+
+def run_differential(engine: Engine, workloads: Iterable[Workload], tolerance: float,
+                     metric: Metric = bpa_error, name: str = 'engine') -> DifferentialReport:
+    """
+    Сравнение пути с эталоном на наборе нагрузок
+
+    Args:
+        engine: Проверяемый путь
+        workloads: Нагрузки (например, из generate_workloads)
+        tolerance: Допустимое расхождение по метрике
+        metric: bpa_error или query_error
+        name: Имя пути для отчета
+
+    Returns:
+        DifferentialReport: Число нагрузок, максимальное расхождение и ошибки
+    """
+    report = DifferentialReport(name, tolerance)
+    for workload in workloads:
+        report.cases += 1
+        try:
+            reference = reference_combine(workload)
+        except ValueError:
+            reference = None
+
+        try:
+            output = engine(workload)
+        except ValueError as e:
+            if reference is not None:
+                report.failures.append((workload, f"ошибка {e!s}, эталон успешен"))
+            continue
+        if reference is None:
+            report.failures.append((workload, "эталон сообщает о полном конфликте, путь - нет"))
+            continue
+
+        error = metric(workload, reference, output)
+        report.max_error = max(report.max_error, error)
+        if not error <= tolerance:
+            report.failures.append((workload, f"расхождение {error:.3g} > {tolerance:g}"))
+    return report
+
+
+def generate_workloads(specs: Iterable[WorkloadSpec], seeds: Iterable[int]) -> List[Workload]:
+    """Нагрузки для всех сочетаний параметров и зерен"""
+    seeds = list(seeds)
+    return [generate_workload(spec, seed) for spec in specs for seed in seeds]
+
+
+def default_specs(max_sources: int = 8) -> List[WorkloadSpec]:
+    """Набор параметров, покрывающий распределения мощности и уровни конфликта"""
+    return [
+        WorkloadSpec(frame_size=frame_size, source_count=sources, focal_count=focal,
+                     cardinality=cardinality, conflict=conflict)
+        for frame_size, focal in ((4, 3), (8, 6))
+        for sources in sorted({2, max_sources})
+        for cardinality in ('uniform', 'singleton', 'geometric', 'large')
+        for conflict in (0.0, 0.5, 0.9)
+    ]
+
+
+# Готовые проверки путей проекта: имя -> (путь, метрика, допуск)
+def _float32(workload: Workload):
+    return workload.ds('float32').dempster_combine_multiple(*workload.bpas)
+
+
+def _log_commonality(workload: Workload):
+    return workload.ds('log_commonality').dempster_combine_multiple(*workload.bpas)
+
+
+def _combination_rules(workload: Workload):
+    import combination_rules
+    result = workload.bpas[0]
+    omega = frozenset(workload.frame)
+    for bpa in workload.bpas[1:]:
+        result = combination_rules.combine(result, bpa, ('dempster',), omega)['dempster']
+    return result
+
+
+def _discounted_zero(workload: Workload):
+    ds = workload.ds()
+    return ds.dempster_combine_discounted(workload.bpas, [0.0] * len(workload.bpas))
+
+
+def _monte_carlo(workload: Workload):
+    from monte_carlo import approximate_combine
+    return approximate_combine(workload.ds(), workload.bpas, samples=20000,
+                               seed=workload.seed).as_dict()
+
+
+# Допуски путей numeric_modes - документированные константы модуля
+ENGINES: Dict[str, Tuple[Engine, Metric, float]] = {
+    'float32': (_float32, bpa_error, FLOAT32_TOLERANCE),
+    'log_commonality': (_log_commonality, bpa_error, LOG_COMMONALITY_TOLERANCE),
+    'combination_rules': (_combination_rules, bpa_error, 1e-12),
+    'discounted_zero': (_discounted_zero, bpa_error, 1e-12),
+    'monte_carlo': (_monte_carlo, query_error, 0.05),
+}
+
+
+def check_engines(workloads: List[Workload],
+                  names: Optional[Iterable[str]] = None) -> List[DifferentialReport]:
+    """Проверка нескольких путей из ENGINES на одном наборе нагрузок"""
+    reports = []
+    for name in names or ENGINES:
+        engine, metric, tolerance = ENGINES[name]
+        reports.append(run_differential(engine, workloads, tolerance, metric, name))
+    return reports
@@ -114,8 +114,8 @@ class TestExamples:
         return combined
     
     @staticmethod
-    def get_example_2_6_data():
-        """Возвращает данные примера 2.6 для использования в сравнении"""
+    def get_example_2_6_sources():
+        """Возвращает ядро и источники примера 2.6 без комбинирования"""
         frame = {'1', '2', '3', '4'}
         ds = DempsterShafer(frame)
         
@@ -125,6 +125,13 @@ class TestExamples:
         
         bpa1 = ds.calculate_bpa(data1)
         bpa2 = ds.calculate_bpa(data2)
+        
+        return ds, bpa1, bpa2
+    
+    @staticmethod
+    def get_example_2_6_data():
+        """Возвращает данные примера 2.6 для использования в сравнении"""
+        ds, bpa1, bpa2 = TestExamples.get_example_2_6_sources()
         dempster_combined = ds.dempster_combine(bpa1, bpa2)
         
         return ds, bpa1, bpa2, dempster_combined
@@ -135,10 +142,12 @@ class TestExamples:
         print("\n=== Пример 2.8: Правило комбинирования Ягера ===")
         
         # Используем те же данные, что и в примере 2.6
-        ds, bpa1, bpa2, dempster_combined = TestExamples.get_example_2_6_data()
+        ds, bpa1, bpa2 = TestExamples.get_example_2_6_sources()
         
-        # Комбинируем по Ягеру
-        yager_combined = ds.yager_combine(bpa1, bpa2)
+        # Комбинируем по Ягеру и Демпстеру за один проход по пересечениям
+        results = ds.combine(bpa1, bpa2, rules=['yager', 'dempster'])
+        yager_combined = results['yager']
+        dempster_combined = results['dempster']
         
         print("Результат по Ягеру:")
         for subset, mass in sorted(yager_combined.items(), key=lambda x: (-x[1], len(x[0]))):
@@ -587,6 +596,16 @@ class TestExamples:
         print("6. Рекомендуется использовать оба метода для комплексной оценки")
         print("="*70)
         
+        # Пигнистическая вероятность и доминирование интервалов за один проход по BPA
+        from decision import DecisionEngine
+        engine = DecisionEngine(ds)
+        print("\nЛучшие библиотеки по пигнистической вероятности BetP (Ягер, 4 источника):")
+        for num, betp in engine.top_k(combined_4_yager, 3):
+            print(f"  {library_map[num]:8} ({num}): BetP={betp:.3f}")
+        non_dominated = engine.interval_dominance(combined_4_yager)
+        print("Недоминируемые по интервалам [Bel, Pl]: " +
+              ", ".join(library_map[num] for num, _, _ in non_dominated))
+        
         # Возвращаем результаты для возможной визуализации
         return {
             'frame': frame,
@@ -0,0 +1,174 @@
+"""
+Индекс фокальных элементов для запросов Bel/Pl без полного просмотра BPA
+
+Фокальные элементы хранятся в префиксном дереве (set-trie): каждый элемент
+записан как упорядоченная последовательность номеров элементов фрейма, узел
+хранит массу оканчивающегося в нем множества и суммарную массу поддерева.
+
+    B ⊆ A:      спуск только по ребрам с элементами из A; ветви с элементом
+                вне A отсекаются целиком.
+    B ∩ A ≠ ∅:  по инвертированным спискам "элемент -> фокальные элементы,
+                содержащие его" просматриваются только подходящие B. Если
+                списки для A длиннее числа фокальных элементов, используется
+                дерево: как только на пути встретился элемент из A, поддерево
+                учитывается своей суммой без обхода.
+
+Время запроса зависит от числа просмотренных префиксов, а не от числа
+фокальных элементов, поэтому выигрыш велик для разреженных BPA с десятками
+тысяч фокальных элементов на больших фреймах.
+"""
+import bisect
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from dempster_core import sort_elements
+
+# Число фокальных элементов, начиная с которого индекс выгоднее прямого просмотра
+INDEX_THRESHOLD = 1000
+
+
+class _Node:
+    __slots__ = ('children', 'mass', 'subtree', 'subset')
+
+    def __init__(self):
+        self.children: Dict[int, '_Node'] = {}
+        self.mass = 0.0
+        self.subtree = 0.0
+        self.subset: Optional[FrozenSet[str]] = None
+
+
+class FocalIndex:
+    """Префиксное дерево фокальных элементов BPA"""
+
+    def __init__(self, bpa: Dict[FrozenSet, float], elements: Optional[Iterable[str]] = None):
+        """
+        Args:
+            bpa: Индексируемая BPA (после построения индекс от нее не зависит)
+            elements: Элементы фрейма (по умолчанию - объединение фокальных элементов)
+        """
+        if elements is None:
+            elements = frozenset().union(*bpa)
+        self.elements = sort_elements(elements)
+        self._rank = {element: i for i, element in enumerate(self.elements)}
+        self._root = _Node()
+        # Номер элемента -> узлы фокальных элементов, содержащих его
+        self._postings: Dict[int, List[_Node]] = {}
+        self.total = 0.0
+        self._size = 0
+
+        for subset, mass in bpa.items():
+            if mass == 0:
+                continue
+            try:
+                path = sorted(self._rank[element] for element in subset)
+            except KeyError as e:
+                raise ValueError(f"Элемент {e} не принадлежит фрейму") from None
+            node = self._root
+            node.subtree += mass
+            for rank in path:
+                child = node.children.get(rank)
+                if child is None:
+                    child = node.children[rank] = _Node()
+                node = child
+                node.subtree += mass
+            if node.subset is None:
+                node.subset = frozenset(subset)
+                self._size += 1
+                for rank in path:
+                    self._postings.setdefault(rank, []).append(node)
+            node.mass += mass
+            self.total += mass
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ranks(self, event: Iterable[str]) -> List[int]:
+        """Номера элементов события по возрастанию (элементы вне фрейма не учитываются)"""
+        rank = self._rank
+        return sorted({rank[element] for element in event if element in rank})
+
+    def _subset_nodes(self, event: Iterable[str]) -> Iterator[_Node]:
+        """Узлы, путь к которым целиком лежит в A"""
+        ranks = self._ranks(event)
+        stack = [(self._root, 0)]
+        while stack:
+            node, position = stack.pop()
+            yield node
+            children = node.children
+            if not children:
+                continue
+            # Перебираем меньшее из двух: детей узла или оставшиеся элементы A
+            if len(children) <= len(ranks) - position:
+                for rank, child in children.items():
+                    j = bisect.bisect_left(ranks, rank, position)
+                    if j < len(ranks) and ranks[j] == rank:
+                        stack.append((child, j + 1))
+            else:
+                for j in range(position, len(ranks)):
+                    child = children.get(ranks[j])
+                    if child is not None:
+                        stack.append((child, j + 1))
+
+    def subsets_of(self, event: Iterable[str]) -> Iterator[Tuple[FrozenSet[str], float]]:
+        """Фокальные элементы B ⊆ A (включая ∅) с их массами"""
+        for node in self._subset_nodes(event):
+            if node.subset is not None:
+                yield node.subset, node.mass
+
+    def _posting_nodes(self, ranks: List[int]) -> Optional[set]:
+        """Узлы фокальных элементов, пересекающих A, или None, если списки слишком длинные"""
+        lists = [self._postings[rank] for rank in ranks if rank in self._postings]
+        if sum(map(len, lists)) > self._size:
+            return None
+        return set().union(*lists)
+
+    def intersecting(self, event: Iterable[str]) -> Iterator[Tuple[FrozenSet[str], float]]:
+        """Фокальные элементы B с B ∩ A ≠ ∅ с их массами"""
+        ranks = self._ranks(event)
+        nodes = self._posting_nodes(ranks)
+        if nodes is not None:
+            for node in nodes:
+                yield node.subset, node.mass
+            return
+
+        ranks = set(ranks)
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for rank, child in node.children.items():
+                if rank in ranks:
+                    yield from _walk(child)
+                else:
+                    stack.append(child)
+
+    def belief(self, event: Iterable[str]) -> float:
+        """Функция доверия Bel(A) = Σ_{B ⊆ A} m(B)"""
+        return sum(node.mass for node in self._subset_nodes(event))
+
+    def plausibility(self, event: Iterable[str]) -> float:
+        """Функция правдоподобия Pl(A) = Σ_{B ∩ A ≠ ∅} m(B)"""
+        ranks = self._ranks(event)
+        nodes = self._posting_nodes(ranks)
+        if nodes is not None:
+            return sum(node.mass for node in nodes)
+
+        ranks = set(ranks)
+        result = 0.0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for rank, child in node.children.items():
+                if rank in ranks:
+                    result += child.subtree
+                else:
+                    stack.append(child)
+        return result
+
+
+def _walk(node: _Node) -> Iterator[Tuple[FrozenSet[str], float]]:
+    """Все фокальные элементы поддерева"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.subset is not None:
+            yield node.subset, node.mass
+        stack.extend(node.children.values())
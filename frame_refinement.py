@@ -0,0 +1,163 @@
+"""
+Огрубление и уточнение фрейма различения
+
+Уточнение ω сопоставляет каждому элементу грубого фрейма Θ группу элементов
+точного фрейма Ω; группы образуют разбиение Ω. Для подмножества A ⊆ Ω:
+
+    внешняя редукция  θ̄(A) = {c ∈ Θ : ω(c) ∩ A ≠ ∅}
+    внутренняя редукция θ(A) = {c ∈ Θ : ω(c) ⊆ A}
+
+BPA переносится на грубый фрейм суммированием масс фокальных элементов с
+одинаковой редукцией, а обратно - вакуумным расширением m(ω(B)) = m_Θ(B).
+
+Внешняя редукция точно сохраняет Bel и Pl событий, являющихся объединениями
+групп. Комбинирование на грубом фрейме совпадает с комбинированием на точном,
+если фокальные элементы всех источников - объединения групп (is_compatible);
+иначе внешняя редукция дает менее специфичный результат, а внутренняя -
+более специфичный. Грубый фрейм из k групп обрабатывается за счет 2^k, а не 2^n.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from dempster_core import DempsterShafer, sort_elements
+
+# Виды редукции подмножеств точного фрейма
+REDUCTIONS = ('outer', 'inner')
+
+
+class FrameRefinement:
+    """Уточнение грубого фрейма в точный: группы элементов точного фрейма"""
+
+    def __init__(self, fine_frame: Set[str], groups: Dict[str, Iterable[str]]):
+        """
+        Args:
+            fine_frame: Точный фрейм различения
+            groups: Элемент грубого фрейма -> элементы точного фрейма
+                (группы должны быть непустыми и образовывать разбиение fine_frame)
+        """
+        self.groups = {label: frozenset(members) for label, members in groups.items()}
+        self._group_of = {}
+        for label, members in self.groups.items():
+            if not members:
+                raise ValueError(f"Пустая группа {label!r}")
+            for element in members:
+                if element in self._group_of:
+                    raise ValueError(f"Элемент {element!r} входит в группы "
+                                     f"{self._group_of[element]!r} и {label!r}")
+                self._group_of[element] = label
+
+        fine_frame = set(fine_frame)
+        missing = fine_frame - self._group_of.keys()
+        extra = self._group_of.keys() - fine_frame
+        if missing or extra:
+            raise ValueError(f"Группы не образуют разбиение фрейма: без группы - {sort_elements(missing)}, "
+                             f"вне фрейма - {sort_elements(extra)}")
+
+        self.fine = DempsterShafer(fine_frame)
+        self.coarse = DempsterShafer(set(self.groups))
+
+    @classmethod
+    def from_mapping(cls, mapping: Dict[str, str], fine_frame: Optional[Set[str]] = None) -> 'FrameRefinement':
+        """
+        Уточнение по отображению элемент -> метка группы
+
+        Элементы с одинаковой меткой объединяются в одну группу. Элементы
+        fine_frame, отсутствующие в mapping, образуют отдельные группы.
+        """
+        if fine_frame is None:
+            fine_frame = set(mapping)
+        groups: Dict[str, List[str]] = {}
+        for element in fine_frame:
+            groups.setdefault(mapping.get(element, element), []).append(element)
+        return cls(fine_frame, groups)
+
+    def group_of(self, element: str) -> str:
+        """Элемент грубого фрейма, содержащий элемент точного фрейма"""
+        try:
+            return self._group_of[element]
+        except KeyError:
+            raise ValueError(f"Элемент {element!r} не принадлежит фрейму") from None
+
+    def refine_subset(self, coarse_subset: Iterable[str]) -> FrozenSet[str]:
+        """ω(B): объединение групп элементов грубого подмножества"""
+        return frozenset().union(*(self.groups[label] for label in coarse_subset))
+
+    def outer_reduction(self, subset: Iterable[str]) -> FrozenSet[str]:
+        """Группы, пересекающиеся с подмножеством"""
+        return frozenset(self.group_of(element) for element in subset)
+
+    def inner_reduction(self, subset: Iterable[str]) -> FrozenSet[str]:
+        """Группы, целиком содержащиеся в подмножестве"""
+        subset = frozenset(subset)
+        return frozenset(label for label in self.outer_reduction(subset)
+                         if self.groups[label] <= subset)
+
+    def is_expressible(self, subset: Iterable[str]) -> bool:
+        """Является ли подмножество объединением групп"""
+        subset = frozenset(subset)
+        return self.refine_subset(self.outer_reduction(subset)) == subset
+
+    def is_compatible(self, bpa: Dict[FrozenSet, float]) -> bool:
+        """Все фокальные элементы BPA - объединения групп (огрубление без потерь)"""
+        return all(self.is_expressible(subset) for subset, mass in bpa.items() if mass != 0)
+
+    def coarsen(self, bpa: Dict[FrozenSet, float], reduction: str = 'outer') -> Dict[FrozenSet, float]:
+        """
+        Перенос BPA на грубый фрейм
+
+        При внутренней редукции масса фокальных элементов, не содержащих ни одной
+        группы целиком, попадает на пустое множество.
+        """
+        if reduction not in REDUCTIONS:
+            raise ValueError(f"Неизвестная редукция: {reduction}. Доступны: {', '.join(REDUCTIONS)}")
+        reduce = self.outer_reduction if reduction == 'outer' else self.inner_reduction
+
+        coarse = {}
+        for subset, mass in bpa.items():
+            if mass == 0:
+                continue
+            key = reduce(subset)
+            coarse[key] = coarse.get(key, 0.0) + mass
+        return coarse
+
+    def refine(self, coarse_bpa: Dict[FrozenSet, float]) -> Dict[FrozenSet, float]:
+        """Вакуумное расширение BPA грубого фрейма на точный фрейм"""
+        fine = {}
+        for subset, mass in coarse_bpa.items():
+            key = self.refine_subset(subset)
+            fine[key] = fine.get(key, 0.0) + mass
+        return fine
+
+    def coarse_event(self, event: Iterable[str]) -> FrozenSet[str]:
+        """Событие точного фрейма в терминах групп (только для объединений групп)"""
+        event = frozenset(event)
+        if not self.is_expressible(event):
+            raise ValueError(f"Событие {sort_elements(event)} не выражается через группы грубого фрейма")
+        return self.outer_reduction(event)
+
+    def belief(self, event: Iterable[str], coarse_bpa: Dict[FrozenSet, float]) -> float:
+        """Bel события точного фрейма по BPA грубого фрейма"""
+        return self.coarse.belief(self.coarse_event(event), coarse_bpa)
+
+    def plausibility(self, event: Iterable[str], coarse_bpa: Dict[FrozenSet, float]) -> float:
+        """Pl события точного фрейма по BPA грубого фрейма"""
+        return self.coarse.plausibility(self.coarse_event(event), coarse_bpa)
+
+    def combine(self, bpas: Iterable[Dict[FrozenSet, float]], rule: str = 'dempster',
+                reduction: str = 'outer') -> Dict[FrozenSet, float]:
+        """
+        Огрубление источников и их комбинирование на грубом фрейме
+
+        Args:
+            bpas: BPA точного фрейма
+            rule: 'dempster' или 'yager'
+            reduction: 'outer' или 'inner'
+
+        Returns:
+            Dict[FrozenSet, float]: Результат на грубом фрейме (для точного - refine)
+        """
+        coarse_bpas = [self.coarsen(bpa, reduction) for bpa in bpas]
+        if rule == 'dempster':
+            return self.coarse.dempster_combine_multiple(*coarse_bpas)
+        if rule == 'yager':
+            return self.coarse.yager_combine_multiple(*coarse_bpas)
+        raise ValueError(f"Неизвестное правило комбинирования: {rule}")
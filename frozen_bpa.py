@@ -0,0 +1,289 @@
+"""
+Неизменяемая BPA с лениво кешируемыми производными функциями
+
+FrozenBPA ведет себя как обычный словарь {frozenset: масса} только для чтения
+и передается во все функции проекта, принимающие BPA. Производные величины
+вычисляются при первом обращении и далее берутся из кеша:
+
+    - focal_masks - фокальные элементы в виде битовых масок, упорядоченные по
+      мощности (кортеж списков мощностей, масок и масс);
+    - focal_index - индекс focal_index.FocalIndex для запросов B ⊆ A и
+      B ∩ A ≠ ∅;
+    - таблицы Bel и Q на всех 2^n подмножествах (фреймы до MAX_TABLE_FRAME
+      элементов): Bel(A), Pl(A) = Σm - Bel(Ā) и Q(A) - обращение по индексу;
+    - для больших фреймов Bel и Pl отвечает индекс focal_index: спуск по
+      префиксному дереву посещает только префиксы фокальных элементов,
+      лежащие в A (для Pl - списки элементов A или поддеревья целиком), и не
+      зависит от фокальных элементов вне A; ответы запоминаются;
+    - пигнистическая вероятность, хеш содержимого, признак нормированности.
+
+Операции, меняющие BPA (нормировка, дисконтирование, комбинирование),
+возвращают новый объект.
+"""
+import hashlib
+from functools import cached_property
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+import combination_rules
+from dempster_core import NORMALIZED_TOLERANCE, DempsterShafer, format_subset, sort_elements
+from focal_index import FocalIndex
+from numeric_modes import MAX_COMMONALITY_FRAME, _superset_zeta
+
+# Наибольший фрейм, для которого строятся плотные таблицы Bel (2^n значений)
+MAX_TABLE_FRAME = 16
+
+# Число запомненных ответов Bel/Pl для больших фреймов; при переполнении кеш очищается
+MAX_CACHED_QUERIES = 1 << 16
+
+
+def _subset_zeta(values: np.ndarray, n: int) -> np.ndarray:
+    """Bel(A) = Σ_{B ⊆ A} m(B) для плотного массива длины 2^n (на месте)"""
+    for bit in range(n):
+        view = values.reshape(-1, 2, 1 << bit)
+        view[:, 1, :] += view[:, 0, :]
+    return values
+
+
+class FrozenBPA(Mapping):
+    """Неизменяемая BPA {frozenset: масса} с кешем производных функций"""
+
+    def __init__(self, bpa: Mapping[FrozenSet, float], frame: Optional[Iterable[str]] = None):
+        """
+        Args:
+            bpa: Исходная BPA; нулевые массы отбрасываются, повторяющиеся
+                подмножества объединяются
+            frame: Фрейм различения (по умолчанию - объединение фокальных элементов)
+        """
+        masses = {}
+        for subset, mass in bpa.items():
+            if mass != 0:
+                subset = frozenset(subset)
+                masses[subset] = masses.get(subset, 0.0) + mass
+        frame = frozenset(frame) if frame is not None else frozenset().union(*masses)
+        outside = frozenset().union(*masses) - frame
+        if outside:
+            raise ValueError(f"Элементы {format_subset(outside)} не принадлежат фрейму")
+
+        elements = sort_elements(frame)
+        self.__dict__.update(
+            _masses=masses,
+            frame=frame,
+            elements=elements,
+            _bits={element: 1 << i for i, element in enumerate(elements)},
+            _queries={},
+        )
+
+    @classmethod
+    def _trusted(cls, masses: Dict[FrozenSet, float], elements: Sequence[str]) -> 'FrozenBPA':
+        """Создание без проверок из уже канонических данных (ненулевые массы, элементы по порядку)"""
+        frozen = cls.__new__(cls)
+        frozen.__dict__.update(
+            _masses=masses,
+            frame=frozenset(elements),
+            elements=list(elements),
+            _bits={element: 1 << i for i, element in enumerate(elements)},
+            _queries={},
+        )
+        return frozen
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenBPA неизменяема: операции возвращают новый объект")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenBPA неизменяема: операции возвращают новый объект")
+
+    # Интерфейс словаря только для чтения
+
+    def __getitem__(self, subset: FrozenSet) -> float:
+        return self._masses[subset]
+
+    def __iter__(self) -> Iterator[FrozenSet]:
+        return iter(self._masses)
+
+    def __len__(self) -> int:
+        return len(self._masses)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        # Сериализуются только элементы фрейма и массивы масок/масс; кеши
+        # производных функций строятся заново после загрузки
+        masks, masses = self._packed
+        return _restore, (tuple(self.elements), masks, masses)
+
+    @cached_property
+    def _packed(self):
+        """Маски фокальных элементов (байты, младший бит первым; строка на элемент) и массы"""
+        _, masks, masses = self.focal_masks
+        width = (len(self.elements) + 7) // 8
+        data = b''.join(mask.to_bytes(width, 'little') for mask in masks)
+        packed_masks = np.frombuffer(data, dtype=np.uint8).reshape(len(masks), width)
+        return packed_masks, np.array(masses, dtype=np.float64)
+
+    def __repr__(self) -> str:
+        items = ', '.join(f"{format_subset(s)}: {m:g}" for s, m in self._masses.items())
+        return f"FrozenBPA({{{items}}})"
+
+    def to_dict(self) -> Dict[FrozenSet, float]:
+        """Изменяемая копия в виде обычного словаря"""
+        return dict(self._masses)
+
+    def mask(self, subset: Iterable[str]) -> int:
+        """Битовая маска подмножества; элементы вне фрейма не учитываются"""
+        bits = self._bits
+        mask = 0
+        for element in subset:
+            mask |= bits.get(element, 0)
+        return mask
+
+    # Кешируемые производные величины
+
+    @cached_property
+    def total(self) -> float:
+        """Сумма масс"""
+        return sum(self._masses.values())
+
+    @cached_property
+    def conflict(self) -> float:
+        """Масса пустого множества m(∅)"""
+        return self._masses.get(frozenset(), 0.0)
+
+    @cached_property
+    def is_normalized(self) -> bool:
+        """Сумма масс равна 1, а m(∅) = 0"""
+        return abs(self.total - 1) <= NORMALIZED_TOLERANCE and self.conflict == 0
+
+    @cached_property
+    def content_hash(self) -> str:
+        """Хеш содержимого (SHA-256), не зависящий от порядка фокальных элементов"""
+        # float() - чтобы массы NumPy (np.float64) и Python давали один хеш
+        lines = sorted(f"{format_subset(s)}:{float(m)!r}" for s, m in self._masses.items())
+        return hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+
+    @cached_property
+    def _hash(self) -> int:
+        return int(self.content_hash[:16], 16)
+
+    @cached_property
+    def focal_masks(self) -> Tuple[List[int], List[int], List[float]]:
+        """Фокальные элементы по возрастанию мощности: (мощности, маски, массы)"""
+        focal = sorted(
+            ((len(subset), self.mask(subset), mass) for subset, mass in self._masses.items()),
+            key=lambda item: item[0],
+        )
+        return [f[0] for f in focal], [f[1] for f in focal], [f[2] for f in focal]
+
+    @cached_property
+    def _dense_masses(self) -> np.ndarray:
+        values = np.zeros(1 << len(self.elements))
+        _, masks, masses = self.focal_masks
+        np.add.at(values, np.asarray(masks, dtype=np.int64), masses)
+        return values
+
+    @cached_property
+    def belief_table(self) -> Optional[np.ndarray]:
+        """Bel на всех подмножествах, индекс - битовая маска (None для больших фреймов)"""
+        n = len(self.elements)
+        if n > MAX_TABLE_FRAME:
+            return None
+        table = _subset_zeta(self._dense_masses.copy(), n)
+        table.flags.writeable = False
+        return table
+
+    @cached_property
+    def commonality_table(self) -> np.ndarray:
+        """Функция общности Q(A) = Σ_{B ⊇ A} m(B) на всех подмножествах"""
+        n = len(self.elements)
+        if n > MAX_COMMONALITY_FRAME:
+            raise ValueError(f"Таблица функции общности строится для фреймов до {MAX_COMMONALITY_FRAME} элементов")
+        table = _superset_zeta(self._dense_masses.copy(), n)
+        table.flags.writeable = False
+        return table
+
+    @cached_property
+    def focal_index(self) -> FocalIndex:
+        """Префиксное дерево фокальных элементов для запросов B ⊆ A и B ∩ A ≠ ∅"""
+        return FocalIndex(self._masses, self.frame)
+
+    @cached_property
+    def pignistic(self) -> Mapping[str, float]:
+        """Пигнистическая вероятность BetP всех элементов фрейма"""
+        from decision import DecisionEngine
+        betp = DecisionEngine(DempsterShafer(set(self.frame))).pignistic_probability(self._masses)
+        return MappingProxyType(betp)
+
+    # Запросы
+
+    def _query(self, kind: str, event: Iterable[str]) -> float:
+        """Bel ('belief') или Pl ('plausibility') для больших фреймов с запоминанием"""
+        event = frozenset(event)
+        key = (kind, self.mask(event))
+        cached = self._queries.get(key)
+        if cached is None:
+            cached = getattr(self.focal_index, kind)(event)
+            if len(self._queries) >= MAX_CACHED_QUERIES:
+                self._queries.clear()
+            self._queries[key] = cached
+        return cached
+
+    def belief(self, event: Iterable[str]) -> float:
+        """Функция доверия Bel(A) - формула (2.2)"""
+        table = self.belief_table
+        if table is None:
+            return self._query('belief', event)
+        return float(table[self.mask(event)])
+
+    def plausibility(self, event: Iterable[str]) -> float:
+        """Функция правдоподобия Pl(A) = Σm - Bel(Ā)"""
+        table = self.belief_table
+        if table is None:
+            return self._query('plausibility', event)
+        full = (1 << len(self.elements)) - 1
+        return self.total - float(table[full & ~self.mask(event)])
+
+    def commonality(self, event: Iterable[str]) -> float:
+        """Функция общности Q(A)"""
+        return float(self.commonality_table[self.mask(event)])
+
+    # Операции, возвращающие новый объект
+
+    def normalized(self) -> 'FrozenBPA':
+        """Нормировка по Демпстеру: m(∅) удаляется, массы делятся на 1 - m(∅)"""
+        if self.is_normalized:
+            return self
+        z = self.total - self.conflict
+        if z <= 0:
+            raise ValueError("Нормировка невозможна: вся масса на пустом множестве")
+        return FrozenBPA({s: m / z for s, m in self._masses.items() if s}, self.frame)
+
+    def discount(self, alpha: float) -> 'FrozenBPA':
+        """Дисконтирование с коэффициентом alpha - формула (2.7)"""
+        return FrozenBPA(DempsterShafer(set(self.frame)).discount(self._masses, alpha), self.frame)
+
+    def combine(self, *others: Mapping[FrozenSet, float], rule: str = 'dempster') -> 'FrozenBPA':
+        """Комбинирование с другими BPA правилом из combination_rules.RULES"""
+        frame = self.frame.union(*(getattr(other, 'frame', frozenset()) for other in others))
+        frame = frame.union(*(subset for other in others for subset in other))
+        result = self._masses
+        for other in others:
+            result = combination_rules.combine(result, other, (rule,), frame)[rule]
+        return FrozenBPA(result, frame)
+
+
+def _restore(elements: Tuple[str, ...], masks: np.ndarray, masses: np.ndarray) -> FrozenBPA:
+    """Восстановление FrozenBPA из масок и масс (см. FrozenBPA.__reduce__)"""
+    # Биты масок разворачиваются векторно: номера строк и столбцов единичных битов
+    # дают элементы всех подмножеств подряд, строка i - срез [ends[i-1], ends[i])
+    bits = np.unpackbits(masks, axis=1, count=len(elements), bitorder='little')
+    rows, columns = np.nonzero(bits)
+    names = np.array(elements, dtype=object)[columns].tolist()
+    subsets = []
+    start = 0
+    for end in np.cumsum(np.bincount(rows, minlength=len(masks))).tolist():
+        subsets.append(frozenset(names[start:end]))
+        start = end
+    return FrozenBPA._trusted(dict(zip(subsets, masses.tolist())), elements)
@@ -0,0 +1,348 @@
+"""
+Декларативный граф комбинирования с кешем промежуточных узлов
+
+Конвейер описывается в JSON, расширяющем формат data/library_selection.json:
+
+    {
+      "frame_of_discernment": ["1", "2", "3"],
+      "sources": [
+        {"name": "Эксперты", "data": {"{1}": 5, "{1,2}": 2}},
+        {"name": "Отчет", "path": "example_2_1.json"}
+      ],
+      "nodes": [
+        {"name": "Эксперты'", "op": "discount", "input": "Эксперты", "alpha": 0.1},
+        {"name": "Итог", "op": "combine", "rule": "dempster", "inputs": ["Эксперты'", "Отчет"]},
+        {"name": "Итог|{1,2}", "op": "condition", "input": "Итог", "event": "{1,2}"}
+      ],
+      "outputs": ["Итог", "Итог|{1,2}"]
+    }
+
+Без "nodes" конвейер комбинирует все источники каждым правилом из
+parameters.methods (узлы называются по правилам), поэтому файлы вида
+library_selection.json загружаются без изменений.
+
+Граф (FusionGraph) может содержать много конвейеров:
+    - узлы с одинаковой операцией, параметрами и входами сливаются в один
+      (для ассоциативных и коммутативных правил dempster/smets порядок
+      входов не важен), поэтому общие подграфы вычисляются один раз;
+    - результаты узлов кешируются; update_source сбрасывает кеш только
+      у зависящих от источника узлов;
+    - evaluate считает недостающие узлы по готовности входов, независимые
+      ветви выполняются параллельно в пуле процессов.
+
+Имена узлов локальны для конвейера, общими являются только источники:
+источник с тем же именем и теми же данными переиспользуется.
+"""
+import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import combination_rules
+from dempster_core import DempsterShafer, parse_subset, sort_elements
+from data_adapters import JsonAdapter, load_sources, make_source, parse_bpa
+
+# Операции узлов
+OPERATIONS = ('source', 'discount', 'combine', 'condition')
+
+# Правила, для которых порядок входов не влияет на результат
+COMMUTATIVE_RULES = ('dempster', 'smets')
+
+
+class _Node:
+    """Узел графа: операция, параметры и номера входных узлов"""
+
+    __slots__ = ('op', 'params', 'inputs', 'name')
+
+    def __init__(self, op: str, params: Tuple, inputs: Tuple[int, ...], name: str):
+        self.op = op
+        self.params = params
+        self.inputs = inputs
+        # Имя, под которым узел впервые объявлен (для сообщений)
+        self.name = name
+
+
+def _evaluate_node(frame: List[str], op: str, params: Tuple,
+                   inputs: List[Dict[FrozenSet, float]]) -> Dict[FrozenSet, float]:
+    """Вычисление узла по результатам входов (задача для пула)"""
+    ds = DempsterShafer(set(frame))
+    if op == 'discount':
+        return ds.discount(inputs[0], params[0])
+    if op == 'condition':
+        return ds.condition(inputs[0], params[0])
+
+    rule = params[0]
+    omega = frozenset(frame)
+    result = inputs[0]
+    for bpa in inputs[1:]:
+        result = combination_rules.combine(result, bpa, (rule,), omega)[rule]
+    return result
+
+
+class FusionGraph:
+    """Граф комбинирования нескольких конвейеров с общими подграфами"""
+
+    def __init__(self, frame: Optional[Iterable[str]] = None, workers: int = 1):
+        """
+        Args:
+            frame: Фрейм различения (по умолчанию - из первого конвейера)
+            workers: Число процессов для независимых ветвей (1 - без пула)
+        """
+        self.frame: Optional[List[str]] = sort_elements(frame) if frame is not None else None
+        self.workers = workers
+        self._nodes: List[_Node] = []
+        # Ключ (операция, параметры, входы) -> номер узла
+        self._ids: Dict[Tuple, int] = {}
+        self._sources: Dict[str, int] = {}
+        self._dependents: Dict[int, Set[int]] = {}
+        self._cache: Dict[int, Dict[FrozenSet, float]] = {}
+        # Число вычисленных узлов (для проверки кеширования)
+        self.computed = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    # ---------- построение ----------
+
+    def _intern(self, op: str, params: Tuple, inputs: Tuple[int, ...], name: str) -> int:
+        if op == 'combine' and params[0] in COMMUTATIVE_RULES:
+            inputs = tuple(sorted(inputs))
+        key = (op, params, inputs)
+        node_id = self._ids.get(key)
+        if node_id is None:
+            node_id = self._ids[key] = len(self._nodes)
+            self._nodes.append(_Node(op, params, inputs, name))
+            for input_id in inputs:
+                self._dependents.setdefault(input_id, set()).add(node_id)
+        return node_id
+
+    def _check_frame(self, frame: Iterable[str], origin: str):
+        frame = sort_elements(frame)
+        if self.frame is None:
+            if not frame:
+                raise ValueError(f"В конвейере {origin} не задан фрейм различения")
+            self.frame = frame
+        elif frame and frame != self.frame:
+            raise ValueError(f"Фрейм конвейера {origin} не совпадает с фреймом графа")
+
+    def _parse_bpa(self, name: str, bpa: Dict) -> Dict[FrozenSet, float]:
+        parsed = parse_bpa(bpa, f"BPA источника '{name}'")
+        outside = set().union(*parsed) - set(self.frame)
+        if outside:
+            raise ValueError(f"Элементы {sort_elements(outside)} не принадлежат фрейму")
+        return parsed
+
+    def add_source(self, name: str, bpa: Dict) -> int:
+        """
+        Добавление источника (BPA с ключами frozenset или строками "{1,2}")
+
+        Массы проверяются и нормируются (data_adapters.parse_bpa), разные
+        записи одного подмножества объединяются. Источник с тем же именем переиспользуется, если его BPA совпадает;
+        для изменения данных используется update_source.
+        """
+        if self.frame is None:
+            raise ValueError("Фрейм графа не задан")
+        bpa = self._parse_bpa(name, bpa)
+        node_id = self._sources.get(name)
+        if node_id is not None:
+            if self._cache[node_id] != bpa:
+                raise ValueError(f"Источник '{name}' уже задан с другими данными")
+            return node_id
+        node_id = self._intern('source', (name,), (), name)
+        self._sources[name] = node_id
+        self._cache[node_id] = bpa
+        return node_id
+
+    def add_spec(self, spec: Dict[str, Any], base_dir: Optional[str] = None,
+                 origin: str = '<spec>') -> Dict[str, int]:
+        """
+        Добавление конвейера из JSON-спецификации
+
+        Args:
+            spec: Спецификация (формат в описании модуля)
+            base_dir: Каталог для относительных путей источников 'path'
+            origin: Имя конвейера для сообщений об ошибках
+
+        Returns:
+            Dict[str, int]: Выходы конвейера ('outputs', по умолчанию - все узлы) -> номер узла
+        """
+        self._check_frame(spec.get('frame_of_discernment', []), origin)
+        names: Dict[str, int] = {}
+        adapter = JsonAdapter()
+        for i, source in enumerate(spec.get('sources', [])):
+            name = source.get('name', f"{origin}[{i}]")
+            if 'path' in source:
+                path = Path(base_dir or '.') / source['path']
+                loaded = load_sources([str(path)])
+                if len(loaded) != 1:
+                    raise ValueError(f"Файл {path} источника '{name}' содержит {len(loaded)} источников")
+                bpa = loaded[0]['bpa']
+            else:
+                entry = {'frame_of_discernment': self.frame, 'data': source.get('data')}
+                bpa = make_source(adapter, name, entry, origin)['bpa']
+            names[name] = self.add_source(name, bpa)
+
+        nodes = spec.get('nodes')
+        if nodes is None:
+            # Формат library_selection.json: все источники каждым правилом
+            methods = spec.get('parameters', {}).get('methods', ['dempster'])
+            nodes = [{'name': method, 'op': 'combine', 'rule': method, 'inputs': list(names)}
+                     for method in methods]
+            spec = dict(spec, outputs=spec.get('outputs', methods))
+
+        for node in nodes:
+            name = node.get('name')
+            if not name or name in names:
+                raise ValueError(f"Узел без имени или с повторяющимся именем '{name}' в {origin}")
+            names[name] = self._add_node(node, names, origin)
+
+        outputs = spec.get('outputs', list(names))
+        missing = [output for output in outputs if output not in names]
+        if missing:
+            raise ValueError(f"Неизвестные выходы {missing} в {origin}")
+        return {output: names[output] for output in outputs}
+
+    def _add_node(self, node: Dict[str, Any], names: Dict[str, int], origin: str) -> int:
+        op = node.get('op')
+        name = node['name']
+        if op not in OPERATIONS or op == 'source':
+            raise ValueError(f"Неизвестная операция '{op}' узла '{name}'. "
+                             f"Доступны: {', '.join(OPERATIONS[1:])}")
+
+        references = node.get('inputs') if op == 'combine' else [node.get('input')]
+        if not references or any(reference not in names for reference in references):
+            raise ValueError(f"Узел '{name}' в {origin} ссылается на неизвестные или "
+                             f"еще не объявленные узлы: {references}")
+        inputs = tuple(names[reference] for reference in references)
+
+        if op == 'discount':
+            alpha = node.get('alpha')
+            if type(alpha) not in (int, float) or not 0 <= alpha <= 1:
+                raise ValueError(f"Коэффициент дисконтирования узла '{name}' должен лежать в [0, 1]")
+            params = (float(alpha),)
+        elif op == 'condition':
+            event = parse_subset(node.get('event', ''))
+            if not event or not event <= set(self.frame):
+                raise ValueError(f"Некорректное событие узла '{name}': {node.get('event')!r}")
+            params = (event,)
+        else:
+            rule = node.get('rule', 'dempster')
+            if rule not in combination_rules.RULES:
+                raise ValueError(f"Неизвестное правило '{rule}' узла '{name}'. "
+                                 f"Доступны: {', '.join(combination_rules.RULES)}")
+            params = (rule,)
+        return self._intern(op, params, inputs, name)
+
+    def load(self, path: str) -> Dict[str, int]:
+        """Добавление конвейера из JSON файла (пути источников - относительно файла)"""
+        path = Path(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        return self.add_spec(spec, base_dir=str(path.parent), origin=path.name)
+
+    # ---------- изменение источников ----------
+
+    def update_source(self, name: str, bpa: Dict) -> int:
+        """
+        Замена данных источника со сбросом кеша зависящих от него узлов
+
+        Returns:
+            int: Число узлов, результаты которых сброшены
+        """
+        node_id = self._sources.get(name)
+        if node_id is None:
+            raise ValueError(f"Неизвестный источник: {name}")
+        self._cache[node_id] = self._parse_bpa(name, bpa)
+
+        invalidated = 0
+        stack = list(self._dependents.get(node_id, ()))
+        seen: Set[int] = set()
+        while stack:
+            dependent = stack.pop()
+            if dependent in seen:
+                continue
+            seen.add(dependent)
+            if self._cache.pop(dependent, None) is not None:
+                invalidated += 1
+            stack.extend(self._dependents.get(dependent, ()))
+        return invalidated
+
+    # ---------- вычисление ----------
+
+    def _missing(self, targets: Iterable[int]) -> Set[int]:
+        """Узлы без результата в кеше, нужные для целей"""
+        missing: Set[int] = set()
+        stack = [target for target in targets if target not in self._cache]
+        while stack:
+            node_id = stack.pop()
+            if node_id in missing:
+                continue
+            missing.add(node_id)
+            stack.extend(input_id for input_id in self._nodes[node_id].inputs
+                         if input_id not in self._cache)
+        return missing
+
+    def _task(self, node_id: int) -> Tuple:
+        node = self._nodes[node_id]
+        return self.frame, node.op, node.params, [self._cache[input_id] for input_id in node.inputs]
+
+    def evaluate(self, targets) -> Dict[Any, Dict[FrozenSet, float]]:
+        """
+        Результаты узлов; недостающие вычисляются по готовности входов
+
+        Args:
+            targets: Номера узлов или словарь имя -> номер (результат add_spec/load)
+
+        Returns:
+            Словарь с теми же ключами (имя или номер) -> BPA узла
+        """
+        keys = dict(targets) if isinstance(targets, dict) else {target: target for target in targets}
+        for node_id in keys.values():
+            if not 0 <= node_id < len(self._nodes):
+                raise ValueError(f"Неизвестный узел: {node_id}")
+
+        missing = self._missing(keys.values())
+        # Число невычисленных входов каждого недостающего узла
+        waiting = {node_id: sum(1 for input_id in set(self._nodes[node_id].inputs) if input_id in missing)
+                   for node_id in missing}
+        ready = [node_id for node_id, count in waiting.items() if count == 0]
+
+        def finish(node_id: int, result: Dict[FrozenSet, float]):
+            self._cache[node_id] = result
+            self.computed += 1
+            for dependent in self._dependents.get(node_id, ()):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        ready.append(dependent)
+
+        if self.workers <= 1 or len(missing) <= 1:
+            while ready:
+                node_id = ready.pop()
+                finish(node_id, _evaluate_node(*self._task(node_id)))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                running = {}
+                while ready or running:
+                    while ready:
+                        node_id = ready.pop()
+                        running[executor.submit(_evaluate_node, *self._task(node_id))] = node_id
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(running.pop(future), future.result())
+
+        return {key: self._cache[node_id] for key, node_id in keys.items()}
+
+
+def run_pipelines(paths: Iterable[str], workers: int = 1) -> Dict[str, Dict[str, Dict[FrozenSet, float]]]:
+    """
+    Выполнение нескольких конвейеров в одном графе (общие подграфы считаются один раз)
+
+    Returns:
+        Имя файла -> выход конвейера -> BPA
+    """
+    graph = FusionGraph(workers=workers)
+    pipelines = {Path(path).name: graph.load(path) for path in paths}
+    graph.evaluate({(pipeline, output): node_id
+                    for pipeline, outputs in pipelines.items() for output, node_id in outputs.items()})
+    return {pipeline: graph.evaluate(outputs) for pipeline, outputs in pipelines.items()}
@@ -0,0 +1,416 @@
+"""
+Локальный сервис комбинирования свидетельств (HTTP/JSON на asyncio)
+
+Сервис держит загруженными ядро и пул процессов, поэтому вызов из других
+сервисов не платит за запуск интерпретатора и импорт модулей. Одновременные
+запросы объединяются в пакеты и выполняются в пуле одним вызовом.
+
+Эндпоинты:
+    POST /combine   {"bpas": [{"{1}": 0.6, ...}, ...], "rule": "dempster", "discounts": [...], "queries": [...]}
+    POST /discount  {"bpa": {...}, "alpha": 0.1}
+    POST /query     {"bpa": {...}, "events": ["{1}", "{1,2}"]}
+    GET  /stats     счетчики задержек и пропускной способности
+    GET  /health
+
+Массы каждой BPA запроса проверяются и нормируются к 1 (как в JSON файлах);
+некорректные данные и заголовки дают ответ 400.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from dempster_core import DempsterShafer, format_subset, parse_subset
+from batch_fusion import bpa_to_json, run_fusion
+from data_adapters import parse_bpa, validate_bpa
+
+# Операции, выполняемые в пуле процессов
+OPERATIONS = ('combine', 'discount', 'query')
+
+HTTP_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+def _frame_of(payload: Dict[str, Any], *bpas: Dict[frozenset, float]) -> set:
+    """Фрейм из запроса, дополненный элементами фокальных множеств"""
+    frame = set(payload.get('frame_of_discernment', []))
+    for bpa in bpas:
+        for subset in bpa:
+            frame.update(subset)
+    return frame
+
+
+def execute_operation(operation: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Выполняет одну операцию над ядром DempsterShafer"""
+    if operation == 'combine':
+        raw_bpas = payload.get('bpas')
+        if not isinstance(raw_bpas, list) or not raw_bpas:
+            raise ValueError("Ожидается непустой список 'bpas'")
+        frame = payload.get('frame_of_discernment', [])
+        sources = [
+            {'name': f"bpa{i}", 'frame_of_discernment': frame, 'bpa': validate_bpa(bpa, f"BPA bpas[{i}]")}
+            for i, bpa in enumerate(raw_bpas)
+        ]
+        return run_fusion(sources, payload.get('rule', 'dempster'),
+                          payload.get('discounts'), payload.get('queries'))
+
+    if operation == 'discount':
+        bpa = parse_bpa(payload.get('bpa'))
+        alpha = float(payload.get('alpha', 0.0))
+        if not 0.0 <= alpha <= 1.0:
+            raise ValueError("Коэффициент дисконтирования должен лежать в [0, 1]")
+        ds = DempsterShafer(_frame_of(payload, bpa))
+        return {'bpa': bpa_to_json(ds.discount(bpa, alpha))}
+
+    if operation == 'query':
+        bpa = parse_bpa(payload.get('bpa'))
+        events = [parse_subset(event) for event in payload.get('events', [])]
+        ds = DempsterShafer(_frame_of(payload, bpa))
+        return {'queries': [
+            {
+                'event': format_subset(event),
+                'belief': ds.belief(event, bpa),
+                'plausibility': ds.plausibility(event, bpa),
+            }
+            for event in events
+        ]}
+
+    raise ValueError(f"Неизвестная операция: {operation}")
+
+
+def execute_batch(requests: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[bool, Any]]:
+    """
+    Выполняет пакет операций в одном вызове воркера
+
+    Ошибка одной операции не прерывает пакет: для каждой операции
+    возвращается пара (успех, результат или текст ошибки).
+    """
+    results = []
+    for operation, payload in requests:
+        try:
+            results.append((True, execute_operation(operation, payload)))
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            results.append((False, str(e)))
+    return results
+
+
+def _warm_up() -> bool:
+    """Пустая задача для запуска процессов пула до приема соединений"""
+    return True
+
+
+def create_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Пул процессов для сервиса
+
+    Процессы не должны наследовать через fork открытые сокеты клиентов,
+    иначе закрытие соединения сервером не доходит до клиента. Поэтому
+    используется forkserver (или spawn, если он недоступен).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+class ServiceStats:
+    """Счетчики задержек и пропускной способности сервиса"""
+
+    def __init__(self, window: int = 1024):
+        self.started = time.perf_counter()
+        self.requests_total = 0
+        self.requests_failed = 0
+        self.requests_rejected = 0
+        self.batches_total = 0
+        self.batched_requests = 0
+        self.max_batch_size = 0
+        self.latencies = deque(maxlen=window)
+
+    def record_batch(self, size: int):
+        """Учет выполненного пакета"""
+        self.batches_total += 1
+        self.batched_requests += size
+        self.max_batch_size = max(self.max_batch_size, size)
+
+    def record_request(self, latency: float, ok: bool):
+        """Учет завершенного запроса"""
+        self.requests_total += 1
+        if not ok:
+            self.requests_failed += 1
+        self.latencies.append(latency)
+
+    def snapshot(self, pending: int) -> Dict[str, Any]:
+        """Текущие значения счетчиков"""
+        uptime = time.perf_counter() - self.started
+        latencies = sorted(self.latencies)
+
+        def percentile(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            'uptime_seconds': uptime,
+            'requests_total': self.requests_total,
+            'requests_failed': self.requests_failed,
+            'requests_rejected': self.requests_rejected,
+            'pending': pending,
+            'batches_total': self.batches_total,
+            'mean_batch_size': self.batched_requests / self.batches_total if self.batches_total else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'throughput_rps': self.requests_total / uptime if uptime > 0 else 0.0,
+            'latency_mean_seconds': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_p50_seconds': percentile(0.50),
+            'latency_p95_seconds': percentile(0.95),
+            'latency_max_seconds': latencies[-1] if latencies else 0.0,
+        }
+
+
+class FusionService:
+    """HTTP/JSON сервис над DempsterShafer с пулом процессов и пакетированием запросов"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, workers: int = 2,
+                 max_batch_size: int = 32, batch_window: float = 0.002,
+                 max_pending: int = 1024, max_body_size: int = 16 * 1024 * 1024,
+                 executor: Optional[Executor] = None):
+        """
+        Args:
+            host: Адрес для прослушивания (по умолчанию только localhost)
+            port: Порт; 0 - выбрать свободный
+            workers: Число процессов пула и одновременно выполняемых пакетов
+            max_batch_size: Максимальный размер пакета
+            batch_window: Время ожидания (с) дополнительных запросов после первого в пакете
+            max_pending: Предел запросов в обработке; сверх него сервис отвечает 503
+            max_body_size: Максимальный размер тела запроса в байтах
+            executor: Готовый пул (по умолчанию создается ProcessPoolExecutor)
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_pending = max_pending
+        self.max_body_size = max_body_size
+        self.stats = ServiceStats()
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._server = None
+        self._queue = None
+        self._batcher = None
+        self._slots = None
+        self._pending = 0
+        self._inflight = set()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Фактический адрес сервиса (после start)"""
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        """Запуск сервера и обработчика пакетов"""
+        if self._executor is None:
+            self._executor = create_process_pool(self.workers)
+            # Запускаем процессы и импортируем ядро в них до первого запроса
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[
+                loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)
+            ])
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+
+    async def stop(self):
+        """Остановка сервера; запросы в обработке дожидаются завершения"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def serve_forever(self):
+        """Запуск и обслуживание до отмены"""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def submit(self, operation: str, payload: Dict[str, Any]) -> Tuple[bool, Any]:
+        """Постановка операции в очередь пакетирования"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, payload, future))
+        return await future
+
+    async def _batch_loop(self):
+        """Собирает запросы из очереди в пакеты и отправляет их в пул"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Не больше workers пакетов одновременно - остальные копятся в очереди
+            await self._slots.acquire()
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch):
+        """Выполнение пакета в пуле и раздача результатов"""
+        loop = asyncio.get_running_loop()
+        try:
+            requests = [(operation, payload) for operation, payload, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, execute_batch, requests)
+            except Exception as e:
+                results = [(False, f"Ошибка воркера: {e}")] * len(batch)
+            self.stats.record_batch(len(batch))
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обслуживание соединения (HTTP/1.1 с keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Некорректная строка запроса"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                length = headers.get('content-length', '0') or '0'
+                if not length.isdigit():
+                    await self._respond(writer, 400, {'error': "Некорректный заголовок Content-Length"}, False)
+                    break
+                length = int(length)
+                if length > self.max_body_size:
+                    await self._respond(writer, 413, {'error': "Слишком большое тело запроса"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, response = await self._dispatch(method, path, body)
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Маршрутизация запроса"""
+        path = path.split('?', 1)[0].rstrip('/')
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/stats':
+            return 200, self.stats.snapshot(self._pending)
+
+        operation = path.lstrip('/')
+        if operation not in OPERATIONS:
+            return 404, {'error': f"Неизвестный путь: {path}"}
+        if method != 'POST':
+            return 405, {'error': "Ожидается метод POST"}
+
+        # Ограничение числа запросов в обработке (backpressure)
+        if self._pending >= self.max_pending:
+            self.stats.requests_rejected += 1
+            return 503, {'error': "Сервис перегружен, повторите запрос позже"}
+
+        try:
+            payload = json.loads(body.decode('utf-8')) if body else {}
+            if not isinstance(payload, dict):
+                raise ValueError("Тело запроса должно быть JSON объектом")
+        except (UnicodeDecodeError, ValueError) as e:
+            return 400, {'error': f"Ошибка парсинга JSON: {e}"}
+
+        start = time.perf_counter()
+        self._pending += 1
+        try:
+            ok, result = await self.submit(operation, payload)
+        finally:
+            self._pending -= 1
+        self.stats.record_request(time.perf_counter() - start, ok)
+        return (200, result) if ok else (400, {'error': result})
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool):
+        """Отправка JSON ответа"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode('latin-1') + b"\r\n" + body)
+        await writer.drain()
+
+
+def main():
+    """Запуск сервиса из командной строки"""
+    parser = argparse.ArgumentParser(description="Локальный сервис комбинирования свидетельств")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--batch-window', type=float, default=0.002)
+    parser.add_argument('--max-pending', type=int, default=1024)
+    args = parser.parse_args()
+
+    service = FusionService(args.host, args.port, args.workers, args.max_batch_size,
+                            args.batch_window, args.max_pending)
+    print(f"Сервис комбинирования слушает {args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
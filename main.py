@@ -1,6 +1,13 @@
 """
 Главный файл консольного приложения
+
+Без аргументов запускается интерактивное меню с примерами из книги.
+С аргументами - неинтерактивный режим комбинирования (см. batch_fusion):
+    python main.py combine data/example_2_6_source1.csv data/example_2_6_source2.csv --rule yager
+    python main.py batch jobs/ --output-dir results/ --workers 4
 """
+import sys
+
 from examples import TestExamples
 from visualizer import DSVisualizer
 
@@ -121,4 +128,7 @@ def main():
             print("Неверный выбор! Попробуйте снова.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        import batch_fusion
+        sys.exit(batch_fusion.main(sys.argv[1:]))
     main()
\ No newline at end of file
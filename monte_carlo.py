@@ -0,0 +1,342 @@
+"""
+Приближенное комбинирование по Демпстеру методом Монте-Карло (случайные множества)
+
+Комбинация источников по Демпстеру - это распределение пересечения
+X = A_1 ∩ ... ∩ A_n, где A_k выбираются независимо по m_k, при условии X ≠ ∅.
+Bel(A) и Pl(A) оцениваются как доли выборок с X ⊆ A и X ∩ A ≠ ∅.
+
+Методы:
+    importance - последовательная выборка по значимости (Wilson) с
+                 упреждением: на шаге k фокальный элемент A выбирается с
+                 вероятностью ∝ m_k(A)·ψ_{k+1}(X ∩ A), где
+                 ψ_{k+1}(X) = Σ_{x ∈ X} Π_{j > k} pl_j(x) оценивает, переживет
+                 ли пересечение оставшиеся источники (для одноэлементных X -
+                 точно). Выборки не отвергаются и не уходят в ветви, которые
+                 погасят следующие источники, поэтому метод работает при
+                 конфликте, близком к 1. Веса хранятся в логарифмах; при
+                 вырождении весов выполняется систематическая перевыборка.
+    rejection  - простая выборка с отбрасыванием пустых пересечений;
+                 годится только при умеренном конфликте.
+
+Стоимость O(число выборок · Σ|F_k|) не зависит от числа фокальных
+элементов результата, которое при точном комбинировании растет экспоненциально.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from numeric_modes import PackedBPA
+
+# Методы выборки
+METHODS = ('importance', 'rejection')
+
+
+class MonteCarloResult:
+    """Оценки Bel/Pl запрошенных событий с доверительными интервалами"""
+
+    def __init__(self, queries: List[FrozenSet], belief: np.ndarray, plausibility: np.ndarray,
+                 belief_half_width: np.ndarray, plausibility_half_width: np.ndarray,
+                 samples: int, effective_sample_size: float, log_normalizer: float,
+                 confidence: float, method: str):
+        self.queries = queries
+        self.belief = belief
+        self.plausibility = plausibility
+        # Полуширина доверительного интервала уровня confidence
+        self.belief_half_width = belief_half_width
+        self.plausibility_half_width = plausibility_half_width
+        self.samples = samples
+        # Эффективный размер выборки (Σw)² / Σw²
+        self.effective_sample_size = effective_sample_size
+        # Оценка log(1 - K) для метода importance
+        self.log_normalizer = log_normalizer
+        self.confidence = confidence
+        self.method = method
+
+    @property
+    def max_half_width(self) -> float:
+        """Наибольшая полуширина интервала по всем оценкам"""
+        if not self.queries:
+            return 0.0
+        return float(max(self.belief_half_width.max(), self.plausibility_half_width.max()))
+
+    def belief_interval(self, i: int) -> Tuple[float, float]:
+        """Доверительный интервал Bel i-го события, обрезанный до [0, 1]"""
+        return _clip_interval(self.belief[i], self.belief_half_width[i])
+
+    def plausibility_interval(self, i: int) -> Tuple[float, float]:
+        """Доверительный интервал Pl i-го события, обрезанный до [0, 1]"""
+        return _clip_interval(self.plausibility[i], self.plausibility_half_width[i])
+
+    def as_dict(self) -> Dict[FrozenSet, Dict[str, object]]:
+        """Оценки в виде {событие: {'belief', 'belief_ci', 'plausibility', 'plausibility_ci'}}"""
+        return {
+            query: {
+                'belief': float(self.belief[i]),
+                'belief_ci': self.belief_interval(i),
+                'plausibility': float(self.plausibility[i]),
+                'plausibility_ci': self.plausibility_interval(i),
+            }
+            for i, query in enumerate(self.queries)
+        }
+
+
+def _clip_interval(value: float, half_width: float) -> Tuple[float, float]:
+    return max(0.0, float(value - half_width)), min(1.0, float(value + half_width))
+
+
+def sample_intersections(sources: Sequence[Tuple[np.ndarray, np.ndarray]], full_mask: int,
+                         n: int, seed, method: str = 'importance') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    n случайных пересечений фокальных элементов источников
+
+    Args:
+        sources: Пары (маски uint64, массы float64) упакованных BPA
+        full_mask: Маска фрейма
+        n: Число выборок
+        seed: Зерно генератора (int или np.random.SeedSequence)
+        method: 'importance' или 'rejection'
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Маски пересечений и логарифмы весов
+            (-inf для пустых пересечений)
+    """
+    rng = np.random.default_rng(seed)
+    current = np.full(n, full_mask, dtype=np.uint64)
+
+    if method == 'rejection':
+        for masks, masses in sources:
+            cumulative = np.cumsum(masses)
+            idx = np.searchsorted(cumulative, rng.random(n) * cumulative[-1], side='right')
+            current &= masks[np.minimum(idx, len(masks) - 1)]
+        log_weights = np.where(current != 0, 0.0, -np.inf)
+        return current, log_weights
+
+    log_suffix = _log_contour_suffix(sources, full_mask.bit_length())
+    last = len(sources) - 1
+    log_weights = np.zeros(n)
+    current_log_psi = np.zeros(n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for k, (masks, masses) in enumerate(sources):
+            candidates = current[:, None] & masks[None, :]
+            if k == last:
+                # ψ после последнего источника - индикатор непустого пересечения
+                candidate_log_psi = np.where(candidates != 0, 0.0, -np.inf)
+            else:
+                # Различных пересечений обычно намного меньше, чем пар (выборка, фокальный элемент)
+                unique, inverse = np.unique(candidates, return_inverse=True)
+                candidate_log_psi = _log_psi(unique, log_suffix[k + 1])[inverse].reshape(candidates.shape)
+            log_proposal = np.log(masses)[None, :] + candidate_log_psi
+            log_z = _logsumexp(log_proposal, axis=1)
+            alive = np.isfinite(log_z)
+
+            # Выбор фокального элемента с вероятностью m_k(A)·ψ(X ∩ A) / Z
+            probabilities = np.exp(log_proposal - np.where(alive, log_z, 0.0)[:, None])
+            cumulative = np.cumsum(probabilities, axis=1)
+            u = rng.random(n) * cumulative[:, -1]
+            idx = np.minimum((cumulative <= u[:, None]).sum(axis=1), len(masks) - 1)
+            rows = np.arange(n)
+            current = np.where(alive, candidates[rows, idx], np.uint64(0))
+
+            # Вес: Z_1(Ω) на первом шаге, далее Z_k(X) / ψ_k(X)
+            log_weights += log_z if k == 0 else log_z - current_log_psi
+            log_weights[~alive] = -np.inf
+            current_log_psi = candidate_log_psi[rows, idx]
+            current, log_weights, current_log_psi = _resample_if_degenerate(
+                rng, current, log_weights, current_log_psi)
+
+    return current, log_weights
+
+
+def _log_contour_suffix(sources: Sequence[Tuple[np.ndarray, np.ndarray]], bits: int) -> np.ndarray:
+    """
+    log Π_{j >= k} pl_j(x) для всех k и элементов x (pl_j - контурная функция источника j)
+
+    Returns:
+        np.ndarray: Массив (число источников + 1) x bits; последняя строка - нули
+    """
+    shifts = np.arange(bits, dtype=np.uint64)
+    log_suffix = np.zeros((len(sources) + 1, bits))
+    with np.errstate(divide='ignore'):
+        for k in range(len(sources) - 1, -1, -1):
+            masks, masses = sources[k]
+            contains = ((masks[:, None] >> shifts[None, :]) & np.uint64(1)).astype(bool)
+            log_suffix[k] = log_suffix[k + 1] + np.log(masses @ contains)
+    return log_suffix
+
+
+def _log_psi(masks: np.ndarray, log_suffix: np.ndarray) -> np.ndarray:
+    """
+    log ψ(X) = log Σ_{x ∈ X} Π_{j >= k} pl_j(x) - оценка сверху вероятности того,
+    что пересечение X переживет оставшиеся источники (точная для одноэлементных X)
+    """
+    present = [(value, (masks >> np.uint64(bit)) & np.uint64(1) != 0)
+               for bit, value in enumerate(log_suffix) if np.isfinite(value)]
+    peak = np.full(masks.shape, -np.inf)
+    for value, bits in present:
+        np.maximum(peak, np.where(bits, value, -np.inf), out=peak)
+    finite = np.isfinite(peak)
+    base = np.where(finite, peak, 0.0)
+    total = np.zeros(masks.shape)
+    for value, bits in present:
+        total += np.where(bits, np.exp(value - base), 0.0)
+    with np.errstate(divide='ignore'):
+        return np.where(finite, base + np.log(total), -np.inf)
+
+
+def _logsumexp(values: np.ndarray, axis: int) -> np.ndarray:
+    peak = values.max(axis=axis, keepdims=True)
+    finite = np.isfinite(peak)
+    shifted = np.exp(values - np.where(finite, peak, 0.0))
+    with np.errstate(divide='ignore'):
+        result = np.log(shifted.sum(axis=axis, keepdims=True)) + np.where(finite, peak, 0.0)
+    result[~finite] = -np.inf
+    return np.squeeze(result, axis=axis)
+
+
+def _resample_if_degenerate(rng, current: np.ndarray, log_weights: np.ndarray, *extra: np.ndarray):
+    """
+    Систематическая перевыборка при вырождении весов (ESS < n / 2)
+
+    После перевыборки все веса равны среднему весу до нее, поэтому оценка
+    нормировочной константы log(1 - K) сохраняется. Массивы extra
+    переупорядочиваются вместе с выборками.
+    """
+    alive = np.isfinite(log_weights)
+    if not alive.any():
+        return (current, log_weights, *extra)
+    shift = log_weights[alive].max()
+    weights = np.where(alive, np.exp(log_weights - shift), 0.0)
+    total = weights.sum()
+    n = len(weights)
+    if total * total >= 0.5 * n * np.dot(weights, weights):
+        return (current, log_weights, *extra)
+
+    positions = (rng.random() + np.arange(n)) / n
+    idx = np.minimum(np.searchsorted(np.cumsum(weights) / total, positions, side='right'), n - 1)
+    return (current[idx], np.full(n, np.log(total / n) + shift), *(array[idx] for array in extra))
+
+
+def _sample_chunk(args):
+    """Задача для пула процессов"""
+    return sample_intersections(*args)
+
+
+def _estimate(ds, queries: List[FrozenSet], masks: np.ndarray, log_weights: np.ndarray,
+              confidence: float, method: str) -> MonteCarloResult:
+    """Самонормированные оценки Bel/Pl и их доверительные интервалы"""
+    alive = np.isfinite(log_weights)
+    if not alive.any():
+        raise ValueError("Полный конфликт между источниками: все выборки дали пустое пересечение")
+
+    shift = log_weights[alive].max()
+    weights = np.zeros(len(log_weights))
+    weights[alive] = np.exp(log_weights[alive] - shift)
+    total = weights.sum()
+    normalized = weights / total
+    ess = float(total * total / np.dot(weights, weights))
+    log_normalizer = float(np.log(total / len(weights)) + shift)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    def estimate(indicator: np.ndarray) -> Tuple[float, float]:
+        mean = float(np.dot(normalized, indicator))
+        variance = float(np.dot(normalized * normalized, (indicator - mean) ** 2))
+        return mean, z * np.sqrt(variance)
+
+    belief, belief_hw, plausibility, plausibility_hw = [], [], [], []
+    for query in queries:
+        query_mask = np.uint64(ds.subset_to_mask(query))
+        b, b_hw = estimate((masks & ~query_mask) == 0)
+        p, p_hw = estimate((masks & query_mask) != 0)
+        belief.append(b)
+        belief_hw.append(b_hw)
+        plausibility.append(p)
+        plausibility_hw.append(p_hw)
+
+    return MonteCarloResult(
+        queries, np.asarray(belief), np.asarray(plausibility),
+        np.asarray(belief_hw), np.asarray(plausibility_hw),
+        len(log_weights), ess, log_normalizer, confidence, method
+    )
+
+
+def approximate_combine(ds, bpas: Sequence[Dict[FrozenSet, float]],
+                        queries: Optional[Iterable[Iterable[str]]] = None,
+                        samples: int = 10000, error_target: Optional[float] = None,
+                        confidence: float = 0.95, seed: Optional[int] = None,
+                        method: str = 'importance', workers: int = 1,
+                        chunk_size: int = 2000) -> MonteCarloResult:
+    """
+    Оценка Bel/Pl комбинации источников по Демпстеру методом Монте-Карло
+
+    Args:
+        ds: Экземпляр DempsterShafer (фрейм до 64 элементов)
+        bpas: Комбинируемые BPA
+        queries: События для оценки (по умолчанию - все одноэлементные)
+        samples: Число выборок; при заданном error_target - максимальный бюджет
+        error_target: Требуемая полуширина интервала; выборки добавляются
+            порциями, пока наибольшая полуширина не станет меньше
+        confidence: Уровень доверительных интервалов
+        seed: Зерно для воспроизводимости (без error_target результат не зависит от workers)
+        method: 'importance' или 'rejection'
+        workers: Число процессов (1 - без пула)
+        chunk_size: Размер порции выборок одной задачи
+
+    Returns:
+        MonteCarloResult: Оценки и доверительные интервалы
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод: {method}. Доступны: {', '.join(METHODS)}")
+    if not bpas:
+        raise ValueError("Нет источников для комбинирования")
+    if samples < 1 or chunk_size < 1:
+        raise ValueError("Число выборок и размер порции должны быть положительными")
+
+    if queries is None:
+        queries = [frozenset({element}) for element in ds.elements]
+    else:
+        queries = [frozenset(query) for query in queries]
+
+    sources = []
+    for bpa in bpas:
+        packed = PackedBPA.from_bpa(ds, bpa, 'float64')
+        if not len(packed):
+            raise ValueError("Источник без фокальных элементов")
+        sources.append((packed.masks, packed.masses))
+    full_mask = ds.subset_to_mask(ds.frame)
+
+    # Порции и их зерна фиксированы заранее, поэтому результат не зависит от числа процессов
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+    round_size = max(1, workers)
+
+    masks_parts, weight_parts = [], []
+    result = None
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for start in range(0, len(sizes), round_size):
+            tasks = [(sources, full_mask, size, child, method)
+                     for size, child in zip(sizes[start:start + round_size],
+                                            seed_sequence.spawn(len(sizes[start:start + round_size])))]
+            chunks = executor.map(_sample_chunk, tasks) if executor else map(_sample_chunk, tasks)
+            for masks, log_weights in chunks:
+                masks_parts.append(masks)
+                weight_parts.append(log_weights)
+
+            if error_target is None and start + round_size < len(sizes):
+                continue
+            all_weights = np.concatenate(weight_parts)
+            if error_target is not None and not np.isfinite(all_weights).any():
+                continue
+            result = _estimate(ds, queries, np.concatenate(masks_parts), all_weights,
+                               confidence, method)
+            if error_target is not None and result.max_half_width <= error_target:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if result is None:
+        raise ValueError("Полный конфликт между источниками: все выборки дали пустое пересечение")
+    return result
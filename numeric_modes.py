@@ -0,0 +1,182 @@
+"""
+Численные режимы комбинирования для большого числа источников
+
+    float32         - BPA хранятся как массивы (маски uint64, массы float32);
+                      произведения и суммы считаются в float64, результат
+                      округляется до float32. Память на массы вдвое меньше.
+    log_commonality - правило Демпстера через функции общности
+                      Q(A) = Σ_{B ⊇ A} m(B): Q12(A) ∝ Q1(A)·Q2(A). Произведение
+                      накапливается в логарифмах, нормировка выполняется один
+                      раз в конце, поэтому массы не исчезают в машинном нуле и
+                      деление на 1 - K не теряет точность при тысячах источников.
+
+Допуски относительно эталонного пути float64 (абсолютная погрешность массы):
+    FLOAT32_TOLERANCE         - округление масс до float32 (~6e-8 на операцию)
+    LOG_COMMONALITY_TOLERANCE - обратное преобразование Мёбиуса в float64
+"""
+from typing import Dict, FrozenSet, Iterable, Sequence
+
+import numpy as np
+
+FLOAT32_TOLERANCE = 1e-5
+LOG_COMMONALITY_TOLERANCE = 1e-9
+
+# Фрейм для масок uint64 и плотных массивов функции общности
+MAX_PACKED_FRAME = 64
+MAX_COMMONALITY_FRAME = 20
+
+STORAGE_DTYPES = {'float64': np.float64, 'float32': np.float32}
+
+
+class PackedBPA:
+    """BPA в виде массивов: битовые маски фокальных элементов и их массы"""
+
+    def __init__(self, masks: np.ndarray, masses: np.ndarray):
+        self.masks = masks
+        self.masses = masses
+
+    def __reduce__(self):
+        # С протоколом 5 массивы передаются внеполосными буферами без копирования
+        return self.__class__, (self.masks, self.masses)
+
+    @classmethod
+    def from_bpa(cls, ds, bpa: Dict[FrozenSet, float], dtype: str = 'float32') -> 'PackedBPA':
+        """Упаковка BPA с ключами frozenset (нулевые массы отбрасываются)"""
+        _check_packed_frame(ds)
+        items = [(ds.subset_to_mask(subset), mass) for subset, mass in bpa.items() if mass != 0]
+        masks = np.fromiter((mask for mask, _ in items), dtype=np.uint64, count=len(items))
+        masses = np.fromiter((mass for _, mass in items), dtype=STORAGE_DTYPES[dtype], count=len(items))
+        return cls(masks, masses)
+
+    def to_bpa(self, ds) -> Dict[FrozenSet, float]:
+        """Распаковка в словарь с ключами frozenset"""
+        return {
+            ds.mask_to_subset(int(mask)): float(mass)
+            for mask, mass in zip(self.masks.tolist(), self.masses.tolist())
+        }
+
+    @property
+    def nbytes(self) -> int:
+        """Объем памяти массивов в байтах"""
+        return self.masks.nbytes + self.masses.nbytes
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+
+def _check_packed_frame(ds):
+    if len(ds.frame) > MAX_PACKED_FRAME:
+        raise ValueError(f"Упакованный режим поддерживает фреймы до {MAX_PACKED_FRAME} элементов")
+
+
+def combine_packed(packed1: PackedBPA, packed2: PackedBPA, dtype: str = 'float32') -> PackedBPA:
+    """
+    Векторное правило Демпстера для упакованных BPA
+
+    Все пары обрабатываются одной операцией над массивами: маски пересекаются
+    через bitwise_and.outer, массы одинаковых пересечений суммируются bincount.
+    """
+    masks = np.bitwise_and.outer(packed1.masks, packed2.masks).ravel()
+    products = np.multiply.outer(packed1.masses.astype(np.float64),
+                                 packed2.masses.astype(np.float64)).ravel()
+
+    unique_masks, inverse = np.unique(masks, return_inverse=True)
+    sums = np.bincount(inverse.ravel(), weights=products, minlength=len(unique_masks))
+
+    # Пустое пересечение (маска 0) после сортировки np.unique стоит первым
+    if len(unique_masks) and unique_masks[0] == 0:
+        unique_masks, sums = unique_masks[1:], sums[1:]
+
+    # Нормировка на фактическую сумму непустых пересечений (в точной арифметике
+    # она равна 1 - K): ошибка округления хранимых масс не усиливается в 1/(1 - K) раз
+    z = float(sums.sum())
+    if z <= 0:
+        raise ValueError("Полный конфликт между источниками!")
+
+    keep = sums > 0
+    return PackedBPA(unique_masks[keep], (sums[keep] / z).astype(STORAGE_DTYPES[dtype]))
+
+
+def combine_packed_multiple(packed: Sequence[PackedBPA], dtype: str = 'float32') -> PackedBPA:
+    """Последовательное векторное комбинирование упакованных BPA"""
+    result = packed[0]
+    for item in packed[1:]:
+        result = combine_packed(result, item, dtype)
+    return result
+
+
+def float32_combine(ds, bpas: Sequence[Dict[FrozenSet, float]]) -> Dict[FrozenSet, float]:
+    """Правило Демпстера с хранением промежуточных масс в float32"""
+    packed = [PackedBPA.from_bpa(ds, bpa, 'float32') for bpa in bpas]
+    result = combine_packed_multiple(packed, 'float32').to_bpa(ds)
+    result[frozenset()] = 0.0
+    return result
+
+
+def _superset_zeta(values: np.ndarray, n: int) -> np.ndarray:
+    """Q(A) = Σ_{B ⊇ A} m(B) для плотного массива длины 2^n (на месте)"""
+    for bit in range(n):
+        view = values.reshape(-1, 2, 1 << bit)
+        view[:, 0, :] += view[:, 1, :]
+    return values
+
+
+def _superset_mobius(values: np.ndarray, n: int) -> np.ndarray:
+    """Обратное преобразование: m(A) = Σ_{B ⊇ A} (-1)^{|B \\ A|} Q(B) (на месте)"""
+    for bit in range(n):
+        view = values.reshape(-1, 2, 1 << bit)
+        view[:, 0, :] -= view[:, 1, :]
+    return values
+
+
+def log_commonality(ds, bpa: Dict[FrozenSet, float]) -> np.ndarray:
+    """Логарифм функции общности BPA на всех 2^n подмножествах (log 0 = -inf)"""
+    n = len(ds.frame)
+    dense = np.zeros(1 << n)
+    for subset, mass in bpa.items():
+        dense[ds.subset_to_mask(subset)] += mass
+    _superset_zeta(dense, n)
+    with np.errstate(divide='ignore'):
+        return np.log(np.maximum(dense, 0.0))
+
+
+def log_commonality_combine(ds, bpas: Iterable[Dict[FrozenSet, float]]) -> Dict[FrozenSet, float]:
+    """
+    Правило Демпстера для произвольного числа источников в пространстве log Q
+
+    log Q12...n(A) = Σ_i log Q_i(A) + const; константа (нормировка) выбирается
+    так, чтобы максимум по непустым A был равен 0, после чего массы
+    восстанавливаются преобразованием Мёбиуса и нормируются один раз.
+    """
+    n = len(ds.frame)
+    if n > MAX_COMMONALITY_FRAME:
+        raise ValueError(f"Режим log_commonality поддерживает фреймы до {MAX_COMMONALITY_FRAME} элементов")
+
+    total = None
+    for bpa in bpas:
+        log_q = log_commonality(ds, bpa)
+        total = log_q if total is None else total + log_q
+    if total is None:
+        return {}
+
+    nonempty = total[1:]
+    finite = np.isfinite(nonempty)
+    if not finite.any():
+        raise ValueError("Полный конфликт между источниками!")
+
+    commonality = np.zeros(1 << n)
+    commonality[1:][finite] = np.exp(nonempty[finite] - nonempty[finite].max())
+    masses = _superset_mobius(commonality, n)
+
+    # Q(∅) не задана (отвечает за конфликт), поэтому m(∅) не восстанавливается;
+    # отрицательные остатки порядка машинной точности отбрасываются
+    masses[0] = 0.0
+    masses[masses < 0] = 0.0
+    z = masses.sum()
+    if z <= 0:
+        raise ValueError("Полный конфликт между источниками!")
+    masses /= z
+
+    result = {ds.mask_to_subset(int(mask)): float(masses[mask]) for mask in np.flatnonzero(masses)}
+    result[frozenset()] = 0.0
+    return result
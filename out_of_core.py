@@ -0,0 +1,287 @@
+"""
+Комбинирование по Демпстеру во внешней памяти
+
+Для BPA, у которых промежуточные фокальные множества не помещаются в память,
+пересечения пар считаются блоками и сбрасываются на диск:
+
+    1. Левый операнд читается блоками строк; для блока считаются все
+       пересечения с правым операндом (bitwise_and.outer), массы одинаковых
+       масок суммируются внутри блока.
+    2. Записи (маска, масса) раскладываются по файлам-корзинам по хешу маски,
+       поэтому одна маска всегда попадает в одну корзину.
+    3. Каждая корзина агрегируется независимо (np.unique + bincount); если
+       корзина больше лимита памяти, она заново раскладывается по корзинам
+       с другой солью хеша (не глубже MAX_DEPTH, иначе ValueError).
+    4. Агрегированные корзины дописываются в выходные файлы, которые
+       открываются как np.memmap; нормировка на сумму непустых масс
+       выполняется блоками прямо в отображенном файле.
+
+Память процесса ограничена memory_limit (приблизительно: размер блока и
+корзины выбирается с запасом на временные массивы NumPy).
+"""
+import os
+import shutil
+import tempfile
+from typing import Dict, FrozenSet, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from numeric_modes import PackedBPA, _check_packed_frame
+
+# Лимит памяти по умолчанию, байт
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Запись корзины: маска и масса
+RECORD = np.dtype([('mask', '<u8'), ('mass', '<f8')])
+
+# Запас на временные массивы NumPy при обработке блока или корзины
+_OVERHEAD = 6
+
+# Наибольшее число корзин одного разбиения и глубина повторного разбиения
+MAX_BUCKETS = 256
+MAX_DEPTH = 8
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+class SpilledBPA(PackedBPA):
+    """Упакованная BPA, массивы которой отображены из файлов на диске"""
+
+    def __init__(self, masks: np.ndarray, masses: np.ndarray, directory: str,
+                 owns_directory: bool = False):
+        super().__init__(masks, masses)
+        self.directory = directory
+        self._owns_directory = owns_directory
+
+    def __reduce__(self):
+        # Передаются пути к файлам, а не содержимое; каталог остается за владельцем
+        return _open_spilled, (self.masks.filename, self.masses.filename, len(self), self.directory)
+
+    def blocks(self, rows: int) -> Iterator[PackedBPA]:
+        """Последовательное чтение блоками по rows записей"""
+        for start in range(0, len(self), rows):
+            yield PackedBPA(np.asarray(self.masks[start:start + rows]),
+                            np.asarray(self.masses[start:start + rows]))
+
+    def close(self):
+        """Закрытие отображений: ссылки на np.memmap сбрасываются, файлы остаются"""
+        self.masks = self.masses = np.zeros(0)
+
+    def cleanup(self):
+        """Закрытие отображений и удаление временного каталога (если он создан модулем)"""
+        self.close()
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._owns_directory = False
+
+    def __enter__(self) -> 'SpilledBPA':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+
+def _open_spilled(masks_path: str, masses_path: str, count: int, directory: str) -> SpilledBPA:
+    """Открытие результата по путям к файлам (см. SpilledBPA.__reduce__)"""
+    masks = np.memmap(masks_path, dtype='<u8', mode='r', shape=(count,))
+    masses = np.memmap(masses_path, dtype='<f8', mode='r', shape=(count,))
+    return SpilledBPA(masks, masses, directory)
+
+
+def _bucket_of(masks: np.ndarray, bits: int, salt: int) -> np.ndarray:
+    """Номер корзины по мультипликативному хешу маски (2^bits корзин)"""
+    if bits == 0:
+        return np.zeros(len(masks), dtype=np.int64)
+    with np.errstate(over='ignore'):
+        hashed = (masks ^ np.uint64(salt)) * _GOLDEN
+    return (hashed >> np.uint64(64 - bits)).astype(np.int64)
+
+
+def _aggregate(masks: np.ndarray, masses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Сумма масс одинаковых масок"""
+    unique_masks, inverse = np.unique(masks, return_inverse=True)
+    sums = np.bincount(inverse.ravel(), weights=masses, minlength=len(unique_masks))
+    return unique_masks, sums
+
+
+class _Buckets:
+    """Набор файлов-корзин одного разбиения"""
+
+    def __init__(self, directory: str, prefix: str, bits: int, salt: int):
+        self.paths = [os.path.join(directory, f"{prefix}-{i}.bin") for i in range(1 << bits)]
+        self.bits = bits
+        self.salt = salt
+        self._files = [open(path, 'wb') for path in self.paths]
+
+    def write(self, masks: np.ndarray, masses: np.ndarray):
+        bucket = _bucket_of(masks, self.bits, self.salt)
+        order = np.argsort(bucket, kind='stable')
+        bounds = np.searchsorted(bucket[order], np.arange(len(self._files) + 1))
+        records = np.empty(len(masks), dtype=RECORD)
+        records['mask'] = masks[order]
+        records['mass'] = masses[order]
+        for i, f in enumerate(self._files):
+            if bounds[i] < bounds[i + 1]:
+                records[bounds[i]:bounds[i + 1]].tofile(f)
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+
+def _bucket_bits(records: int, memory_limit: int) -> int:
+    """Число бит номера корзины, чтобы корзина из records записей помещалась в лимит"""
+    needed = records * RECORD.itemsize * _OVERHEAD / memory_limit
+    bits = 0
+    while (1 << bits) < needed and (1 << bits) < MAX_BUCKETS:
+        bits += 1
+    return bits
+
+
+def _drain_bucket(path: str, memory_limit: int, depth: int, output) -> Tuple[float, float]:
+    """
+    Агрегация одной корзины в выходные файлы
+
+    Returns:
+        (масса пустого пересечения, сумма непустых масс)
+    """
+    size = os.path.getsize(path)
+    records_count = size // RECORD.itemsize
+    if records_count * RECORD.itemsize * _OVERHEAD > memory_limit:
+        if depth >= MAX_DEPTH:
+            raise ValueError(f"Корзина из {records_count} записей не помещается в лимит памяти "
+                             f"после {MAX_DEPTH} разбиений: увеличьте memory_limit")
+        # Корзина не помещается: повторное разбиение с другой солью
+        directory = os.path.dirname(path)
+        buckets = _Buckets(directory, f"{os.path.basename(path)}-{depth}",
+                           max(1, _bucket_bits(records_count, memory_limit)), salt=depth + 1)
+        rows = max(1, memory_limit // (RECORD.itemsize * _OVERHEAD))
+        with open(path, 'rb') as f:
+            while True:
+                chunk = np.fromfile(f, dtype=RECORD, count=rows)
+                if not len(chunk):
+                    break
+                # Повторы одной маски из разных блоков схлопываются до записи
+                buckets.write(*_aggregate(chunk['mask'], chunk['mass']))
+        buckets.close()
+        os.remove(path)
+        conflict = nonempty = 0.0
+        for child in buckets.paths:
+            child_conflict, child_nonempty = _drain_bucket(child, memory_limit, depth + 1, output)
+            conflict += child_conflict
+            nonempty += child_nonempty
+        return conflict, nonempty
+
+    records = np.fromfile(path, dtype=RECORD)
+    os.remove(path)
+    masks, sums = _aggregate(records['mask'], records['mass'])
+    conflict = 0.0
+    if len(masks) and masks[0] == 0:
+        conflict = float(sums[0])
+        masks, sums = masks[1:], sums[1:]
+    keep = sums > 0
+    masks, sums = masks[keep], sums[keep]
+    masks.astype('<u8').tofile(output[0])
+    sums.astype('<f8').tofile(output[1])
+    return conflict, float(sums.sum())
+
+
+def _combine_step(left: PackedBPA, right: PackedBPA, directory: str, prefix: str,
+                  memory_limit: int) -> Tuple[SpilledBPA, float]:
+    """Один шаг комбинирования left ⊕ right с корзинами на диске"""
+    # Строк левого операнда в блоке: блок пересечений |block|·|right| записей в лимите
+    row_bytes = max(1, len(right)) * RECORD.itemsize * _OVERHEAD
+    rows = max(1, memory_limit // row_bytes)
+    bits = _bucket_bits(len(left) * len(right), memory_limit)
+    buckets = _Buckets(directory, f"{prefix}-bucket", bits, salt=0)
+
+    right_masses = right.masses.astype(np.float64)
+    blocks = left.blocks(rows) if isinstance(left, SpilledBPA) else (
+        PackedBPA(left.masks[start:start + rows], left.masses[start:start + rows])
+        for start in range(0, len(left), rows)
+    )
+    for block in blocks:
+        masks = np.bitwise_and.outer(block.masks, right.masks).ravel()
+        products = np.multiply.outer(block.masses.astype(np.float64), right_masses).ravel()
+        masks, products = _aggregate(masks, products)
+        buckets.write(masks, products)
+    buckets.close()
+
+    masks_path = os.path.join(directory, f"{prefix}-masks.bin")
+    masses_path = os.path.join(directory, f"{prefix}-masses.bin")
+    conflict = nonempty = 0.0
+    with open(masks_path, 'wb') as masks_file, open(masses_path, 'wb') as masses_file:
+        for path in buckets.paths:
+            bucket_conflict, bucket_nonempty = _drain_bucket(path, memory_limit, 0,
+                                                             (masks_file, masses_file))
+            conflict += bucket_conflict
+            nonempty += bucket_nonempty
+
+    if nonempty <= 0:
+        raise ValueError("Полный конфликт между источниками!")
+
+    count = os.path.getsize(masks_path) // 8
+    masks = np.memmap(masks_path, dtype='<u8', mode='r', shape=(count,))
+    masses = np.memmap(masses_path, dtype='<f8', mode='r+', shape=(count,))
+    # Нормировка на сумму непустых масс блоками в отображенном файле
+    chunk = max(1, memory_limit // (8 * _OVERHEAD))
+    for start in range(0, count, chunk):
+        masses[start:start + chunk] /= nonempty
+    masses.flush()
+    return SpilledBPA(masks, masses, directory), conflict
+
+
+def combine_out_of_core(ds, bpas: Sequence[Dict[FrozenSet, float]],
+                        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                        directory: Optional[str] = None) -> SpilledBPA:
+    """
+    Правило Демпстера для нескольких источников с промежуточными данными на диске
+
+    Args:
+        ds: Экземпляр DempsterShafer (фрейм до numeric_modes.MAX_PACKED_FRAME элементов)
+        bpas: BPA источников; результат i-го шага комбинируется с (i+1)-м источником
+        memory_limit: Приблизительный лимит памяти в байтах
+        directory: Каталог, внутри которого создается уникальный временный
+            подкаталог для файлов (по умолчанию - системный каталог временных
+            файлов); подкаталог удаляется при SpilledBPA.cleanup()
+
+    Returns:
+        SpilledBPA: Результат в файлах, отображенных в память (to_bpa - словарь)
+    """
+    _check_packed_frame(ds)
+    if not bpas:
+        raise ValueError("Нет источников для комбинирования")
+    if memory_limit < RECORD.itemsize * _OVERHEAD:
+        raise ValueError("Слишком маленький лимит памяти")
+
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    # Отдельный подкаталог на вызов: файлы разных вызовов не пересекаются
+    directory = tempfile.mkdtemp(prefix='ds-spill-', dir=directory)
+
+    result: Optional[PackedBPA] = None
+    try:
+        sources = [PackedBPA.from_bpa(ds, bpa, 'float64') for bpa in bpas]
+        result = sources[0]
+        for step, source in enumerate(sources[1:]):
+            combined, _ = _combine_step(result, source, directory, f"step{step}", memory_limit)
+            if isinstance(result, SpilledBPA):
+                # Файлы предыдущего шага удаляются после закрытия их отображений
+                paths = [result.masks.filename, result.masses.filename]
+                result.close()
+                for path in paths:
+                    os.remove(path)
+            result = combined
+
+        if not isinstance(result, SpilledBPA):
+            # Один источник: нормированная копия в файлах
+            result, _ = _combine_step(result, PackedBPA(np.array([ds.subset_to_mask(ds.frame)], dtype=np.uint64),
+                                                        np.ones(1)), directory, "step0", memory_limit)
+    except BaseException:
+        if isinstance(result, SpilledBPA):
+            result.close()
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    result._owns_directory = True
+    return result
@@ -0,0 +1,221 @@
+"""
+Анализ чувствительности Bel/Pl к коэффициентам дисконтирования источников
+
+Дисконтированная BPA m_i' = r_i·m_i + α_i·m_Ω (r_i = 1 - α_i) лишь переносит
+массу на Ω, а вакуумная m_Ω - нейтральный элемент конъюнктивного правила.
+Поэтому ненормированная комбинация раскладывается в полилинейную сумму по
+подмножествам источников S:
+
+    ⊗_i m_i' = Σ_S w_S(α) · m_S,   w_S = Π_{i ∈ S} r_i · Π_{i ∉ S} α_i,
+    m_S = ⊗_{i ∈ S} m_i  (не зависит от α)
+
+Масса непустых множеств, Bel и Pl линейны по BPA, поэтому для каждого S они
+считаются один раз (2^N комбинирований с переиспользованием
+m_{S без последнего источника}), а точка сетки - это скалярное произведение
+весов w_S на таблицу значений:
+
+    1 - K = Σ w_S·(1 - m_S(∅)),  Bel(T) = Σ w_S·Bel_S(T) / (1 - K),
+    Pl(T) = Σ w_S·Pl_S(T) / (1 - K)
+
+Bel_S считается без m_S(∅), поэтому при конфликте, близком к 1, разность
+близких чисел не возникает.
+
+Методы:
+    expansion - полилинейное разложение (до MAX_EXPANSION_SOURCES источников)
+    direct    - дисконтирование и комбинирование заново в каждой точке
+    auto      - expansion, если источников не больше MAX_EXPANSION_SOURCES
+
+Точки обрабатываются порциями, порции распределяются по пулу процессов.
+Точки с полным конфликтом получают NaN.
+"""
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from combination_rules import conjunctive_pass
+
+# Методы расчета
+METHODS = ('auto', 'expansion', 'direct')
+
+# Наибольшее число источников для полилинейного разложения (2^N таблиц значений)
+MAX_EXPANSION_SOURCES = 12
+
+
+class SweepResult:
+    """Bel/Pl целевых событий во всех точках сетки коэффициентов"""
+
+    def __init__(self, alphas: np.ndarray, targets: List[FrozenSet], belief: np.ndarray,
+                 plausibility: np.ndarray, conflict: np.ndarray):
+        # Коэффициенты дисконтирования: точка x источник
+        self.alphas = alphas
+        self.targets = targets
+        # Значения: точка x целевое событие
+        self.belief = belief
+        self.plausibility = plausibility
+        # Конфликт K после дисконтирования в каждой точке
+        self.conflict = conflict
+
+    def __len__(self) -> int:
+        return len(self.alphas)
+
+    def as_records(self) -> List[Dict[str, object]]:
+        """Результат по точкам: {'alphas': [...], 'conflict': K, 'belief': {...}, 'plausibility': {...}}"""
+        from dempster_core import format_subset
+        names = [format_subset(target) for target in self.targets]
+        return [
+            {
+                'alphas': self.alphas[p].tolist(),
+                'conflict': float(self.conflict[p]),
+                'belief': dict(zip(names, self.belief[p].tolist())),
+                'plausibility': dict(zip(names, self.plausibility[p].tolist())),
+            }
+            for p in range(len(self.alphas))
+        ]
+
+
+def discount_grid(values: Sequence[float], sources: int) -> np.ndarray:
+    """Все сочетания значений коэффициента для sources источников (len(values)^sources точек)"""
+    return np.array(list(itertools.product(values, repeat=sources)), dtype=float).reshape(-1, sources)
+
+
+def random_discounts(points: int, sources: int, low: float = 0.0, high: float = 1.0,
+                     seed: Optional[int] = None) -> np.ndarray:
+    """Случайная выборка коэффициентов, равномерно распределенных в [low, high]"""
+    return np.random.default_rng(seed).uniform(low, high, size=(points, sources))
+
+
+def _subset_tables(bpas: Sequence[Dict[FrozenSet, float]], targets: List[FrozenSet],
+                   omega: FrozenSet) -> np.ndarray:
+    """
+    Таблица значений для всех подмножеств источников S (бит i - источник i)
+
+    Столбцы: 1 - m_S(∅), Bel_S(T_1..T_t) (без ∅), Pl_S(T_1..T_t).
+    """
+    t = len(targets)
+    tables = np.zeros((1 << len(bpas), 1 + 2 * t))
+    combined: List[Dict[FrozenSet, float]] = [{}]
+    for i, bpa in enumerate(bpas):
+        bpa = {subset: mass for subset, mass in bpa.items() if mass != 0}
+        # m_{S ∪ {i}} = m_S ⊗ m_i для всех S из источников 0..i-1
+        for previous in combined[:1 << i]:
+            if previous:
+                intersections = conjunctive_pass(previous, bpa).intersections
+                combined.append({s: m for s, m in intersections.items() if m != 0})
+            else:
+                combined.append(bpa)
+
+    # Пустое S - вакуумная BPA
+    combined[0] = {omega: 1.0}
+    for index, bpa in enumerate(combined):
+        tables[index] = _measures(bpa, targets)
+    return tables
+
+
+def _measures(bpa: Dict[FrozenSet, float], targets: List[FrozenSet]) -> np.ndarray:
+    """1 - m(∅), Bel(T_j) без ∅ и Pl(T_j) ненормированной BPA"""
+    values = np.zeros(1 + 2 * len(targets))
+    values[0] = sum(m for s, m in bpa.items() if s)
+    for j, target in enumerate(targets):
+        values[1 + j] = sum(m for s, m in bpa.items() if s and s <= target)
+        values[1 + len(targets) + j] = sum(m for s, m in bpa.items() if s & target)
+    return values
+
+
+def _expansion_chunk(args):
+    """Задача для пула: значения в порции точек по таблицам разложения"""
+    tables, alphas = args
+    n = alphas.shape[1]
+    subsets = np.arange(tables.shape[0])
+    weights = np.ones((len(alphas), len(subsets)))
+    for i in range(n):
+        in_subset = ((subsets >> i) & 1).astype(bool)
+        alpha = alphas[:, i:i + 1]
+        weights *= np.where(in_subset, 1 - alpha, alpha)
+
+    return _normalize(weights @ tables)
+
+
+def _normalize(values: np.ndarray):
+    """Нормировка по Демпстеру; точки с полным конфликтом получают NaN"""
+    z = values[:, 0]
+    t = (values.shape[1] - 1) // 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where(z > 0, 1 / z, np.nan)[:, None]
+    return 1 - z, values[:, 1:1 + t] * scale, values[:, 1 + t:] * scale
+
+
+def _direct_chunk(args):
+    """Задача для пула: дисконтирование и ненормированное комбинирование в каждой точке"""
+    ds, bpas, alphas, targets = args
+    values = np.zeros((len(alphas), 1 + 2 * len(targets)))
+    for p, point in enumerate(alphas):
+        combined = None
+        for bpa in ds.discount_many(bpas, point.tolist()):
+            if combined is None:
+                combined = bpa
+                continue
+            intersections = conjunctive_pass(combined, bpa).intersections
+            combined = {s: m for s, m in intersections.items() if m != 0}
+        values[p] = _measures(combined, targets)
+    return _normalize(values)
+
+
+def discount_sweep(ds, bpas: Sequence[Dict[FrozenSet, float]], alphas,
+                   targets: Iterable[Iterable[str]], method: str = 'auto', workers: int = 1,
+                   chunk_size: int = 1000) -> SweepResult:
+    """
+    Bel/Pl целевых событий после дисконтирования и комбинирования по Демпстеру
+    для каждой точки сетки коэффициентов
+
+    Args:
+        ds: Экземпляр DempsterShafer
+        bpas: BPA источников
+        alphas: Массив точек x источников (discount_grid, random_discounts)
+        targets: Целевые события
+        method: Метод из METHODS
+        workers: Число процессов (1 - без пула)
+        chunk_size: Число точек в одной задаче
+
+    Returns:
+        SweepResult: Значения по точкам
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод: {method}. Доступны: {', '.join(METHODS)}")
+    if not bpas:
+        raise ValueError("Нет источников для комбинирования")
+    alphas = np.asarray(alphas, dtype=float).reshape(-1, len(bpas))
+    if ((alphas < 0) | (alphas > 1)).any():
+        raise ValueError("Коэффициенты дисконтирования должны лежать в [0, 1]")
+    if chunk_size < 1:
+        raise ValueError("Размер порции должен быть положительным")
+    targets = [frozenset(target) for target in targets]
+
+    if method == 'auto':
+        method = 'expansion' if len(bpas) <= MAX_EXPANSION_SOURCES else 'direct'
+    if method == 'expansion' and len(bpas) > MAX_EXPANSION_SOURCES:
+        raise ValueError(f"Метод expansion поддерживает до {MAX_EXPANSION_SOURCES} источников")
+
+    chunks = [alphas[start:start + chunk_size] for start in range(0, len(alphas), chunk_size)]
+    if method == 'expansion':
+        tables = _subset_tables(bpas, targets, frozenset(ds.frame))
+        task, tasks = _expansion_chunk, [(tables, chunk) for chunk in chunks]
+    else:
+        bpas = list(bpas)
+        task, tasks = _direct_chunk, [(ds, bpas, chunk, targets) for chunk in chunks]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(task, tasks))
+    else:
+        parts = [task(args) for args in tasks]
+
+    t = len(targets)
+    if parts:
+        conflict = np.concatenate([part[0] for part in parts])
+        belief = np.concatenate([part[1] for part in parts])
+        plausibility = np.concatenate([part[2] for part in parts])
+    else:
+        conflict, belief, plausibility = np.zeros(0), np.zeros((0, t)), np.zeros((0, t))
+    return SweepResult(alphas, targets, belief, plausibility, conflict)
@@ -0,0 +1,236 @@
+"""
+Хранилище BPA в разделяемой памяти (multiprocessing.shared_memory)
+
+Набор BPA хранится в одном блоке разделяемой памяти в виде массивов
+(маски uint64 и массы float64, как в numeric_modes.PackedBPA). Процессы
+подключаются к блоку по имени и читают или пишут массы без копирования и
+сериализации словарей с frozenset.
+
+Разметка блока (все смещения кратны 8 байтам):
+
+    заголовок   MAGIC, длина JSON фрейма, число BPA, число записей
+    фрейм       JSON список элементов в порядке битов масок
+    offsets     int64[число BPA + 1] - границы записей каждой BPA
+    masks       uint64[число записей]
+    masses      float64[число записей]
+
+Записи сверх фактического числа фокальных элементов BPA заполнены маской 0 и
+массой 0 и не влияют на комбинирование.
+"""
+import json
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set
+
+import numpy as np
+
+from dempster_core import DempsterShafer
+from numeric_modes import PackedBPA, combine_packed, combine_packed_multiple
+
+MAGIC = b'DSBPA001'
+HEADER = struct.Struct('<8sQQQ')
+
+_TRACKER_LOCK = threading.Lock()
+
+
+def _align(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Подключение к существующему блоку без регистрации в resource_tracker
+
+    Иначе трекер подключившегося процесса удаляет блок при его завершении.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Python < 3.13: параметра track нет, регистрация отключается на время подключения
+    with _TRACKER_LOCK:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedBPAStore:
+    """Набор BPA в блоке разделяемой памяти"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """Используйте create, from_bpas или attach"""
+        self._shm = shm
+        self.owner = owner
+
+        magic, frame_size, count, entries = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Блок {shm.name!r} не содержит хранилища BPA")
+        offset = HEADER.size
+        elements = json.loads(bytes(shm.buf[offset:offset + frame_size]).decode('utf-8'))
+        offset += _align(frame_size)
+
+        self.ds = DempsterShafer(set(elements))
+        if self.ds.elements != elements:
+            raise ValueError("Порядок элементов фрейма в блоке не совпадает с порядком битов")
+
+        self.offsets = np.ndarray((count + 1,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self.offsets.nbytes
+        self.masks = np.ndarray((entries,), dtype=np.uint64, buffer=shm.buf, offset=offset)
+        offset += self.masks.nbytes
+        self.masses = np.ndarray((entries,), dtype=np.float64, buffer=shm.buf, offset=offset)
+
+    @classmethod
+    def create(cls, frame: Set[str], sizes: Sequence[int], name: Optional[str] = None) -> 'SharedBPAStore':
+        """
+        Создание пустого хранилища
+
+        Args:
+            frame: Фрейм различения (до 64 элементов)
+            sizes: Максимальное число фокальных элементов каждой BPA
+            name: Имя блока (по умолчанию генерируется)
+        """
+        ds = DempsterShafer(set(frame))
+        PackedBPA.from_bpa(ds, {})  # проверка размера фрейма
+        frame_bytes = json.dumps(ds.elements, ensure_ascii=False).encode('utf-8')
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        entries = int(offsets[-1])
+
+        size = HEADER.size + _align(len(frame_bytes)) + offsets.nbytes + entries * 16
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        try:
+            HEADER.pack_into(shm.buf, 0, MAGIC, len(frame_bytes), len(sizes), entries)
+            shm.buf[HEADER.size:HEADER.size + len(frame_bytes)] = frame_bytes
+            store = cls(shm, owner=True)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        store.offsets[:] = offsets
+        store.masks[:] = 0
+        store.masses[:] = 0
+        return store
+
+    @classmethod
+    def from_bpas(cls, ds: DempsterShafer, bpas: Sequence[Dict[FrozenSet, float]],
+                  name: Optional[str] = None) -> 'SharedBPAStore':
+        """Создание хранилища с копией набора BPA"""
+        packed = [PackedBPA.from_bpa(ds, bpa, 'float64') for bpa in bpas]
+        store = cls.create(ds.frame, [len(item) for item in packed], name)
+        for i, item in enumerate(packed):
+            start, end = store.offsets[i], store.offsets[i + 1]
+            store.masks[start:end] = item.masks
+            store.masses[start:end] = item.masses
+        return store
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedBPAStore':
+        """Подключение к существующему хранилищу по имени (блок не удаляется при release)"""
+        return cls(_attach_untracked(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        """Имя блока разделяемой памяти для передачи другим процессам"""
+        return self._shm.name
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def capacity(self, i: int) -> int:
+        """Максимальное число фокальных элементов i-й BPA"""
+        return int(self.offsets[i + 1] - self.offsets[i])
+
+    def packed(self, i: int) -> PackedBPA:
+        """i-я BPA как представления массивов блока (без копирования)"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return PackedBPA(self.masks[start:end], self.masses[start:end])
+
+    def get_bpa(self, i: int) -> Dict[FrozenSet, float]:
+        """i-я BPA в виде словаря с ключами frozenset"""
+        packed = self.packed(i)
+        nonzero = packed.masses != 0
+        return PackedBPA(packed.masks[nonzero], packed.masses[nonzero]).to_bpa(self.ds)
+
+    def set_bpa(self, i: int, bpa: Dict[FrozenSet, float]):
+        """Запись BPA на место i-й (не больше capacity(i) фокальных элементов)"""
+        packed = PackedBPA.from_bpa(self.ds, bpa, 'float64')
+        if len(packed) > self.capacity(i):
+            raise ValueError(f"BPA из {len(packed)} фокальных элементов не помещается "
+                             f"в слот {i} емкостью {self.capacity(i)}")
+        target = self.packed(i)
+        target.masks[:] = 0
+        target.masses[:] = 0
+        target.masks[:len(packed)] = packed.masks
+        target.masses[:len(packed)] = packed.masses
+
+    def close(self):
+        """Отключение от блока (массивы хранилища становятся недоступны)"""
+        if self._shm is None:
+            return
+        # Представления NumPy держат буфер блока и мешают его закрытию
+        self.offsets = self.masks = self.masses = None
+        self._shm.close()
+
+    def release(self):
+        """Отключение от блока; владелец также удаляет блок"""
+        if self._shm is None:
+            return
+        self.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> 'SharedBPAStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _combine_range(args) -> PackedBPA:
+    """Задача для пула процессов: комбинирование BPA [start, end) хранилища"""
+    name, start, end = args
+    store = SharedBPAStore.attach(name)
+    try:
+        result = combine_packed_multiple([store.packed(i) for i in range(start, end)], 'float64')
+        # Результат копируется до отключения от блока
+        return PackedBPA(result.masks.copy(), result.masses.copy())
+    finally:
+        store.release()
+
+
+def parallel_combine(store: SharedBPAStore, workers: int = 2,
+                     chunks: Optional[int] = None) -> Dict[FrozenSet, float]:
+    """
+    Комбинирование по Демпстеру всех BPA хранилища пулом процессов
+
+    Правило ассоциативно, поэтому каждый процесс комбинирует свой диапазон
+    BPA, читая их прямо из разделяемой памяти, а в родительский процесс
+    передаются только частичные результаты.
+
+    Args:
+        store: Хранилище
+        workers: Число процессов
+        chunks: Число диапазонов (по умолчанию - workers)
+    """
+    count = len(store)
+    if count == 0:
+        raise ValueError("Нет источников для комбинирования")
+    chunks = max(1, min(chunks or workers, count))
+    bounds = [count * k // chunks for k in range(chunks + 1)]
+    tasks = [(store.name, bounds[k], bounds[k + 1]) for k in range(chunks)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partial: List[PackedBPA] = list(executor.map(_combine_range, tasks))
+
+    result = partial[0]
+    for item in partial[1:]:
+        result = combine_packed(result, item, 'float64')
+    bpa = result.to_bpa(store.ds)
+    bpa[frozenset()] = 0.0
+    return bpa
@@ -0,0 +1,209 @@
+"""
+Комбинирование по скользящему окну для потоков свидетельств
+
+Для каждой сущности хранится окно из последних W отчетов (окно по числу)
+или отчетов за последние duration единиц времени (окно по времени).
+Агрегат окна поддерживается очередью на двух стеках:
+
+    back  - новые отчеты и их общий агрегат (одно комбинирование на отчет);
+    front - старые отчеты, каждый хранит агрегат от себя до конца стека;
+            вытеснение старейшего отчета - снятие вершины без вычислений.
+
+Когда front пуст, back перекладывается в front с пересчетом агрегатов
+(k комбинирований на k отчетов), поэтому в среднем на отчет приходится O(1)
+комбинирований, а запрос результата - одно комбинирование front ⊗ back.
+
+Агрегат хранится как пара (непустая часть ненормированного конъюнктивного
+произведения, нормированная к сумме 1; логарифм ее исходной суммы). Правило
+ассоциативно и имеет нейтральный элемент (вакуумную BPA), а непустая часть
+произведения зависит только от непустых частей сомножителей, поэтому масса
+∅ не хранится: для правила Демпстера результат - сама нормированная часть
+(деление на сумму непустых масс, а не на 1 - K, которое теряет точность при
+K близком к 1), для правила Сметса m(∅) = 1 - exp(логарифм суммы).
+Логарифмический масштаб не дает произведению длинного окна уйти в ноль.
+"""
+import math
+from typing import Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from combination_rules import EMPTY, conjunctive_pass, rescale_nonempty
+from dempster_core import DempsterShafer
+
+# Правила, для которых окно можно агрегировать (ассоциативные)
+WINDOW_RULES = ('dempster', 'smets')
+
+
+# Агрегат: (непустые массы с суммой 1, логарифм суммы); None - нейтральный элемент
+Aggregate = Optional[Tuple[Dict[FrozenSet, float], float]]
+
+
+def _conjunctive(left: Aggregate, right: Aggregate) -> Aggregate:
+    """Ненормированное конъюнктивное комбинирование агрегатов"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if not left[0] or not right[0]:
+        return {}, -math.inf
+    intersections = conjunctive_pass(left[0], right[0]).intersections
+    return rescale_nonempty(intersections, left[1] + right[1])
+
+
+class _TwoStackWindow:
+    """Окно одной сущности: очередь на двух стеках с агрегатами"""
+
+    def __init__(self):
+        # (время, агрегат от этого отчета до конца front); вершина - старейший
+        self.front: List[Tuple[Optional[float], Aggregate]] = []
+        # (время, агрегат отчета) в порядке поступления
+        self.back: List[Tuple[Optional[float], Aggregate]] = []
+        self.back_aggregate: Aggregate = None
+
+    def __len__(self) -> int:
+        return len(self.front) + len(self.back)
+
+    def push(self, timestamp: Optional[float], bpa: Dict[FrozenSet, float]):
+        report = rescale_nonempty(bpa, 0.0)
+        self.back.append((timestamp, report))
+        self.back_aggregate = _conjunctive(self.back_aggregate, report)
+
+    def _flip(self):
+        """Перекладывание back во front с пересчетом агрегатов"""
+        aggregate: Aggregate = None
+        for timestamp, report in reversed(self.back):
+            aggregate = _conjunctive(report, aggregate)
+            self.front.append((timestamp, aggregate))
+        self.back = []
+        self.back_aggregate = None
+
+    def oldest_timestamp(self) -> Optional[float]:
+        if not self.front:
+            self._flip()
+        return self.front[-1][0]
+
+    def pop(self):
+        if not self.front:
+            self._flip()
+        self.front.pop()
+
+    def aggregate(self) -> Aggregate:
+        front = self.front[-1][1] if self.front else None
+        return _conjunctive(front, self.back_aggregate)
+
+
+class SlidingWindowFuser:
+    """Комбинирование последних отчетов каждой сущности по скользящему окну"""
+
+    def __init__(self, ds: DempsterShafer, size: Optional[int] = None,
+                 duration: Optional[float] = None, rule: str = 'dempster'):
+        """
+        Args:
+            ds: Экземпляр DempsterShafer (фрейм различения)
+            size: Окно по числу - последние size отчетов
+            duration: Окно по времени - отчеты с временем > now - duration
+            rule: Правило из WINDOW_RULES
+        """
+        if size is None and duration is None:
+            raise ValueError("Нужно задать размер окна (size) и/или длительность (duration)")
+        if size is not None and size < 1:
+            raise ValueError("Размер окна должен быть положительным")
+        if duration is not None and duration <= 0:
+            raise ValueError("Длительность окна должна быть положительной")
+        if rule not in WINDOW_RULES:
+            raise ValueError(f"Правило {rule} не поддерживается окном (нужна ассоциативность). "
+                             f"Доступны: {', '.join(WINDOW_RULES)}")
+        self.ds = ds
+        self.size = size
+        self.duration = duration
+        self.rule = rule
+        self._omega = frozenset(ds.frame)
+        self._windows: Dict[Hashable, _TwoStackWindow] = {}
+        self._last_time: Dict[Hashable, float] = {}
+
+    @property
+    def entities(self) -> List[Hashable]:
+        """Сущности с непустым окном"""
+        return [entity for entity, window in self._windows.items() if len(window)]
+
+    def window_length(self, entity: Hashable) -> int:
+        """Число отчетов в окне сущности"""
+        window = self._windows.get(entity)
+        return len(window) if window is not None else 0
+
+    def push(self, entity: Hashable, bpa: Dict[FrozenSet, float], timestamp: Optional[float] = None):
+        """
+        Добавление отчета сущности
+
+        Для окна по времени timestamp обязателен и не должен убывать
+        в пределах одной сущности.
+        """
+        if self.duration is not None:
+            if timestamp is None:
+                raise ValueError("Для окна по времени нужно время отчета")
+            last = self._last_time.get(entity)
+            if last is not None and timestamp < last:
+                raise ValueError(f"Время отчета {timestamp} меньше предыдущего {last} для {entity!r}")
+            self._last_time[entity] = timestamp
+
+        window = self._windows.get(entity)
+        if window is None:
+            window = self._windows[entity] = _TwoStackWindow()
+        window.push(timestamp, {subset: mass for subset, mass in bpa.items() if mass != 0})
+        self._evict(window, timestamp)
+
+    def _evict(self, window: _TwoStackWindow, now: Optional[float]):
+        if self.size is not None:
+            while len(window) > self.size:
+                window.pop()
+        if self.duration is not None and now is not None:
+            while len(window) and window.oldest_timestamp() <= now - self.duration:
+                window.pop()
+
+    def fused(self, entity: Hashable, now: Optional[float] = None) -> Dict[FrozenSet, float]:
+        """
+        Результат комбинирования окна сущности
+
+        Args:
+            entity: Сущность
+            now: Текущее время для окна по времени (по умолчанию - время
+                последнего отчета); устаревшие отчеты вытесняются
+
+        Returns:
+            Dict[FrozenSet, float]: BPA окна; для пустого окна - вакуумная BPA
+        """
+        window = self._windows.get(entity)
+        if window is None or not len(window):
+            return {self._omega: 1.0}
+        if self.duration is not None and now is not None:
+            self._evict(window, now)
+            if not len(window):
+                return {self._omega: 1.0}
+
+        masses, log_scale = window.aggregate()
+        if self.rule == 'smets':
+            scale = math.exp(log_scale)
+            result = {subset: mass * scale for subset, mass in masses.items()}
+            result[EMPTY] = max(0.0, 1.0 - scale)
+            return result
+
+        if not masses:
+            raise ValueError("Полный конфликт между источниками!")
+        # Непустая часть уже нормирована на сумму непустых масс
+        result = dict(masses)
+        result[EMPTY] = 0.0
+        return result
+
+
+def fuse_stream(ds: DempsterShafer,
+                reports: Iterable[Tuple[Hashable, Optional[float], Dict[FrozenSet, float]]],
+                size: Optional[int] = None, duration: Optional[float] = None,
+                rule: str = 'dempster') -> Iterator[Tuple[Hashable, Optional[float], Dict[FrozenSet, float]]]:
+    """
+    Комбинирование потока отчетов (сущность, время, BPA) по скользящему окну
+
+    Yields:
+        (сущность, время, BPA окна сущности) после каждого отчета
+    """
+    fuser = SlidingWindowFuser(ds, size=size, duration=duration, rule=rule)
+    for entity, timestamp, bpa in reports:
+        fuser.push(entity, bpa, timestamp)
+        yield entity, timestamp, fuser.fused(entity)
@@ -0,0 +1,130 @@
+"""
+Генератор синтетических нагрузок: случайные фреймы и BPA с заданными параметрами
+
+Параметры нагрузки (WorkloadSpec):
+    frame_size   - число элементов фрейма ('1'..'n')
+    source_count - число источников
+    focal_count  - число фокальных элементов каждого источника (без Ω)
+    cardinality  - распределение мощности фокальных элементов:
+                   'uniform'   - равномерно от 1 до размера области источника
+                   'singleton' - только одноэлементные множества
+                   'geometric' - P(k) ∝ 2^-k, преобладают малые множества
+                   'large'     - преобладают множества, близкие к области целиком
+    conflict     - уровень конфликта от 0 до 1: каждый источник выбирает
+                   фокальные элементы внутри своей случайной области из
+                   ~(1 - conflict)·n элементов; чем меньше области, тем реже
+                   они пересекаются
+    omega_mass   - масса Ω у каждого источника (> 0 исключает полный конфликт)
+
+Одинаковые spec и seed всегда дают одну и ту же нагрузку.
+"""
+import random
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from dempster_core import DempsterShafer
+
+# Распределения мощности фокальных элементов
+CARDINALITIES = ('uniform', 'singleton', 'geometric', 'large')
+
+
+class WorkloadSpec:
+    """Параметры синтетической нагрузки"""
+
+    def __init__(self, frame_size: int = 6, source_count: int = 3, focal_count: int = 4,
+                 cardinality: str = 'uniform', conflict: float = 0.3, omega_mass: float = 0.05):
+        if frame_size < 1 or source_count < 1 or focal_count < 1:
+            raise ValueError("Размер фрейма, число источников и фокальных элементов должны быть положительными")
+        if cardinality not in CARDINALITIES:
+            raise ValueError(f"Неизвестное распределение мощности: {cardinality}. "
+                             f"Доступны: {', '.join(CARDINALITIES)}")
+        if not 0 <= conflict <= 1:
+            raise ValueError("Уровень конфликта должен быть в диапазоне [0, 1]")
+        if not 0 <= omega_mass < 1:
+            raise ValueError("Масса Ω должна быть в диапазоне [0, 1)")
+        self.frame_size = frame_size
+        self.source_count = source_count
+        self.focal_count = focal_count
+        self.cardinality = cardinality
+        self.conflict = conflict
+        self.omega_mass = omega_mass
+
+    def as_dict(self) -> Dict[str, object]:
+        """Параметры в виде словаря (для отчетов)"""
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        params = ', '.join(f"{key}={value!r}" for key, value in vars(self).items())
+        return f"WorkloadSpec({params})"
+
+
+class Workload:
+    """Сгенерированная нагрузка: фрейм и BPA источников"""
+
+    def __init__(self, spec: WorkloadSpec, seed: Optional[int], frame: Set[str],
+                 bpas: List[Dict[FrozenSet, float]]):
+        self.spec = spec
+        self.seed = seed
+        self.frame = frame
+        self.bpas = bpas
+
+    def ds(self, numeric_mode: str = 'float64') -> DempsterShafer:
+        """Экземпляр DempsterShafer над фреймом нагрузки"""
+        return DempsterShafer(self.frame, numeric_mode=numeric_mode)
+
+    def __repr__(self) -> str:
+        return f"Workload(seed={self.seed!r}, {self.spec!r})"
+
+
+def generate_frame(size: int) -> Set[str]:
+    """Фрейм из элементов '1'..'size'"""
+    return {str(i) for i in range(1, size + 1)}
+
+
+def _cardinality(rng: random.Random, distribution: str, limit: int) -> int:
+    """Мощность фокального элемента от 1 до limit по выбранному распределению"""
+    if distribution == 'singleton':
+        return 1
+    if distribution == 'uniform':
+        return rng.randint(1, limit)
+    k = 1
+    while k < limit and rng.random() < 0.5:
+        k += 1
+    return k if distribution == 'geometric' else limit + 1 - k
+
+
+def generate_bpa(rng: random.Random, elements: List[str], spec: WorkloadSpec) -> Dict[FrozenSet, float]:
+    """Случайная нормированная BPA одного источника"""
+    territory_size = max(1, round(len(elements) * (1 - spec.conflict)))
+    territory = rng.sample(elements, territory_size)
+
+    weights = {}
+    for _ in range(spec.focal_count):
+        size = _cardinality(rng, spec.cardinality, territory_size)
+        subset = frozenset(rng.sample(territory, size))
+        weights[subset] = weights.get(subset, 0.0) + rng.random() + 1e-3
+
+    total = sum(weights.values())
+    scale = (1 - spec.omega_mass) / total
+    bpa = {subset: weight * scale for subset, weight in weights.items()}
+    if spec.omega_mass > 0:
+        omega = frozenset(elements)
+        bpa[omega] = bpa.get(omega, 0.0) + spec.omega_mass
+    return bpa
+
+
+def generate_workload(spec: WorkloadSpec, seed: Optional[int] = None) -> Workload:
+    """
+    Воспроизводимая синтетическая нагрузка
+
+    Args:
+        spec: Параметры нагрузки
+        seed: Зерно генератора
+
+    Returns:
+        Workload: Фрейм и BPA источников
+    """
+    rng = random.Random(seed)
+    frame = generate_frame(spec.frame_size)
+    elements = sorted(frame, key=int)
+    bpas = [generate_bpa(rng, elements, spec) for _ in range(spec.source_count)]
+    return Workload(spec, seed, frame, bpas)
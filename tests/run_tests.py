@@ -3,6 +3,8 @@
 Скрипт для запуска всех тестов проекта
 """
 
+import argparse
+import os
 import unittest
 import sys
 from pathlib import Path
@@ -28,5 +30,12 @@ def run_all_tests():
     return result.wasSuccessful()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Запуск всех тестов проекта")
+    parser.add_argument('--stress', type=int, metavar='N',
+                        help="Число зерен на набор параметров в дифференциальных тестах (по умолчанию 2)")
+    args = parser.parse_args()
+    if args.stress:
+        os.environ['DS_DIFFERENTIAL_SEEDS'] = str(args.stress)
+
     success = run_all_tests()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,113 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_adapters import CsvAdapter, JsonAdapter, iter_sources_as_completed, load_and_combine, load_sources_async
+from dempster_core import DempsterShafer
+
+
+class SlowJsonAdapter(JsonAdapter):
+    """JSON адаптер, имитирующий медленное сетевое хранилище"""
+
+    delay = 0.2
+
+    def load(self, filepath):
+        time.sleep(self.delay)
+        return super().load(filepath)
+
+
+class TestAsyncLoader(unittest.TestCase):
+    """Тесты асинхронной загрузки источников"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.test_data_dir = Path(__file__).parent.parent / "data"
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.paths = []
+        sources = [{"{1}": 5, "{2,3}": 3}, {"{1,2}": 8, "{3}": 7, "{4}": 1},
+                   {"{1,2,3,4}": 2, "{1}": 1}, {"{2}": 1, "{1,2}": 4}]
+        for i, data in enumerate(sources):
+            path = os.path.join(self.temp_dir.name, f"source_{i}.json")
+            JsonAdapter().save({'frame_of_discernment': ['1', '2', '3', '4'], 'data': data}, path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_async_adapter_methods(self):
+        """Тест: асинхронные варианты load/transform_to_bpa совпадают с синхронными"""
+        adapter = CsvAdapter()
+        filepath = str(self.test_data_dir / "example_2_1.csv")
+
+        async def run():
+            data = await adapter.load_async(filepath)
+            return data, await adapter.transform_to_bpa_async(data)
+
+        data, bpa = asyncio.run(run())
+        self.assertEqual(data, adapter.load(filepath))
+        self.assertEqual(bpa, adapter.transform_to_bpa(data))
+
+    def test_concurrent_loading_time(self):
+        """Тест: время загрузки приближается к самому медленному файлу, а не к сумме"""
+        start = time.perf_counter()
+        sources = asyncio.run(load_sources_async(self.paths, max_workers=4,
+                                                 adapter_factory=lambda path: SlowJsonAdapter()))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([source.filepath for source in sources], self.paths)
+        self.assertLess(elapsed, SlowJsonAdapter.delay * len(self.paths) * 0.75)
+
+    def test_early_close_does_not_wait(self):
+        """Тест: досрочное закрытие генератора не ждет медленных чтений"""
+        delay = 1.0
+
+        def factory(path):
+            adapter = SlowJsonAdapter()
+            adapter.delay = 0.0 if path == self.paths[0] else delay
+            return adapter
+
+        async def first_source():
+            sources = iter_sources_as_completed(self.paths, max_workers=len(self.paths) + 1,
+                                                adapter_factory=factory)
+            source = await sources.__anext__()
+            await sources.aclose()
+            return source
+
+        start = time.perf_counter()
+        source = asyncio.run(first_source())
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(source.index, 0)
+        self.assertLess(elapsed, delay / 2)
+
+    def test_combine_matches_sequential(self):
+        """Тест: комбинирование по мере загрузки совпадает с последовательным"""
+        ds = DempsterShafer({'1', '2', '3', '4'})
+        bpas = [ds.calculate_bpa(JsonAdapter().load(path)['data']) for path in self.paths]
+
+        for rule, expected in (('dempster', ds.dempster_combine_multiple(*bpas)),
+                               ('yager', ds.yager_combine_multiple(*bpas))):
+            combined, sources = asyncio.run(load_and_combine(ds, self.paths, rule, max_workers=4))
+            self.assertEqual(len(sources), len(self.paths))
+            for subset in set(expected) | set(combined):
+                self.assertAlmostEqual(combined.get(subset, 0.0), expected.get(subset, 0.0), places=12)
+
+    def test_invalid_source_raises(self):
+        """Тест: некорректный источник прерывает загрузку с ошибкой"""
+        bad_path = os.path.join(self.temp_dir.name, "bad.json")
+        with open(bad_path, 'w', encoding='utf-8') as f:
+            f.write('{"data": {"{1}": "x"}}')
+
+        with self.assertRaises(ValueError):
+            asyncio.run(load_sources_async(self.paths + [bad_path]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_adapters import CsvAdapter, DictAdapter, JsonAdapter
+from data_adapters.base_adapter import NUMPY_THRESHOLD
+from dempster_core import DempsterShafer
+
+
+class TestNormalizeCounts(unittest.TestCase):
+    """Тесты общей проверки и нормировки данных адаптеров"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.adapter = JsonAdapter()
+
+    def test_normalizes_in_one_pass(self):
+        """Тест: нормировка и объединение ключей, различающихся пробелами"""
+        bpa = self.adapter.normalize_counts({'{1}': 5, ' {1} ': 1, '{2}': 2})
+        self.assertEqual(set(bpa), {'{1}', '{2}'})
+        self.assertAlmostEqual(bpa['{1}'], 0.75)
+        self.assertAlmostEqual(bpa['{2}'], 0.25)
+
+    def test_rejects_invalid_values(self):
+        """Тест: отрицательные значения, NaN, бесконечность, bool и строки отвергаются"""
+        for value in (-1, float('nan'), float('inf'), True, '5', None):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    self.adapter.normalize_counts({'{1}': 1, '{2}': value})
+                self.assertFalse(self.adapter.validate({'frame_of_discernment': ['1', '2'],
+                                                        'data': {'{1}': 1, '{2}': value}}))
+        with self.assertRaises(ValueError):
+            self.adapter.normalize_counts({'{1}': 0, '{2}': 0})
+
+    def test_numpy_path_matches_python_path(self):
+        """Тест: векторный путь для больших входов совпадает с построчным"""
+        rng = random.Random(1)
+        counts = {f"{{{i}}}": rng.randint(0, 100) for i in range(NUMPY_THRESHOLD + 10)}
+        counts['{1} '] = 7
+        large = self.adapter.normalize_counts(counts)
+
+        merged = dict(counts)
+        merged['{1}'] += merged.pop('{1} ')
+        total = sum(merged.values())
+
+        self.assertEqual(len(large), len(merged))
+        for key, value in merged.items():
+            self.assertAlmostEqual(large[key], value / total)
+
+        counts['{5}'] = float('nan')
+        with self.assertRaises(ValueError):
+            self.adapter.normalize_counts(counts)
+
+    def test_all_adapters_share_fast_path(self):
+        """Тест: JSON, CSV и словарный адаптеры дают одинаковую BPA"""
+        data = {'frame_of_discernment': ['1', '2'], 'data': {'{1}': 3, '{1,2}': 1}}
+        expected = JsonAdapter().transform_to_bpa(data)
+        self.assertEqual(CsvAdapter().transform_to_bpa(data), expected)
+        self.assertEqual(DictAdapter().transform_to_bpa(data), expected)
+
+    def test_calculate_bpa_keeps_normalized_data(self):
+        """Тест: уже нормированные данные не делятся повторно"""
+        ds = DempsterShafer({'1', '2'})
+        normalized = self.adapter.normalize_counts({'{1}': 1, '{2}': 2})
+        bpa = ds.calculate_bpa(normalized)
+        self.assertEqual(bpa[frozenset({'1'})], normalized['{1}'])
+        self.assertAlmostEqual(ds.calculate_bpa({'{1}': 1, '{2}': 3})[frozenset({'2'})], 0.75)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import batch_fusion
+
+
+class TestBatchFusion(unittest.TestCase):
+    """Тесты неинтерактивного режима комбинирования"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.test_data_dir = Path(__file__).parent.parent / "data"
+
+    def test_csv_sources_match_example_2_6(self):
+        """Тест: комбинирование CSV источников совпадает с примером 2.6"""
+        sources = batch_fusion.load_sources([
+            str(self.test_data_dir / "example_2_6_source1.csv"),
+            str(self.test_data_dir / "example_2_6_source2.csv"),
+        ])
+        result = batch_fusion.run_fusion(sources, 'dempster', queries=["{1}", "{2,3}"])
+
+        self.assertAlmostEqual(result['combined']['{1}'], 0.4706, places=4)
+        self.assertAlmostEqual(sum(result['combined'].values()), 1.0, places=9)
+        self.assertEqual([q['event'] for q in result['queries']], ["{1}", "{2,3}"])
+        self.assertAlmostEqual(result['queries'][1]['belief'], 0.5294, places=4)
+
+    def test_multi_source_json_and_discount(self):
+        """Тест: JSON с ключом 'sources' раскрывается, дисконтирование переносит массу на Ω"""
+        sources = batch_fusion.load_sources([str(self.test_data_dir / "example_2_6.json")])
+        self.assertEqual(len(sources), 2)
+
+        result = batch_fusion.run_fusion(sources, 'yager', discounts=[0.5])
+        self.assertEqual(result['discounts'], [0.5, 0.5])
+        self.assertGreater(result['combined']['{1,2,3,4}'], 0.25)
+
+    def test_discount_count_mismatch(self):
+        """Тест: число коэффициентов дисконтирования должно совпадать с числом источников"""
+        sources = batch_fusion.load_sources([str(self.test_data_dir / "example_2_6.json")])
+        with self.assertRaises(ValueError):
+            batch_fusion.run_fusion(sources, discounts=[0.1, 0.2, 0.3])
+
+    def test_duplicate_subset_spellings_are_merged(self):
+        """Тест: разные записи одного подмножества в BPA источника складываются"""
+        sources = [
+            {'name': 'a', 'frame_of_discernment': ['1', '2'], 'bpa': {'{1}': 0.5, '{1,2}': 0.25, '{2,1}': 0.25}},
+            {'name': 'b', 'frame_of_discernment': ['1', '2'], 'bpa': {'{1, 2}': 1.0}},
+        ]
+        result = batch_fusion.run_fusion(sources, 'dempster')
+        self.assertAlmostEqual(result['combined']['{1}'], 0.5)
+        self.assertAlmostEqual(result['combined']['{1,2}'], 0.5)
+
+    def test_job_directory(self):
+        """Тест: пакетная обработка директории заданий с ошибочным заданием"""
+        with tempfile.TemporaryDirectory() as jobs_dir, tempfile.TemporaryDirectory() as out_dir:
+            job = {
+                'sources': [
+                    {'name': 'first', 'path': str(self.test_data_dir / "example_2_6_source1.csv")},
+                    {'name': 'second', 'data': {'{1,2}': 8, '{3}': 7, '{4}': 1}},
+                ],
+                'parameters': {'method': 'dempster', 'queries': ['{1}']},
+            }
+            with open(Path(jobs_dir) / "good.json", 'w', encoding='utf-8') as f:
+                json.dump(job, f)
+            with open(Path(jobs_dir) / "bad.json", 'w', encoding='utf-8') as f:
+                f.write('{"sources": [{"data": {"{1}": "x"}}]}')
+            with open(Path(jobs_dir) / "bad_method.json", 'w', encoding='utf-8') as f:
+                json.dump(dict(job, parameters={'method': 'dempstr'}), f)
+
+            summaries = batch_fusion.run_job_directory(jobs_dir, out_dir, workers=2)
+
+            self.assertEqual([s['job'] for s in summaries], ['bad.json', 'bad_method.json', 'good.json'])
+            self.assertEqual(summaries[0]['status'], 'error')
+            self.assertEqual(summaries[1]['status'], 'error')
+            self.assertIn('dempstr', summaries[1]['error'])
+            self.assertEqual(summaries[2]['status'], 'ok')
+            self.assertIn('total_seconds', summaries[2])
+
+            with open(summaries[2]['output'], 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            self.assertEqual(result['sources'], ['first', 'second'])
+            self.assertAlmostEqual(result['queries'][0]['belief'], 0.4706, places=4)
+
+    def test_job_directory_to_ndjson(self):
+        """Тест: результаты пакетной обработки в одном NDJSON файле"""
+        with tempfile.TemporaryDirectory() as jobs_dir, tempfile.TemporaryDirectory() as out_dir:
+            for i in range(3):
+                job = {'sources': [{'data': {'{1}': 5, '{2,3}': 3}}, {'data': {'{1,2}': 8, '{3}': 7}}],
+                       'parameters': {'queries': ['{1}']}}
+                with open(Path(jobs_dir) / f"job{i}.json", 'w', encoding='utf-8') as f:
+                    json.dump(job, f)
+            ndjson_path = str(Path(out_dir) / "results.ndjson")
+
+            exit_code = batch_fusion.main(['batch', jobs_dir, '--ndjson', ndjson_path])
+
+            self.assertEqual(exit_code, 0)
+            with open(ndjson_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), 3)
+            records = [json.loads(line) for line in lines]
+            self.assertEqual(sorted(record['job'] for record in records), ['job0.json', 'job1.json', 'job2.json'])
+            self.assertIn('combined', records[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import sys
+import time
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import combination_rules
+from combination_planner import STRATEGIES, plan_combination
+from dempster_core import DempsterShafer
+from synthetic_workload import WorkloadSpec, generate_workload
+
+
+class TestCombinationPlanner(unittest.TestCase):
+    """Тесты планировщика порядка комбинирования"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        workload = generate_workload(WorkloadSpec(frame_size=8, source_count=6, focal_count=6,
+                                                  conflict=0.2), 5)
+        self.ds = workload.ds()
+        self.bpas = workload.bpas
+        # Размытый источник (много фокальных элементов) и резкий (один элемент и Ω)
+        elements = sorted(self.ds.frame)
+        self.wide = {frozenset(elements[i:i + k]): 1.0 for k in range(1, 5) for i in range(len(elements) - k + 1)}
+        total = sum(self.wide.values())
+        self.wide = {subset: mass / total for subset, mass in self.wide.items()}
+        self.sharp = {frozenset(elements[:1]): 0.7, frozenset(self.ds.frame): 0.3}
+
+    def assertBpaAlmostEqual(self, bpa1, bpa2, places=10):
+        """Сравнение BPA с точностью до нулевых масс"""
+        for subset in set(bpa1) | set(bpa2):
+            self.assertAlmostEqual(bpa1.get(subset, 0.0), bpa2.get(subset, 0.0), places=places)
+
+    def test_strategies_match_sequential(self):
+        """Тест: любой план дает тот же результат, что последовательная свертка"""
+        expected = self.ds.dempster_combine_multiple(*self.bpas)
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                plan = plan_combination(self.ds, self.bpas, strategy=strategy)
+                self.assertEqual(len(plan.steps), len(self.bpas) - 1)
+                self.assertBpaAlmostEqual(plan.execute(self.ds, self.bpas), expected)
+                self.assertBpaAlmostEqual(
+                    self.ds.dempster_combine_multiple(*self.bpas, order=strategy), expected)
+
+    def test_smets(self):
+        """Тест: ненормированное правило Сметса сохраняет массу ∅"""
+        omega = frozenset(self.ds.frame)
+        expected = self.bpas[0]
+        for bpa in self.bpas[1:]:
+            expected = combination_rules.combine(expected, bpa, ('smets',), omega)['smets']
+        plan = plan_combination(self.ds, self.bpas, rule='smets')
+        self.assertBpaAlmostEqual(plan.execute(self.ds, self.bpas), expected)
+
+    def test_greedy_combines_sharp_sources_first(self):
+        """Тест: жадный план откладывает размытый источник и не дороже свертки по порядку"""
+        bpas = [self.wide, self.wide, self.sharp, self.sharp]
+        given = plan_combination(self.ds, bpas, strategy='given')
+        greedy = plan_combination(self.ds, bpas, strategy='greedy')
+        self.assertEqual(greedy.steps[0].left, 2)
+        self.assertEqual(greedy.steps[0].right, 3)
+        self.assertLess(greedy.estimated_cost, given.estimated_cost)
+
+        given.execute(self.ds, bpas)
+        greedy.execute(self.ds, bpas)
+        self.assertLess(greedy.actual_cost, given.actual_cost)
+
+    def test_report_estimates_and_actuals(self):
+        """Тест: точная оценка на малых узлах совпадает с фактическим размером"""
+        plan = plan_combination(self.ds, self.bpas[:3], strategy='given')
+        self.assertIsNone(plan.actual_cost)
+        self.assertIn('-', plan.report())
+        plan.execute(self.ds, self.bpas[:3])
+        for step in plan.steps:
+            self.assertEqual(step.estimated_pairs, step.actual_pairs)
+            self.assertEqual(step.estimated_size, step.actual_size)
+            self.assertIsNotNone(step.seconds)
+        self.assertEqual(plan.actual_cost, plan.estimated_cost)
+        self.assertIn('Итого пар', plan.report())
+
+    def test_sampled_estimate(self):
+        """Тест: оценка по выборке для больших узлов остается в разумных пределах"""
+        ds = DempsterShafer({str(i) for i in range(1, 21)})
+        bpas = [generate_workload(WorkloadSpec(frame_size=20, source_count=1, focal_count=150,
+                                               cardinality='large', conflict=0.0), seed).bpas[0]
+                for seed in range(3)]
+        plan = plan_combination(ds, bpas, strategy='given')
+        plan.execute(ds, bpas)
+        last = plan.steps[-1]
+        self.assertGreater(last.estimated_size, last.actual_size / 4)
+        self.assertLess(last.estimated_size, last.actual_size * 4)
+
+    def test_yager_keeps_given_order(self):
+        """Тест: для правила Ягера доступен только порядок аргументов"""
+        plan = plan_combination(self.ds, self.bpas[:3], rule='yager', strategy='given')
+        self.assertBpaAlmostEqual(plan.execute(self.ds, self.bpas[:3]),
+                                  self.ds.yager_combine_multiple(*self.bpas[:3]))
+        self.assertEqual(plan.steps[0].estimated_size, plan.steps[0].actual_size)
+        with self.assertRaises(ValueError):
+            plan_combination(self.ds, self.bpas, rule='yager', strategy='greedy')
+
+    def test_long_chain_does_not_underflow(self):
+        """Тест: 1200 одинаковых источников - промежуточные BPA не уходят в ноль"""
+        ds = DempsterShafer({'1', '2'})
+        bpas = [{frozenset({'1'}): 0.5, frozenset({'2'}): 0.5}] * 1200
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                result = ds.dempster_combine_multiple(*bpas, order=strategy)
+                self.assertAlmostEqual(result[frozenset({'1'})], 0.5)
+                self.assertAlmostEqual(result[frozenset({'2'})], 0.5)
+        plan = plan_combination(ds, bpas, rule='smets', strategy='left_deep')
+        self.assertAlmostEqual(plan.execute(ds, bpas)[frozenset()], 1.0)
+        self.assertTrue(plan.tree.startswith('(' * 1199))
+
+    def test_greedy_planning_overhead(self):
+        """Тест: жадное планирование 1200 источников не дороже нескольких сверток"""
+        ds = DempsterShafer({'1', '2'})
+        bpas = [{frozenset({'1'}): 0.5, frozenset({'2'}): 0.5}] * 1200
+        start = time.perf_counter()
+        ds.dempster_combine_multiple(*bpas)
+        fold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        plan = plan_combination(ds, bpas, strategy='greedy')
+        planning = time.perf_counter() - start
+        self.assertEqual(len(plan.steps), 1199)
+        # Окно из GREEDY_WINDOW узлов: O(N log N) вместо O(N³) перебора пар
+        self.assertLess(planning, max(30 * fold, 1.0))
+
+    def test_invalid_parameters(self):
+        """Тест: неизвестные правило и стратегия, пустой список источников"""
+        with self.assertRaises(ValueError):
+            plan_combination(self.ds, self.bpas, rule='pcr5')
+        with self.assertRaises(ValueError):
+            plan_combination(self.ds, self.bpas, strategy='random')
+        with self.assertRaises(ValueError):
+            plan_combination(self.ds, [])
+        plan = plan_combination(self.ds, self.bpas)
+        with self.assertRaises(ValueError):
+            plan.execute(self.ds, self.bpas[:2])
+
+
+if __name__ == '__main__':
+    unittest.main()
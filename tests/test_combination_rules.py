@@ -0,0 +1,80 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import combination_rules
+from dempster_core import DempsterShafer
+
+
+class TestCombinationRules(unittest.TestCase):
+    """Тесты ядра правил комбинирования"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.ds = DempsterShafer({'1', '2', '3', '4'})
+        self.bpa1 = self.ds.calculate_bpa({"{1}": 5, "{2,3}": 3})
+        self.bpa2 = self.ds.calculate_bpa({"{1,2}": 8, "{3}": 7, "{4}": 1})
+
+    def assertBpaAlmostEqual(self, bpa1, bpa2, places=12):
+        """Сравнение BPA с точностью до нулевых масс"""
+        for subset in set(bpa1) | set(bpa2):
+            self.assertAlmostEqual(bpa1.get(subset, 0.0), bpa2.get(subset, 0.0), places=places)
+
+    def test_matches_existing_rules(self):
+        """Тест: Демпстер и Ягер из общего прохода совпадают с методами ядра"""
+        results = self.ds.combine(self.bpa1, self.bpa2, rules=['dempster', 'yager'])
+        self.assertBpaAlmostEqual(results['dempster'], self.ds.dempster_combine(self.bpa1, self.bpa2))
+        self.assertBpaAlmostEqual(results['yager'], self.ds.yager_combine(self.bpa1, self.bpa2))
+
+    def test_all_rules_conserve_mass(self):
+        """Тест: все правила сохраняют суммарную массу 1"""
+        results = self.ds.combine(self.bpa1, self.bpa2, rules=list(combination_rules.RULES))
+        for name, bpa in results.items():
+            self.assertAlmostEqual(sum(bpa.values()), 1.0, places=12, msg=name)
+        self.assertAlmostEqual(results['smets'][frozenset()], 0.3359375)
+
+    def test_total_conflict(self):
+        """Тест: распределение полного конфликта разными правилами"""
+        a, b = frozenset({'1'}), frozenset({'2'})
+        results = combination_rules.combine({a: 1.0}, {b: 1.0},
+                                            rules=['smets', 'dubois_prade', 'pcr5', 'yager'])
+        self.assertEqual(results['smets'][frozenset()], 1.0)
+        self.assertEqual(results['dubois_prade'][a | b], 1.0)
+        self.assertEqual(results['pcr5'][a], 0.5)
+        self.assertEqual(results['pcr5'][b], 0.5)
+        self.assertEqual(results['yager'][a | b], 1.0)
+        with self.assertRaises(ValueError):
+            combination_rules.combine({a: 1.0}, {b: 1.0}, rules=['dempster'])
+
+    def test_pcr5_partial_conflict(self):
+        """Тест: PCR5 делит конфликт пропорционально массам"""
+        a, b, ab = frozenset({'1'}), frozenset({'2'}), frozenset({'1', '2'})
+        result = combination_rules.combine({a: 0.6, ab: 0.4}, {b: 0.5, ab: 0.5}, rules=['pcr5'])['pcr5']
+        # Конфликтующая пара (A, B): 0.6·0.5 = 0.3 делится как 0.36·0.5/1.1 и 0.25·0.6/1.1
+        self.assertAlmostEqual(result[a], 0.3 + 0.18 / 1.1)
+        self.assertAlmostEqual(result[b], 0.2 + 0.15 / 1.1)
+        self.assertAlmostEqual(result[ab], 0.2)
+
+    def test_register_rule(self):
+        """Тест: подключение пользовательского правила"""
+        def conflict_only(result, omega):
+            return {frozenset(): result.conflict}
+
+        combination_rules.register_rule('conflict_only', conflict_only)
+        try:
+            results = self.ds.combine(self.bpa1, self.bpa2, rules=['conflict_only'])
+            self.assertAlmostEqual(results['conflict_only'][frozenset()], 0.3359375)
+        finally:
+            del combination_rules.RULES['conflict_only']
+
+    def test_unknown_rule(self):
+        """Тест: неизвестное правило"""
+        with self.assertRaises(ValueError):
+            self.ds.combine(self.bpa1, self.bpa2, rules=['unknown'])
+
+
+if __name__ == '__main__':
+    unittest.main()
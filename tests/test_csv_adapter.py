@@ -70,6 +70,26 @@ class TestCsvAdapter(unittest.TestCase):
         finally:
             os.unlink(temp_path)
     
+    def test_duplicate_subsets_are_merged(self):
+        """Тест объединения разных записей одного подмножества при загрузке"""
+        csv_content = """subset,count
+"{1,2}",3
+"{2,1}",1
+"{1, 2}",2
+"{ 3 }",2"""
+        
+        import tempfile
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write(csv_content)
+            temp_path = f.name
+        
+        try:
+            data = self.adapter.load(temp_path)
+            self.assertEqual(data['data'], {'{1,2}': 6.0, '{3}': 2.0})
+            self.assertEqual(sorted(data['frame_of_discernment']), ['1', '2', '3'])
+        finally:
+            os.unlink(temp_path)
+    
     def test_save_and_load(self):
         """Тест сохранения и загрузки CSV"""
         import tempfile
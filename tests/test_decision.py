@@ -0,0 +1,81 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer
+from decision import DecisionEngine
+
+
+class TestDecisionEngine(unittest.TestCase):
+    """Тесты мер для принятия решений"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.ds = DempsterShafer({'1', '2', '3', '4'})
+        self.engine = DecisionEngine(self.ds)
+        self.bpa = self.ds.calculate_bpa({"{1}": 5, "{1,2}": 2, "{2,3,4}": 3})
+
+    def test_measures_match_belief_plausibility(self):
+        """Тест: Bel/Pl одноэлементных событий совпадают с ядром"""
+        measures = self.engine.singleton_measures(self.bpa)
+        for i, element in enumerate(measures.elements):
+            self.assertAlmostEqual(measures.belief[i], self.ds.belief({element}, self.bpa))
+            self.assertAlmostEqual(measures.plausibility[i], self.ds.plausibility({element}, self.bpa))
+
+    def test_pignistic_probability(self):
+        """Тест: BetP делит массу поровну между элементами фокального множества"""
+        betp = self.engine.pignistic_probability(self.bpa)
+        self.assertAlmostEqual(betp['1'], 0.5 + 0.1)
+        self.assertAlmostEqual(betp['2'], 0.1 + 0.1)
+        self.assertAlmostEqual(betp['4'], 0.1)
+        self.assertAlmostEqual(sum(betp.values()), 1.0)
+
+    def test_pignistic_normalizes_conflict(self):
+        """Тест: масса пустого множества исключается нормировкой"""
+        bpa = {frozenset(): 0.5, frozenset({'1'}): 0.25, frozenset({'2', '3'}): 0.25}
+        betp = self.engine.pignistic_probability(bpa)
+        self.assertAlmostEqual(betp['1'], 0.5)
+        self.assertAlmostEqual(sum(betp.values()), 1.0)
+
+    def test_interval_dominance(self):
+        """Тест: гипотезы с Pl ниже лучшего Bel отбрасываются"""
+        result = self.engine.interval_dominance(self.bpa)
+        # Bel({1}) = 0.5; Pl({3}) = Pl({4}) = 0.3 < 0.5, Pl({2}) = 0.5
+        self.assertEqual([element for element, _, _ in result], ['1', '2'])
+
+    def test_top_k_large_frame(self):
+        """Тест: выбор k лучших гипотез на фрейме из тысяч элементов"""
+        frame = {str(i) for i in range(5000)}
+        ds = DempsterShafer(frame)
+        engine = DecisionEngine(ds)
+        rng = random.Random(7)
+        elements = sorted(frame)
+        bpa = {}
+        for _ in range(300):
+            subset = frozenset(rng.sample(elements, rng.randint(1, 20)))
+            bpa[subset] = bpa.get(subset, 0.0) + rng.random()
+        total = sum(bpa.values())
+        bpa = {subset: mass / total for subset, mass in bpa.items()}
+
+        top = engine.top_k(bpa, 5)
+        ranking = engine.rank(bpa)
+        self.assertEqual(len(top), 5)
+        self.assertEqual([score for _, score in top], [score for _, score in ranking[:5]])
+        self.assertAlmostEqual(sum(score for _, score in ranking), 1.0)
+
+        top_pl = engine.top_k(bpa, 3, criterion='plausibility')
+        best = max(elements, key=lambda e: ds.plausibility({e}, bpa))
+        self.assertAlmostEqual(top_pl[0][1], ds.plausibility({best}, bpa))
+
+    def test_unknown_criterion(self):
+        """Тест: неизвестный критерий ранжирования"""
+        with self.assertRaises(ValueError):
+            self.engine.top_k(self.bpa, 2, criterion='median')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+import pickle
+import random
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import combination_rules
+from dempster_core import DempsterShafer, canonical_subset, parse_subset, sort_elements
+
+
+class TestDempsterShafer(unittest.TestCase):
+    """Тесты ядра DempsterShafer"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.ds = DempsterShafer({'1', '2', '3', '4'})
+        self.bpas = [
+            self.ds.calculate_bpa({"{1}": 5, "{2,3}": 3}),
+            self.ds.calculate_bpa({"{1,2}": 8, "{3}": 7, "{4}": 1}),
+            self.ds.calculate_bpa({"{1,2,3,4}": 2, "{1}": 1, "{3,4}": 2}),
+            self.ds.calculate_bpa({"{2}": 1, "{1,2}": 4}),
+        ]
+        self.alphas = [0.1, 0.0, 0.35, 0.8]
+
+    def assertBpaAlmostEqual(self, bpa1, bpa2, places=12):
+        """Сравнение BPA с точностью до нулевых масс"""
+        for subset in set(bpa1) | set(bpa2):
+            self.assertAlmostEqual(bpa1.get(subset, 0.0), bpa2.get(subset, 0.0), places=places)
+
+    def test_example_2_6(self):
+        """Тест: правило Демпстера на данных примера 2.6"""
+        combined = self.ds.dempster_combine(self.bpas[0], self.bpas[1])
+        self.assertAlmostEqual(combined[frozenset({'1'})], 0.4706, places=4)
+        self.assertAlmostEqual(sum(combined.values()), 1.0, places=12)
+
+    def test_high_conflict_chain_matches_exact(self):
+        """Тест: длинная цепочка с конфликтом ~0.9 совпадает с точным рациональным результатом"""
+        rng = random.Random(4)
+        elements = sorted(self.ds.frame)
+        bpas = []
+        for _ in range(40):
+            weights = [rng.random() ** 4 for _ in elements]
+            total = sum(weights)
+            bpas.append({frozenset({e}): w / total for e, w in zip(elements, weights)})
+        # Для одноэлементных источников m(x) = Π m_k(x) / Σ_y Π m_k(y)
+        products = {e: Fraction(1) for e in elements}
+        for bpa in bpas:
+            for e in elements:
+                products[e] *= Fraction(bpa[frozenset({e})])
+        z = sum(products.values())
+        discounted = self.ds.dempster_combine_discounted(bpas, [0.0] * len(bpas))
+        for combined in (self.ds.dempster_combine_multiple(*bpas), discounted):
+            self.assertAlmostEqual(sum(combined.values()), 1.0, places=14)
+            for e in elements:
+                self.assertAlmostEqual(combined.get(frozenset({e}), 0.0), float(products[e] / z), places=14)
+        omega = frozenset(self.ds.frame)
+        result = bpas[0]
+        for bpa in bpas[1:]:
+            result = combination_rules.combine(result, bpa, ('dempster',), omega)['dempster']
+        for e in elements:
+            self.assertAlmostEqual(result.get(frozenset({e}), 0.0), float(products[e] / z), places=14)
+
+    def test_discount_many_matches_discount(self):
+        """Тест: пакетное дисконтирование совпадает с поэлементным"""
+        batched = self.ds.discount_many(self.bpas, self.alphas)
+        for bpa, alpha, discounted in zip(self.bpas, self.alphas, batched):
+            self.assertBpaAlmostEqual(discounted, self.ds.discount(bpa, alpha))
+
+    def test_combine_discounted_matches_reference(self):
+        """Тест: совмещенное дисконтирование и комбинирование совпадает с эталоном"""
+        expected = self.ds.dempster_combine_multiple(*[
+            self.ds.discount(bpa, alpha) for bpa, alpha in zip(self.bpas, self.alphas)
+        ])
+        fused = self.ds.dempster_combine_discounted(self.bpas, self.alphas)
+        self.assertBpaAlmostEqual(fused, expected)
+
+    def test_combine_discounted_full_reliability(self):
+        """Тест: при нулевых коэффициентах результат совпадает с правилом Демпстера"""
+        fused = self.ds.dempster_combine_discounted(self.bpas[:2], [0.0, 0.0])
+        self.assertBpaAlmostEqual(fused, self.ds.dempster_combine(self.bpas[0], self.bpas[1]))
+
+    def test_invalid_alphas(self):
+        """Тест: проверка числа и диапазона коэффициентов дисконтирования"""
+        with self.assertRaises(ValueError):
+            self.ds.dempster_combine_discounted(self.bpas, [0.1])
+        with self.assertRaises(ValueError):
+            self.ds.discount_many(self.bpas[:1], [1.5])
+
+    def test_total_conflict(self):
+        """Тест: полный конфликт приводит к ошибке"""
+        bpa_a = self.ds.calculate_bpa({"{1}": 1})
+        bpa_b = self.ds.calculate_bpa({"{2}": 1})
+        with self.assertRaises(ValueError):
+            self.ds.dempster_combine_discounted([bpa_a, bpa_b], [0.0, 0.0])
+
+
+    def test_condition_many_matches_combination(self):
+        """Тест: пакетное обусловливание совпадает с комбинированием с категорической BPA"""
+        fused = self.ds.dempster_combine_multiple(*self.bpas[1:3])
+        events = [{'1'}, {'1', '2'}, {'2', '3', '4'}, {'1', '2', '3', '4'}]
+        conditioned = self.ds.condition_many(fused, events)
+        for event, result in zip(events, conditioned):
+            expected = self.ds.dempster_combine(fused, {frozenset(event): 1.0})
+            self.assertBpaAlmostEqual(result, expected)
+        self.assertBpaAlmostEqual(self.ds.condition(fused, {'3'}),
+                                  self.ds.dempster_combine(fused, {frozenset({'3'}): 1.0}))
+
+    def test_conditional_measures(self):
+        """Тест: Bel/Pl после обусловливания без построения условных BPA"""
+        fused = self.ds.dempster_combine_multiple(*self.bpas[1:3])
+        events = [{'1', '2'}, {'3', '4'}, {'2', '3'}]
+        targets = [{'1'}, {'2', '3'}, {'4'}, set()]
+        measures = self.ds.conditional_measures(fused, events, targets)
+        for event, result in zip(events, measures):
+            conditioned = self.ds.condition(fused, event)
+            for target in targets:
+                values = result[frozenset(target)]
+                self.assertAlmostEqual(values['belief'], self.ds.belief(target, conditioned))
+                self.assertAlmostEqual(values['plausibility'], self.ds.plausibility(target, conditioned))
+
+    def test_condition_total_conflict(self):
+        """Тест: обусловливание на событие с Pl = 0"""
+        bpa = {frozenset({'1'}): 1.0}
+        with self.assertRaises(ValueError):
+            self.ds.condition_many(bpa, [{'1'}, {'2'}])
+        with self.assertRaises(ValueError):
+            self.ds.conditional_measures(bpa, [{'2'}], [{'2'}])
+
+    def test_pickle_skips_caches(self):
+        """Тест: сериализуются только фрейм и режим, без 2^n подмножеств"""
+        ds = DempsterShafer({str(i) for i in range(12)}, numeric_mode='float32')
+        self.assertEqual(len(ds.all_subsets), 4096)
+        restored = pickle.loads(pickle.dumps(ds))
+        self.assertLess(len(pickle.dumps(ds)), 500)
+        self.assertEqual(restored.frame, ds.frame)
+        self.assertEqual(restored.numeric_mode, 'float32')
+        self.assertEqual(restored.elements, ds.elements)
+
+    def test_parse_subset_canonical(self):
+        """Тест: разные записи одного подмножества дают один общий frozenset"""
+        subset = parse_subset("{1,2}")
+        self.assertEqual(parse_subset("{1, 2}"), frozenset({'1', '2'}))
+        self.assertIs(parse_subset("{2,1}"), subset)
+        self.assertIs(parse_subset(" { 1 ,2,2} "), subset)
+        self.assertEqual(parse_subset("{}"), frozenset())
+        self.assertEqual(canonical_subset("{ 10, 2,2}"), "{2,10}")
+
+    def test_sort_elements_unicode_digits(self):
+        """Тест: надстрочные и обведенные цифры сортируются как строки, а не числа"""
+        self.assertEqual(sort_elements(['10', '²', 'a', '2', '①']), ['2', '10', 'a', '²', '①'])
+        self.assertEqual(canonical_subset("{①,²,3}"), "{3,²,①}")
+
+    def test_calculate_bpa_merges_duplicates(self):
+        """Тест: массы разных записей одного подмножества складываются"""
+        bpa = self.ds.calculate_bpa({"{1,2}": 2, "{2,1}": 1, "{1, 2}": 1, "{3}": 4})
+        self.assertEqual(len(bpa), 2)
+        self.assertAlmostEqual(bpa[frozenset({'1', '2'})], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import os
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from differential import (
+    ENGINES, bpa_error, check_engines, default_specs, generate_workloads, reference_combine,
+    run_differential
+)
+from synthetic_workload import WorkloadSpec, generate_workload
+
+# Число зерен на набор параметров; run_tests.py --stress увеличивает его
+SEEDS = int(os.environ.get('DS_DIFFERENTIAL_SEEDS', '2'))
+
+
+class TestSyntheticWorkload(unittest.TestCase):
+    """Тесты генератора синтетических нагрузок"""
+
+    def test_seed_reproducible(self):
+        """Тест: одинаковые параметры и зерно дают одинаковую нагрузку"""
+        spec = WorkloadSpec(frame_size=10, source_count=5, focal_count=7, cardinality='geometric')
+        self.assertEqual(generate_workload(spec, 42).bpas, generate_workload(spec, 42).bpas)
+        self.assertNotEqual(generate_workload(spec, 42).bpas, generate_workload(spec, 43).bpas)
+
+    def test_bpas_are_normalized(self):
+        """Тест: BPA нормированы и содержат Ω с заданной массой"""
+        spec = WorkloadSpec(frame_size=8, source_count=4, omega_mass=0.1, cardinality='large')
+        workload = generate_workload(spec, 1)
+        omega = frozenset(workload.frame)
+        for bpa in workload.bpas:
+            self.assertAlmostEqual(sum(bpa.values()), 1.0)
+            self.assertGreaterEqual(bpa[omega], 0.1)
+            self.assertTrue(all(subset <= omega and subset for subset in bpa))
+
+    def test_conflict_level(self):
+        """Тест: уровень конфликта управляет конфликтом между источниками"""
+        def mean_conflict(level):
+            spec = WorkloadSpec(frame_size=8, source_count=2, conflict=level, omega_mass=0.0)
+            total = 0.0
+            for seed in range(30):
+                bpa1, bpa2 = generate_workload(spec, seed).bpas
+                total += sum(m1 * m2 for s1, m1 in bpa1.items() for s2, m2 in bpa2.items() if not s1 & s2)
+            return total / 30
+        self.assertLess(mean_conflict(0.0), mean_conflict(0.5))
+        self.assertLess(mean_conflict(0.5), mean_conflict(0.9))
+
+    def test_invalid_spec(self):
+        """Тест: некорректные параметры нагрузки"""
+        with self.assertRaises(ValueError):
+            WorkloadSpec(cardinality='normal')
+        with self.assertRaises(ValueError):
+            WorkloadSpec(conflict=1.5)
+
+
+class TestDifferential(unittest.TestCase):
+    """Дифференциальная проверка оптимизированных путей против эталона"""
+
+    def test_exact_engines_match_reference(self):
+        """Тест: точные пути совпадают с эталоном на всех наборах параметров"""
+        workloads = generate_workloads(default_specs(), range(SEEDS))
+        exact = [name for name in ENGINES if name != 'monte_carlo']
+        for report in check_engines(workloads, exact):
+            with self.subTest(engine=report.engine):
+                self.assertTrue(report.ok, report.summary())
+
+    def test_monte_carlo_within_tolerance(self):
+        """Тест: приближенный путь в пределах допуска, включая высокий конфликт"""
+        specs = [WorkloadSpec(frame_size=6, source_count=8, cardinality=cardinality, conflict=conflict)
+                 for cardinality in ('singleton', 'uniform') for conflict in (0.0, 0.9)]
+        report = check_engines(generate_workloads(specs, range(SEEDS)), ['monte_carlo'])[0]
+        self.assertTrue(report.ok, report.summary())
+
+    def test_harness_detects_wrong_engine(self):
+        """Тест: расхождение и несогласованный полный конфликт попадают в отчет"""
+        workloads = generate_workloads([WorkloadSpec(conflict=0.5)], range(3))
+
+        def yager(workload):
+            return workload.ds().yager_combine_multiple(*workload.bpas)
+
+        report = run_differential(yager, workloads, 1e-9, bpa_error, 'yager')
+        self.assertEqual(report.cases, 3)
+        self.assertFalse(report.ok)
+
+        total_conflict = WorkloadSpec(frame_size=2, source_count=2, focal_count=1,
+                                      cardinality='singleton', conflict=1.0, omega_mass=0.0)
+        conflicting = [w for w in generate_workloads([total_conflict], range(20))
+                       if _raises(reference_combine, w)]
+        self.assertTrue(conflicting)
+        report = run_differential(yager, conflicting, 1e-9, bpa_error, 'yager')
+        self.assertEqual(len(report.failures), len(conflicting))
+
+
+def _raises(function, *args) -> bool:
+    try:
+        function(*args)
+    except ValueError:
+        return True
+    return False
+
+
+if __name__ == '__main__':
+    unittest.main()
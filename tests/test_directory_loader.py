@@ -0,0 +1,189 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import batch_fusion
+from data_adapters import (CsvAdapter, JsonAdapter, adapter_for_file, format_for_file, load_directory,
+                           register_adapter, registered_formats)
+from data_adapters import registry
+
+
+class TestAdapterRegistry(unittest.TestCase):
+    """Тесты реестра адаптеров"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        """Очистка после каждого теста"""
+        self.temp_dir.cleanup()
+
+    def test_dispatch_by_extension(self):
+        """Тест: выбор адаптера по расширению без чтения файла"""
+        self.assertIsInstance(adapter_for_file('missing/data.JSON'), JsonAdapter)
+        self.assertIsInstance(adapter_for_file('missing/data.csv'), CsvAdapter)
+
+    def test_dispatch_by_content(self):
+        """Тест: распознавание формата по содержимому для неизвестного расширения"""
+        json_path = self.root / 'evidence.txt'
+        json_path.write_text('\ufeff  {"frame_of_discernment": ["1"], "data": {"{1}": 1}}', encoding='utf-8')
+        csv_path = self.root / 'evidence'
+        csv_path.write_text('subset,count\n"{1,2}",3\n', encoding='utf-8')
+        other_path = self.root / 'notes.md'
+        other_path.write_text('# Заметки\n', encoding='utf-8')
+
+        self.assertIsInstance(adapter_for_file(str(json_path)), JsonAdapter)
+        self.assertIsInstance(adapter_for_file(str(csv_path)), CsvAdapter)
+        self.assertIsNone(format_for_file(str(other_path)))
+        with self.assertRaises(ValueError):
+            adapter_for_file(str(other_path))
+
+    def test_register_adapter(self):
+        """Тест: регистрация пользовательского формата"""
+        class TsvAdapter(CsvAdapter):
+            pass
+
+        register_adapter('tsv', TsvAdapter, ('.tsv',))
+        try:
+            self.assertIn('tsv', registered_formats())
+            self.assertIsInstance(adapter_for_file('data.tsv'), TsvAdapter)
+        finally:
+            del registry._FORMATS['tsv']
+        with self.assertRaises(ValueError):
+            register_adapter('bad', TsvAdapter)
+
+
+class TestLoadDirectory(unittest.TestCase):
+    """Тесты параллельной загрузки каталога"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.data_dir = Path(__file__).parent.parent / 'data'
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / 'nested').mkdir()
+        (self.root / '.hidden').mkdir()
+        adapter = JsonAdapter()
+        for i in range(6):
+            adapter.save({'frame_of_discernment': ['1', '2'], 'data': {'{1}': i + 1, '{2}': 1}},
+                         str(self.root / 'nested' / f"source_{i}.json"))
+        adapter.save({'frame_of_discernment': ['1'], 'data': {'{1}': 1}}, str(self.root / '.hidden' / 'x.json'))
+        (self.root / 'broken.json').write_text('{"data": ', encoding='utf-8')
+        (self.root / 'negative.csv').write_text('subset,count\n{1},-1\n', encoding='utf-8')
+        (self.root / 'readme.md').write_text('Описание данных\n', encoding='utf-8')
+        (self.root / 'report.dat').write_text('subset,count\n{1},2\n{2},2\n', encoding='utf-8')
+        (self.root / 'malformed.json').write_text('{"sources": [1]}', encoding='utf-8')
+
+    def tearDown(self):
+        """Очистка после каждого теста"""
+        self.temp_dir.cleanup()
+
+    def test_collects_errors_without_aborting(self):
+        """Тест: ошибки отдельных файлов собираются, остальные файлы загружаются"""
+        loaded = load_directory(str(self.root), max_workers=3).wait()
+        names = [Path(source.filepath).name for source in loaded.sources]
+        self.assertEqual(names, ['source_0.json', 'source_1.json', 'source_2.json', 'source_3.json',
+                                 'source_4.json', 'source_5.json', 'report.dat'])
+        self.assertEqual(sorted(Path(error.filepath).name for error in loaded.errors),
+                         ['broken.json', 'malformed.json', 'negative.csv'])
+        self.assertEqual([Path(path).name for path in loaded.skipped], ['readme.md'])
+        self.assertAlmostEqual(loaded.sources[0].bpa['{1}'], 0.5)
+
+    def test_non_recursive(self):
+        """Тест: без рекурсии вложенные каталоги не обходятся"""
+        loaded = load_directory(str(self.root), recursive=False).wait()
+        self.assertEqual([source.name for source in loaded.sources], ['report'])
+
+    def test_expands_multi_source_files(self):
+        """Тест: файлы с 'sources' дают по источнику на элемент"""
+        loaded = load_directory(str(self.data_dir), pattern='library_selection.json').wait()
+        self.assertEqual(len(loaded.sources), 5)
+        self.assertEqual(loaded.sources[0].name, 'Эксперты по оптимизации')
+        self.assertEqual(loaded.errors, [])
+
+    def test_streams_in_parallel_with_bounded_pool(self):
+        """Тест: источники выдаются по мере готовности, потоков не больше max_workers"""
+        active, peak = [0], [0]
+        lock = threading.Lock()
+        original = JsonAdapter.load
+
+        def slow_load(adapter, filepath):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.1)
+            with lock:
+                active[0] -= 1
+            return original(adapter, filepath)
+
+        JsonAdapter.load = slow_load
+        try:
+            start = time.perf_counter()
+            stream = iter(load_directory(str(self.root / 'nested'), max_workers=3))
+            first = next(stream)
+            first_time = time.perf_counter() - start
+            remaining = list(stream)
+            total_time = time.perf_counter() - start
+        finally:
+            JsonAdapter.load = original
+
+        self.assertEqual(len(remaining) + 1, 6)
+        self.assertTrue(first.filepath.endswith('.json'))
+        self.assertLess(first_time, total_time)
+        self.assertLessEqual(peak[0], 3)
+        # 6 файлов по 0.1 с в 3 потока - около 0.2 с вместо 0.6 с
+        self.assertLess(total_time, 0.5)
+
+    def test_early_close_and_repeated_iteration(self):
+        """Тест: досрочное закрытие не ждет чтений, вторая итерация во время первой запрещена"""
+        original = JsonAdapter.load
+
+        def slow_load(adapter, filepath):
+            time.sleep(0.3)
+            return original(adapter, filepath)
+
+        JsonAdapter.load = slow_load
+        try:
+            loaded = load_directory(str(self.root / 'nested'), max_workers=1)
+            stream = iter(loaded)
+            next(stream)
+            with self.assertRaises(ValueError):
+                next(iter(loaded))
+            start = time.perf_counter()
+            stream.close()
+            close_time = time.perf_counter() - start
+        finally:
+            JsonAdapter.load = original
+
+        self.assertLess(close_time, 0.2)
+        # После досрочного закрытия каталог загружается заново и целиком
+        self.assertEqual(len(list(loaded)), 6)
+        self.assertEqual(len(list(loaded)), 6)
+
+    def test_batch_fusion_accepts_directories(self):
+        """Тест: load_sources загружает каталог целиком и сообщает об ошибках файлов"""
+        sources = batch_fusion.load_sources([str(self.root / 'nested')])
+        self.assertEqual([source['name'] for source in sources], [f"source_{i}" for i in range(6)])
+        with self.assertRaises(ValueError) as context:
+            batch_fusion.load_sources([str(self.root)])
+        self.assertIn('broken.json', str(context.exception))
+
+    def test_invalid_parameters(self):
+        """Тест: несуществующий каталог и некорректный размер пула"""
+        with self.assertRaises(ValueError):
+            load_directory(os.path.join(self.temp_dir.name, 'missing'))
+        with self.assertRaises(ValueError):
+            load_directory(self.temp_dir.name, max_workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer
+from focal_index import INDEX_THRESHOLD, FocalIndex
+
+
+def sparse_bpa(rng: random.Random, elements, focal_count: int, max_size: int):
+    """Разреженная BPA: focal_count случайных небольших подмножеств большого фрейма"""
+    weights = {}
+    for _ in range(focal_count):
+        subset = frozenset(rng.sample(elements, rng.randint(1, max_size)))
+        weights[subset] = weights.get(subset, 0.0) + rng.random()
+    total = sum(weights.values())
+    return {subset: weight / total for subset, weight in weights.items()}
+
+
+class TestFocalIndex(unittest.TestCase):
+    """Тесты индекса фокальных элементов"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.rng = random.Random(7)
+        self.ds = DempsterShafer({str(i) for i in range(200)})
+        self.bpa = sparse_bpa(self.rng, self.ds.elements, 3000, 6)
+        self.index = self.ds.index(self.bpa)
+
+    def random_event(self):
+        return set(self.rng.sample(self.ds.elements, self.rng.randint(0, 150)))
+
+    def test_queries_match_linear_scan(self):
+        """Тест: Bel/Pl индекса совпадают с прямым просмотром"""
+        self.assertEqual(len(self.index), len(self.bpa))
+        for _ in range(100):
+            event = self.random_event()
+            self.assertAlmostEqual(self.ds.belief(event, self.index), self.ds.belief(event, self.bpa))
+            self.assertAlmostEqual(self.ds.plausibility(event, self.index),
+                                   self.ds.plausibility(event, self.bpa))
+
+    def test_enumeration(self):
+        """Тест: перечисление подмножеств и пересекающихся фокальных элементов"""
+        for _ in range(20):
+            event = frozenset(self.random_event())
+            subsets = dict(self.index.subsets_of(event))
+            intersecting = dict(self.index.intersecting(event))
+            self.assertEqual(set(subsets), {s for s in self.bpa if s <= event})
+            self.assertEqual(set(intersecting), {s for s in self.bpa if s & event})
+            for subset, mass in intersecting.items():
+                self.assertAlmostEqual(mass, self.bpa[subset])
+
+    def test_empty_set_and_outside_elements(self):
+        """Тест: ∅ входит в Bel, но не в Pl; элементы вне фрейма игнорируются"""
+        bpa = {frozenset(): 0.2, frozenset({'a'}): 0.3, frozenset({'a', 'b'}): 0.5}
+        index = FocalIndex(bpa)
+        self.assertAlmostEqual(index.belief({'a', 'z'}), 0.5)
+        self.assertAlmostEqual(index.plausibility({'b', 'z'}), 0.5)
+        self.assertAlmostEqual(index.belief(set()), 0.2)
+        self.assertEqual(dict(index.subsets_of(set())), {frozenset(): 0.2})
+        with self.assertRaises(ValueError):
+            FocalIndex(bpa, {'a'})
+
+    def test_frozen_bpa_uses_index(self):
+        """Тест: FrozenBPA большого фрейма отвечает через индекс"""
+        self.assertGreaterEqual(len(self.bpa), INDEX_THRESHOLD)
+        frozen = self.ds.freeze(self.bpa)
+        event = self.random_event()
+        self.assertAlmostEqual(frozen.belief(event), self.ds.belief(event, self.bpa))
+        self.assertAlmostEqual(frozen.plausibility(event), self.ds.plausibility(event, self.bpa))
+        self.assertIn('focal_index', vars(frozen))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer
+from frame_refinement import FrameRefinement
+
+FRAME = {'1', '2', '3', '4', '5', '6', '7', '8'}
+GROUPS = {'evo': {'1', '2', '7'}, 'hpo': {'3'}, 'multi': {'4', '6'}, 'swarm': {'5'}, 'other': {'8'}}
+
+
+class TestFrameRefinement(unittest.TestCase):
+    """Тесты огрубления и уточнения фрейма"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.refinement = FrameRefinement(FRAME, GROUPS)
+        self.ds = DempsterShafer(FRAME)
+        self.bpa = self.ds.calculate_bpa({"{1}": 5, "{1,2}": 2, "{3}": 3, "{4,5,6}": 2})
+
+    def test_reductions(self):
+        """Тест: внешняя и внутренняя редукции подмножества"""
+        subset = {'1', '2', '4', '6'}
+        self.assertEqual(self.refinement.outer_reduction(subset), frozenset({'evo', 'multi'}))
+        self.assertEqual(self.refinement.inner_reduction(subset), frozenset({'multi'}))
+        self.assertFalse(self.refinement.is_expressible(subset))
+        self.assertTrue(self.refinement.is_expressible({'1', '2', '7', '3'}))
+
+    def test_outer_coarsening_preserves_belief_plausibility(self):
+        """Тест: внешняя редукция сохраняет Bel/Pl событий-объединений групп"""
+        coarse = self.refinement.coarsen(self.bpa)
+        self.assertAlmostEqual(sum(coarse.values()), 1.0)
+        for event in ({'1', '2', '7'}, {'3', '5'}, {'4', '5', '6'}, {'1', '2', '3', '7', '8'}):
+            with self.subTest(event=sorted(event)):
+                self.assertAlmostEqual(self.refinement.belief(event, coarse), self.ds.belief(event, self.bpa))
+                self.assertAlmostEqual(self.refinement.plausibility(event, coarse),
+                                       self.ds.plausibility(event, self.bpa))
+
+    def test_combination_exact_for_compatible_sources(self):
+        """Тест: для источников, заданных на группах, комбинирование на грубом фрейме точное"""
+        rng = random.Random(4)
+        labels = sorted(GROUPS)
+        bpas = []
+        for _ in range(4):
+            counts = {}
+            for _ in range(3):
+                subset = self.refinement.refine_subset(rng.sample(labels, rng.randint(1, 3)))
+                counts[subset] = counts.get(subset, 0) + rng.randint(1, 5)
+            total = sum(counts.values())
+            bpas.append({subset: count / total for subset, count in counts.items()})
+        self.assertTrue(all(self.refinement.is_compatible(bpa) for bpa in bpas))
+
+        coarse = self.refinement.combine(bpas)
+        refined = self.refinement.refine(coarse)
+        exact = self.ds.dempster_combine_multiple(*bpas)
+        for subset in set(refined) | set(exact):
+            self.assertAlmostEqual(refined.get(subset, 0.0), exact.get(subset, 0.0))
+
+    def test_inner_coarsening_moves_mass_to_empty_set(self):
+        """Тест: масса фокальных элементов без целых групп уходит на пустое множество"""
+        coarse = self.refinement.coarsen(self.bpa, reduction='inner')
+        # {1} и {1,2} не содержат группу evo целиком
+        self.assertAlmostEqual(coarse[frozenset()], 7 / 12)
+        self.assertAlmostEqual(coarse[frozenset({'hpo'})], 3 / 12)
+
+    def test_from_mapping(self):
+        """Тест: построение групп по отображению элемент -> метка"""
+        mapping = {'1': 'evo', '2': 'evo', '3': 'hpo'}
+        refinement = FrameRefinement.from_mapping(mapping, {'1', '2', '3', '4'})
+        self.assertEqual(refinement.coarse.frame, {'evo', 'hpo', '4'})
+        self.assertEqual(refinement.refine_subset({'evo', '4'}), frozenset({'1', '2', '4'}))
+
+    def test_invalid_partition(self):
+        """Тест: группы должны образовывать разбиение фрейма"""
+        with self.assertRaises(ValueError):
+            FrameRefinement({'1', '2', '3'}, {'a': {'1', '2'}, 'b': {'2', '3'}})
+        with self.assertRaises(ValueError):
+            FrameRefinement({'1', '2', '3'}, {'a': {'1'}})
+        with self.assertRaises(ValueError):
+            self.refinement.coarse_event({'1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+import itertools
+import pickle
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer
+import frozen_bpa
+from focal_index import FocalIndex
+from frozen_bpa import FrozenBPA
+from synthetic_workload import WorkloadSpec, generate_workload
+
+
+def all_events(frame):
+    elements = sorted(frame)
+    for r in range(len(elements) + 1):
+        yield from (set(combo) for combo in itertools.combinations(elements, r))
+
+
+class TestFrozenBPA(unittest.TestCase):
+    """Тесты неизменяемой BPA с кешем производных функций"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.ds = DempsterShafer({'1', '2', '3', '4'})
+        self.bpa = self.ds.calculate_bpa({"{1}": 5, "{1,2}": 2, "{2,3,4}": 3})
+        self.frozen = self.ds.freeze(self.bpa)
+
+    def test_queries_match_core(self):
+        """Тест: Bel/Pl совпадают с прямым просмотром словаря на всех событиях"""
+        for event in all_events(self.ds.frame):
+            self.assertAlmostEqual(self.frozen.belief(event), self.ds.belief(event, self.bpa))
+            self.assertAlmostEqual(self.frozen.plausibility(event), self.ds.plausibility(event, self.bpa))
+            self.assertAlmostEqual(self.ds.belief(event, self.frozen), self.ds.belief(event, self.bpa))
+
+    def test_large_frame_uses_focal_index(self):
+        """Тест: для фреймов больше MAX_TABLE_FRAME ответы берутся из индекса и кеша"""
+        spec = WorkloadSpec(frame_size=frozen_bpa.MAX_TABLE_FRAME + 8, source_count=1, focal_count=30)
+        workload = generate_workload(spec, 5)
+        ds = workload.ds()
+        bpa = workload.bpas[0]
+        frozen = ds.freeze(bpa)
+        self.assertIsNone(frozen.belief_table)
+        rng = random.Random(0)
+        for _ in range(200):
+            event = set(rng.sample(ds.elements, rng.randint(0, len(ds.elements))))
+            self.assertAlmostEqual(frozen.belief(event), ds.belief(event, bpa))
+            self.assertAlmostEqual(frozen.plausibility(event), ds.plausibility(event, bpa))
+        self.assertTrue(frozen._queries)
+        self.assertIn('focal_index', vars(frozen))
+
+    def test_focal_masks_and_focal_index(self):
+        """Тест: focal_masks - маски по мощности, focal_index - индекс FocalIndex"""
+        cardinalities, masks, masses = self.frozen.focal_masks
+        self.assertEqual(cardinalities, sorted(cardinalities))
+        self.assertEqual(masks, [self.frozen.mask(subset) for subset in sorted(self.bpa, key=len) if self.bpa[subset]])
+        self.assertAlmostEqual(sum(masses), 1.0)
+        self.assertIsInstance(self.frozen.focal_index, FocalIndex)
+        self.assertAlmostEqual(self.ds.belief({'1', '2'}, self.frozen.focal_index), self.frozen.belief({'1', '2'}))
+
+    def test_commonality_and_pignistic(self):
+        """Тест: функция общности и BetP"""
+        self.assertAlmostEqual(self.frozen.commonality({'2'}), 0.5)
+        self.assertAlmostEqual(self.frozen.commonality(set()), 1.0)
+        self.assertAlmostEqual(self.frozen.pignistic['1'], 0.6)
+        with self.assertRaises(TypeError):
+            self.frozen.pignistic['1'] = 1.0
+
+    def test_immutable(self):
+        """Тест: изменение невозможно, операции возвращают новый объект"""
+        with self.assertRaises(TypeError):
+            self.frozen[frozenset({'1'})] = 1.0
+        with self.assertRaises(AttributeError):
+            self.frozen.frame = frozenset()
+        with self.assertRaises(ValueError):
+            self.frozen.belief_table[0] = 1.0
+
+        discounted = self.frozen.discount(0.2)
+        self.assertIsInstance(discounted, FrozenBPA)
+        self.assertAlmostEqual(discounted[frozenset(self.ds.frame)], 0.2)
+        self.assertAlmostEqual(self.frozen[frozenset({'1'})], 0.5)
+
+    def test_hash_and_equality(self):
+        """Тест: хеш содержимого не зависит от порядка и совпадает для равных BPA"""
+        reordered = FrozenBPA(dict(reversed(list(self.bpa.items()))), self.ds.frame)
+        self.assertEqual(reordered, self.frozen)
+        self.assertEqual(hash(reordered), hash(self.frozen))
+        self.assertEqual(reordered.content_hash, self.frozen.content_hash)
+        self.assertNotEqual(self.frozen.discount(0.1).content_hash, self.frozen.content_hash)
+        self.assertEqual(len({self.frozen, reordered}), 1)
+
+    def test_hash_with_numpy_masses(self):
+        """Тест: массы np.float64 дают тот же хеш, что и массы float"""
+        numpy_masses = FrozenBPA({subset: np.float64(mass) for subset, mass in self.bpa.items()}, self.ds.frame)
+        self.assertEqual(numpy_masses, self.frozen)
+        self.assertEqual(numpy_masses.content_hash, self.frozen.content_hash)
+        self.assertEqual(hash(numpy_masses), hash(self.frozen))
+
+    def test_normalization(self):
+        """Тест: признак нормированности и нормировка по Демпстеру"""
+        self.assertTrue(self.frozen.is_normalized)
+        self.assertIs(self.frozen.normalized(), self.frozen)
+        raw = FrozenBPA({frozenset(): 0.5, frozenset({'1'}): 0.25, frozenset({'2'}): 0.25})
+        self.assertFalse(raw.is_normalized)
+        self.assertAlmostEqual(raw.conflict, 0.5)
+        normalized = raw.normalized()
+        self.assertEqual(normalized.to_dict(), {frozenset({'1'}): 0.5, frozenset({'2'}): 0.5})
+        with self.assertRaises(ValueError):
+            FrozenBPA({frozenset(): 1.0}).normalized()
+
+    def test_combine_matches_core(self):
+        """Тест: комбинирование совпадает с ядром"""
+        other = self.ds.calculate_bpa({"{2}": 1, "{1,2,3,4}": 1})
+        combined = self.frozen.combine(other)
+        expected = self.ds.dempster_combine(self.bpa, other)
+        for subset, mass in expected.items():
+            self.assertAlmostEqual(combined.get(subset, 0.0), mass)
+        yager = self.frozen.combine(other, rule='yager')
+        self.assertAlmostEqual(yager.total, 1.0)
+
+    def test_frame_validation(self):
+        """Тест: фокальные элементы должны лежать во фрейме"""
+        with self.assertRaises(ValueError):
+            FrozenBPA({frozenset({'5'}): 1.0}, {'1', '2'})
+
+    def test_pickle(self):
+        """Тест: сериализация сохраняет содержимое, но не кеши"""
+        self.frozen.belief({'1'})
+        restored = pickle.loads(pickle.dumps(self.frozen))
+        self.assertEqual(restored, self.frozen)
+        self.assertEqual(restored.frame, self.frozen.frame)
+        self.assertNotIn('belief_table', vars(restored))
+        self.assertAlmostEqual(restored.belief({'1', '2'}), 0.7)
+
+    def test_pickle_out_of_band(self):
+        """Тест: протокол 5 передает маски и массы внеполосными буферами"""
+        buffers = []
+        data = pickle.dumps(self.frozen, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 2)
+        self.assertEqual(pickle.loads(data, buffers=buffers), self.frozen)
+
+    def test_pickle_large_frame(self):
+        """Тест: фреймы больше 64 элементов сериализуются масками int"""
+        frame = {str(i) for i in range(100)}
+        frozen = FrozenBPA({frozenset({'0', '99'}): 0.4, frozenset({'50'}): 0.1, frozenset(frame): 0.5}, frame)
+        restored = pickle.loads(pickle.dumps(frozen, protocol=5))
+        self.assertEqual(restored.to_dict(), frozen.to_dict())
+        self.assertEqual(restored.frame, frozen.frame)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer, parse_subset
+from fusion_graph import FusionGraph, run_pipelines
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+class TestFusionGraph(unittest.TestCase):
+    """Тесты декларативного графа комбинирования"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        with open(DATA_DIR / 'library_pipeline.json', 'r', encoding='utf-8') as f:
+            self.spec = json.load(f)
+        self.ds = DempsterShafer(set(self.spec['frame_of_discernment']))
+        self.sources = {
+            source['name']: self.ds.calculate_bpa(source['data']) for source in self.spec['sources']
+        }
+
+    def assertBpaAlmostEqual(self, bpa1, bpa2, places=10):
+        """Сравнение BPA с точностью до нулевых масс"""
+        for subset in set(bpa1) | set(bpa2):
+            self.assertAlmostEqual(bpa1.get(subset, 0.0), bpa2.get(subset, 0.0), places=places)
+
+    def expected(self, sources):
+        """Тот же конвейер, записанный вручную"""
+        ds = self.ds
+        opinions = ds.dempster_combine(sources['Эксперты по оптимизации'], sources['Исследователи'])
+        metrics = ds.yager_combine(ds.discount(sources['Оценки скорости'], 0.2),
+                                   ds.discount(sources['Оценки точности'], 0.2))
+        total = ds.dempster_combine(opinions, metrics)
+        return {'Мнения': opinions, 'Итог': total, 'Итог|{1,2,3}': ds.condition(total, {'1', '2', '3'})}
+
+    def test_matches_manual_pipeline(self):
+        """Тест: результаты узлов совпадают с ручной цепочкой вызовов"""
+        graph = FusionGraph()
+        outputs = graph.load(str(DATA_DIR / 'library_pipeline.json'))
+        results = graph.evaluate(outputs)
+        for name, bpa in self.expected(self.sources).items():
+            with self.subTest(node=name):
+                self.assertBpaAlmostEqual(results[name], bpa)
+
+    def test_library_selection_format(self):
+        """Тест: файл без узлов комбинирует все источники правилами из parameters.methods"""
+        graph = FusionGraph()
+        outputs = graph.load(str(DATA_DIR / 'library_selection.json'))
+        self.assertEqual(set(outputs), {'dempster', 'yager'})
+        with open(DATA_DIR / 'library_selection.json', 'r', encoding='utf-8') as f:
+            bpas = [self.ds.calculate_bpa(source['data']) for source in json.load(f)['sources']]
+        results = graph.evaluate(outputs)
+        self.assertBpaAlmostEqual(results['dempster'], self.ds.dempster_combine_multiple(*bpas))
+        self.assertBpaAlmostEqual(results['yager'], self.ds.yager_combine_multiple(*bpas))
+
+    def test_shared_subgraphs_and_memoization(self):
+        """Тест: общий подграф двух конвейеров вычисляется один раз"""
+        graph = FusionGraph()
+        first = graph.add_spec(self.spec)
+        # Второй конвейер: те же мнения с другим порядком входов и другими именами
+        second_spec = {
+            'frame_of_discernment': self.spec['frame_of_discernment'],
+            'sources': self.spec['sources'][:2],
+            'nodes': [{'name': 'ИЭ', 'op': 'combine', 'rule': 'dempster',
+                       'inputs': ['Исследователи', 'Эксперты по оптимизации']}],
+        }
+        second = graph.add_spec(second_spec)
+        self.assertEqual(second['ИЭ'], first['Мнения'])
+
+        graph.evaluate(first)
+        computed = graph.computed
+        self.assertEqual(computed, 6)
+        graph.evaluate(second)
+        graph.evaluate(first)
+        self.assertEqual(graph.computed, computed)
+
+    def test_update_source_recomputes_downstream(self):
+        """Тест: изменение источника пересчитывает только зависящие узлы"""
+        graph = FusionGraph()
+        outputs = graph.add_spec(self.spec)
+        graph.evaluate(outputs)
+
+        changed = dict(self.sources)
+        changed['Оценки скорости'] = self.ds.calculate_bpa({'{5}': 1, '{1,2}': 9})
+        # Скорость', Метрики, Итог, Итог|{1,2,3}; Мнения и Точность' остаются в кеше
+        self.assertEqual(graph.update_source('Оценки скорости', changed['Оценки скорости']), 4)
+        computed = graph.computed
+        results = graph.evaluate(outputs)
+        self.assertEqual(graph.computed - computed, 4)
+        for name, bpa in self.expected(changed).items():
+            self.assertBpaAlmostEqual(results[name], bpa)
+        with self.assertRaises(ValueError):
+            graph.update_source('Нет такого', {})
+
+    def test_parallel_branches(self):
+        """Тест: вычисление в пуле процессов дает тот же результат"""
+        graph = FusionGraph(workers=2)
+        outputs = graph.add_spec(self.spec)
+        results = graph.evaluate(outputs)
+        for name, bpa in self.expected(self.sources).items():
+            self.assertBpaAlmostEqual(results[name], bpa)
+
+    def test_source_bpas_are_validated(self):
+        """Тест: записи одного подмножества объединяются, массы нормируются"""
+        graph = FusionGraph()
+        graph.add_spec({'frame_of_discernment': ['1', '2'], 'sources': [], 'nodes': []})
+        source = graph.add_source('a', {'{1}': 2, '{1,2}': 1, '{2,1}': 1})
+        same = graph.add_source('a', {frozenset({'1'}): 0.5, frozenset({'1', '2'}): 0.5})
+        self.assertEqual(source, same)
+        self.assertEqual(graph.evaluate({'a': source})['a'],
+                         {frozenset({'1'}): 0.5, frozenset({'1', '2'}): 0.5})
+
+    def test_run_pipelines_with_source_paths(self):
+        """Тест: источники по путям и выполнение нескольких конвейеров"""
+        with tempfile.TemporaryDirectory() as directory:
+            spec = {
+                'frame_of_discernment': ['1', '2', '3', '4', '5'],
+                'sources': [{'name': 'a', 'path': str(DATA_DIR / 'example_2_1.json')},
+                            {'name': 'b', 'data': {'{1}': 1, '{2,3}': 1}}],
+                'nodes': [{'name': 'ab', 'op': 'combine', 'rule': 'smets', 'inputs': ['a', 'b']}],
+                'outputs': ['ab'],
+            }
+            path = Path(directory) / 'pipeline.json'
+            path.write_text(json.dumps(spec), encoding='utf-8')
+            results = run_pipelines([str(path)])
+        self.assertAlmostEqual(sum(results['pipeline.json']['ab'].values()), 1.0)
+        self.assertIn(parse_subset('{1}'), results['pipeline.json']['ab'])
+
+    def test_invalid_specs(self):
+        """Тест: ошибки спецификации"""
+        frame = self.spec['frame_of_discernment']
+        sources = self.spec['sources'][:1]
+        name = sources[0]['name']
+        invalid_nodes = [
+            {'name': 'x', 'op': 'average', 'input': name},
+            {'name': 'x', 'op': 'discount', 'input': name, 'alpha': 1.5},
+            {'name': 'x', 'op': 'combine', 'rule': 'unknown', 'inputs': [name]},
+            {'name': 'x', 'op': 'combine', 'inputs': [name, 'Нет такого']},
+            {'name': 'x', 'op': 'condition', 'input': name, 'event': '{9}'},
+            {'name': name, 'op': 'discount', 'input': name, 'alpha': 0.1},
+        ]
+        for node in invalid_nodes:
+            with self.subTest(node=node), self.assertRaises(ValueError):
+                FusionGraph().add_spec({'frame_of_discernment': frame, 'sources': sources, 'nodes': [node]})
+
+        graph = FusionGraph()
+        graph.add_spec({'frame_of_discernment': frame, 'sources': sources, 'nodes': []})
+        for bpa in ({'{1}': -0.5, '{2}': 1.5}, {'{1}': 'x'}, {}):
+            with self.subTest(bpa=bpa), self.assertRaises(ValueError):
+                graph.add_source('Новый', bpa)
+            with self.subTest(bpa=bpa), self.assertRaises(ValueError):
+                graph.update_source(name, bpa)
+        with self.assertRaises(ValueError):
+            graph.add_spec({'frame_of_discernment': ['1', '2'], 'sources': [], 'nodes': []})
+        with self.assertRaises(ValueError):
+            graph.add_spec({'sources': [{'name': name, 'data': {'{1}': 1}}], 'nodes': []})
+        with self.assertRaises(ValueError):
+            FusionGraph().add_spec({'sources': sources, 'nodes': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fusion_service import FusionService, execute_batch
+
+
+async def http_request(address, method, path, payload=None):
+    """Минимальный HTTP клиент для тестов"""
+    reader, writer = await asyncio.open_connection(*address)
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, json.loads(body.decode('utf-8'))
+
+
+EXAMPLE_2_6 = [
+    {"{1}": 0.625, "{2,3}": 0.375},
+    {"{1,2}": 0.5, "{3}": 0.4375, "{4}": 0.0625},
+]
+
+
+class TestFusionService(unittest.IsolatedAsyncioTestCase):
+    """Тесты локального сервиса комбинирования"""
+
+    async def test_combine_discount_query(self):
+        """Тест: операции сервиса в пуле процессов"""
+        async with FusionService(workers=1) as service:
+            status, result = await http_request(service.address, 'POST', '/combine',
+                                                {'bpas': EXAMPLE_2_6, 'queries': ['{1}']})
+            self.assertEqual(status, 200)
+            self.assertAlmostEqual(result['queries'][0]['belief'], 0.4706, places=4)
+
+            status, result = await http_request(service.address, 'POST', '/discount',
+                                                {'bpa': EXAMPLE_2_6[0], 'alpha': 0.2,
+                                                 'frame_of_discernment': ['1', '2', '3', '4']})
+            self.assertEqual(status, 200)
+            self.assertAlmostEqual(result['bpa']['{1,2,3,4}'], 0.2)
+
+            status, result = await http_request(service.address, 'POST', '/query',
+                                                {'bpa': EXAMPLE_2_6[1], 'events': ['{1,2}']})
+            self.assertEqual(status, 200)
+            self.assertAlmostEqual(result['queries'][0]['plausibility'], 0.5)
+
+    async def test_errors(self):
+        """Тест: некорректные запросы не роняют сервис"""
+        async with FusionService(executor=ThreadPoolExecutor(1)) as service:
+            status, _ = await http_request(service.address, 'POST', '/combine', {'bpas': []})
+            self.assertEqual(status, 400)
+            status, _ = await http_request(service.address, 'GET', '/unknown')
+            self.assertEqual(status, 404)
+            status, _ = await http_request(service.address, 'GET', '/combine')
+            self.assertEqual(status, 405)
+            status, stats = await http_request(service.address, 'GET', '/stats')
+            self.assertEqual(status, 200)
+            self.assertEqual(stats['requests_failed'], 1)
+
+    async def test_concurrent_requests_are_batched(self):
+        """Тест: одновременные запросы объединяются в пакеты"""
+        async with FusionService(executor=ThreadPoolExecutor(1), workers=1,
+                                 batch_window=0.05) as service:
+            responses = await asyncio.gather(*[
+                http_request(service.address, 'POST', '/combine', {'bpas': EXAMPLE_2_6})
+                for _ in range(20)
+            ])
+            self.assertTrue(all(status == 200 for status, _ in responses))
+
+            _, stats = await http_request(service.address, 'GET', '/stats')
+            self.assertEqual(stats['requests_total'], 20)
+            self.assertLess(stats['batches_total'], 20)
+            self.assertGreater(stats['max_batch_size'], 1)
+            self.assertGreater(stats['latency_max_seconds'], 0.0)
+
+    async def test_backpressure(self):
+        """Тест: сверх предела запросов в обработке сервис отвечает 503"""
+        async with FusionService(executor=ThreadPoolExecutor(1), workers=1,
+                                 batch_window=0.2, max_pending=2) as service:
+            responses = await asyncio.gather(*[
+                http_request(service.address, 'POST', '/combine', {'bpas': EXAMPLE_2_6})
+                for _ in range(6)
+            ])
+            statuses = sorted(status for status, _ in responses)
+            self.assertIn(200, statuses)
+            self.assertIn(503, statuses)
+
+            _, stats = await http_request(service.address, 'GET', '/stats')
+            self.assertEqual(stats['requests_rejected'], statuses.count(503))
+
+    async def test_invalid_bpas_and_headers(self):
+        """Тест: некорректные массы и заголовок Content-Length дают 400"""
+        async with FusionService(executor=ThreadPoolExecutor(1)) as service:
+            status, result = await http_request(service.address, 'POST', '/combine',
+                                                {'bpas': [{'{1,2}': 0.3, '{2,1}': 0.7}, {'{1}': 1}]})
+            self.assertEqual(status, 200)
+            self.assertAlmostEqual(result['combined']['{1}'], 1.0)
+
+            # Массы нормируются к 1, в том числе по правилу Ягера
+            status, result = await http_request(service.address, 'POST', '/combine',
+                                                {'bpas': [{'1': 3, '2': 5}], 'rule': 'yager'})
+            self.assertEqual(status, 200)
+            self.assertAlmostEqual(sum(result['combined'].values()), 1.0)
+            self.assertAlmostEqual(result['combined']['{2}'], 0.625)
+
+            for bpas in ([{'{1}': -0.5, '{2}': 1.5}], [{'{1}': 'x'}], [{}], [[0.5]]):
+                with self.subTest(bpas=bpas):
+                    status, _ = await http_request(service.address, 'POST', '/combine', {'bpas': bpas})
+                    self.assertEqual(status, 400)
+
+            for length in ('abc', '-5'):
+                with self.subTest(length=length):
+                    reader, writer = await asyncio.open_connection(*service.address)
+                    writer.write(f"POST /combine HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode('latin-1'))
+                    await writer.drain()
+                    response = await reader.read()
+                    writer.close()
+                    self.assertEqual(int(response.split()[1]), 400)
+
+    def test_execute_batch_isolates_errors(self):
+        """Тест: ошибка одной операции не прерывает пакет"""
+        results = execute_batch([
+            ('combine', {'bpas': EXAMPLE_2_6}),
+            ('discount', {'bpa': EXAMPLE_2_6[0], 'alpha': 2.0}),
+        ])
+        self.assertTrue(results[0][0])
+        self.assertFalse(results[1][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
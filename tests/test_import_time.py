@@ -0,0 +1,59 @@
+import unittest
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Графические библиотеки, которые не должны загружаться без построения графиков
+PLOTTING_MODULES = ('matplotlib', 'seaborn', 'pandas', 'plotly')
+
+# Бюджет времени импорта в секундах (с большим запасом для медленных машин)
+IMPORT_BUDGET = 0.5
+
+
+def measure_import(statement: str) -> dict:
+    """Выполняет импорт в чистом интерпретаторе и возвращает время и загруженные модули"""
+    code = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [m for m in {PLOTTING_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=str(PROJECT_ROOT))
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+    """Тесты бюджета времени импорта"""
+
+    def test_core_import_is_fast(self):
+        """Тест: ядро импортируется быстро и без графических библиотек"""
+        result = measure_import("import dempster_core")
+        self.assertEqual(result['loaded'], [])
+        self.assertLess(result['elapsed'], IMPORT_BUDGET)
+
+    def test_adapters_import_is_fast(self):
+        """Тест: адаптеры данных импортируются без графических библиотек"""
+        result = measure_import("import data_adapters")
+        self.assertEqual(result['loaded'], [])
+        self.assertLess(result['elapsed'], IMPORT_BUDGET)
+
+    def test_batch_cli_import_is_fast(self):
+        """Тест: неинтерактивный режим командной строки не загружает графику"""
+        result = measure_import("import batch_fusion")
+        self.assertEqual(result['loaded'], [])
+        self.assertLess(result['elapsed'], IMPORT_BUDGET)
+
+    def test_main_defers_plotting(self):
+        """Тест: главный модуль и визуализатор не загружают графику до построения графика"""
+        result = measure_import("import main, visualizer")
+        self.assertEqual(result['loaded'], [])
+        self.assertLess(result['elapsed'], IMPORT_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer
+from monte_carlo import approximate_combine
+from synthetic_workload import WorkloadSpec, generate_workload
+
+FRAME = {'1', '2', '3', '4', '5', '6'}
+
+
+def random_bpa(rng: random.Random, elements):
+    """Случайная нормированная BPA с массой на Ω"""
+    bpa = {}
+    for _ in range(4):
+        subset = frozenset(rng.sample(elements, rng.randint(1, 4)))
+        bpa[subset] = bpa.get(subset, 0.0) + rng.randint(1, 9)
+    bpa[frozenset(elements)] = 3
+    total = sum(bpa.values())
+    return {subset: mass / total for subset, mass in bpa.items()}
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """Тесты приближенного комбинирования методом Монте-Карло"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.ds = DempsterShafer(FRAME)
+        rng = random.Random(3)
+        self.bpas = [random_bpa(rng, sorted(FRAME)) for _ in range(8)]
+        self.exact = self.ds.dempster_combine_multiple(*self.bpas)
+        self.queries = [{'1'}, {'1', '2'}, {'3', '4', '5'}]
+
+    def test_estimates_match_exact_combination(self):
+        """Тест: оценки Bel/Pl близки к точному правилу Демпстера"""
+        for method in ('importance', 'rejection'):
+            result = approximate_combine(self.ds, self.bpas, self.queries,
+                                         samples=20000, seed=1, method=method)
+            for i, query in enumerate(self.queries):
+                with self.subTest(method=method, query=sorted(query)):
+                    self.assertAlmostEqual(result.belief[i], self.ds.belief(query, self.exact), delta=0.02)
+                    self.assertAlmostEqual(result.plausibility[i],
+                                           self.ds.plausibility(query, self.exact), delta=0.02)
+                    low, high = result.belief_interval(i)
+                    self.assertLessEqual(low, result.belief[i])
+                    self.assertGreaterEqual(high, result.belief[i])
+
+    def test_seed_reproducible_across_workers(self):
+        """Тест: одно зерно дает одинаковый результат при любом числе процессов"""
+        single = approximate_combine(self.ds, self.bpas, self.queries, samples=4000,
+                                     seed=5, chunk_size=1000)
+        parallel = approximate_combine(self.ds, self.bpas, self.queries, samples=4000,
+                                       seed=5, chunk_size=1000, workers=2)
+        self.assertEqual(single.belief.tolist(), parallel.belief.tolist())
+        self.assertEqual(single.plausibility.tolist(), parallel.plausibility.tolist())
+
+    def test_error_target_stops_early(self):
+        """Тест: выборка прекращается при достижении требуемой точности"""
+        result = approximate_combine(self.ds, self.bpas, self.queries, samples=10 ** 6,
+                                     error_target=0.02, seed=2, chunk_size=1000)
+        self.assertLess(result.samples, 10 ** 6)
+        self.assertLessEqual(result.max_half_width, 0.02)
+
+    def test_high_conflict_many_sources(self):
+        """Тест: сотни источников с конфликтом, близким к 1 - выборка по значимости"""
+        rng = random.Random(8)
+        bpas = [random_bpa(rng, sorted(FRAME)) for _ in range(300)]
+        exact = DempsterShafer(FRAME, numeric_mode='log_commonality').dempster_combine_multiple(*bpas)
+        result = approximate_combine(self.ds, bpas, samples=10000, seed=3)
+        # 1 - K исчезающе мало: простая выборка с отбрасыванием здесь бесполезна
+        self.assertLess(result.log_normalizer, -100)
+        for i, element in enumerate(self.ds.elements):
+            self.assertAlmostEqual(result.belief[i], exact.get(frozenset({element}), 0.0), delta=0.03)
+        with self.assertRaises(ValueError):
+            approximate_combine(self.ds, bpas, samples=1000, seed=3, method='rejection')
+
+    def test_singleton_high_conflict(self):
+        """Тест: одноэлементные источники с конфликтом 0.9 - частицы не уходят в тупиковые ветви"""
+        for seed in range(6):
+            workload = generate_workload(WorkloadSpec(frame_size=6, source_count=8,
+                                                      cardinality='singleton', conflict=0.9), seed)
+            ds = workload.ds()
+            exact = ds.dempster_combine_multiple(*workload.bpas)
+            result = approximate_combine(ds, workload.bpas, samples=20000, seed=seed)
+            for i, element in enumerate(ds.elements):
+                with self.subTest(seed=seed, element=element):
+                    self.assertAlmostEqual(result.belief[i], exact.get(frozenset({element}), 0.0), delta=0.02)
+
+    def test_total_conflict(self):
+        """Тест: полный конфликт"""
+        ds = DempsterShafer({'1', '2'})
+        bpas = [{frozenset({'1'}): 1.0}, {frozenset({'2'}): 1.0}]
+        for method in ('importance', 'rejection'):
+            with self.subTest(method=method), self.assertRaises(ValueError):
+                approximate_combine(ds, bpas, samples=100, seed=0, method=method)
+
+    def test_unknown_method(self):
+        """Тест: неизвестный метод выборки"""
+        with self.assertRaises(ValueError):
+            approximate_combine(self.ds, self.bpas, method='mcmc')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_adapters import NdjsonWriter, iter_ndjson
+
+
+class TestNdjsonStream(unittest.TestCase):
+    """Тесты потоковой записи и чтения NDJSON"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        fd, self.path = tempfile.mkstemp(suffix='.ndjson')
+        os.close(fd)
+
+    def tearDown(self):
+        """Удаление временного файла"""
+        os.unlink(self.path)
+
+    def test_round_trip(self):
+        """Тест: BPA с ключами frozenset записываются и читаются без потерь"""
+        bpas = [
+            {frozenset({'2', '1'}): 0.25, frozenset({'10'}): 0.75, frozenset(): 0.0},
+            {frozenset({'А', 'Б'}): 1.0},
+        ]
+        with NdjsonWriter(self.path, buffer_lines=1) as writer:
+            for i, bpa in enumerate(bpas):
+                writer.write_bpa(bpa, id=i)
+        self.assertEqual(writer.count, 2)
+
+        records = list(iter_ndjson(self.path))
+        self.assertEqual([record['id'] for record in records], [0, 1])
+        self.assertEqual(records[0]['bpa'], {frozenset({'1', '2'}): 0.25, frozenset({'10'}): 0.75})
+        self.assertEqual(records[1]['bpa'], bpas[1])
+
+    def test_compact_canonical_lines(self):
+        """Тест: одна компактная строка на запись с каноническими подмножествами"""
+        with NdjsonWriter(self.path) as writer:
+            writer.write_bpa({frozenset({'3', '1'}): 1.0}, name='Тест')
+        with open(self.path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        self.assertEqual(content, '{"name":"Тест","bpa":{"{1,3}":1.0}}\n')
+
+    def test_buffered_flush(self):
+        """Тест: строки записываются блоками по buffer_lines"""
+        writer = NdjsonWriter(self.path, buffer_lines=10)
+        try:
+            for i in range(15):
+                writer.write({'i': i})
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.assertEqual(len(f.read().splitlines()), 10)
+        finally:
+            writer.close()
+        self.assertEqual([record['i'] for record in iter_ndjson(self.path)], list(range(15)))
+
+    def test_invalid_line(self):
+        """Тест: ошибка парсинга сообщает номер строки"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'bpa': {'{1}': 1.0}}) + '\n\n{broken\n')
+        with self.assertRaisesRegex(ValueError, 'строке 3'):
+            list(iter_ndjson(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import pickle
+import random
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer
+from numeric_modes import (
+    FLOAT32_TOLERANCE, LOG_COMMONALITY_TOLERANCE, PackedBPA, combine_packed
+)
+
+FRAME = {'1', '2', '3', '4', '5', '6'}
+
+
+def random_bpa(rng: random.Random, elements):
+    """Случайная нормированная BPA с массой на Ω"""
+    bpa = {}
+    for _ in range(4):
+        subset = frozenset(rng.sample(elements, rng.randint(1, len(elements) - 2)))
+        bpa[subset] = bpa.get(subset, 0.0) + rng.randint(1, 9)
+    bpa[frozenset(elements)] = 3
+    total = sum(bpa.values())
+    return {subset: mass / total for subset, mass in bpa.items()}
+
+
+def running_normalized_combine(ds, bpas):
+    """Последовательный Демпстер с нормировкой на фактическую сумму на каждом шаге"""
+    result = bpas[0]
+    for bpa in bpas[1:]:
+        combined = {}
+        for s1, m1 in result.items():
+            for s2, m2 in bpa.items():
+                intersection = s1 & s2
+                if intersection:
+                    combined[intersection] = combined.get(intersection, 0.0) + m1 * m2
+        total = sum(combined.values())
+        result = {subset: mass / total for subset, mass in combined.items()}
+    return result
+
+
+class TestNumericModes(unittest.TestCase):
+    """Тесты численных режимов float32 и log_commonality"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.rng = random.Random(11)
+        self.elements = sorted(FRAME)
+        self.reference = DempsterShafer(FRAME)
+
+    def assertBPAClose(self, actual, expected, tolerance):
+        keys = {k for k, v in actual.items() if v} | {k for k, v in expected.items() if v}
+        for subset in keys:
+            self.assertAlmostEqual(actual.get(subset, 0.0), expected.get(subset, 0.0),
+                                   delta=tolerance, msg=str(sorted(subset)))
+
+    def test_modes_match_float64_path(self):
+        """Тест: режимы совпадают с эталонным путем float64 в пределах допусков"""
+        for mode, tolerance in (('float32', FLOAT32_TOLERANCE),
+                                ('log_commonality', LOG_COMMONALITY_TOLERANCE)):
+            ds = DempsterShafer(FRAME, numeric_mode=mode)
+            for count in (2, 3, 5, 10):
+                bpas = [random_bpa(self.rng, self.elements) for _ in range(count)]
+                expected = self.reference.dempster_combine_multiple(*bpas)
+                with self.subTest(mode=mode, count=count):
+                    self.assertBPAClose(ds.dempster_combine_multiple(*bpas), expected, tolerance)
+                    self.assertBPAClose(ds.dempster_combine(bpas[0], bpas[1]),
+                                        self.reference.dempster_combine(bpas[0], bpas[1]), tolerance)
+
+    def test_example_2_6(self):
+        """Тест: пример из раздела 2.6 в режиме log_commonality"""
+        ds = DempsterShafer({'1', '2', '3', '4', '5'}, numeric_mode='log_commonality')
+        bpa1 = self.reference.calculate_bpa({"{1}": 2, "{1,2}": 1, "{3,4,5}": 1})
+        bpa2 = self.reference.calculate_bpa({"{1,2,3}": 3, "{4,5}": 1})
+        expected = DempsterShafer({'1', '2', '3', '4', '5'}).dempster_combine(bpa1, bpa2)
+        self.assertBPAClose(ds.dempster_combine(bpa1, bpa2), expected, LOG_COMMONALITY_TOLERANCE)
+
+    def test_many_sources_stay_normalized(self):
+        """Тест: тысячи источников - массы не теряются и совпадают с пошаговой нормировкой"""
+        bpas = [random_bpa(self.rng, self.elements) for _ in range(2000)]
+        expected = running_normalized_combine(self.reference, bpas)
+        for mode, tolerance in (('float32', FLOAT32_TOLERANCE),
+                                ('log_commonality', LOG_COMMONALITY_TOLERANCE)):
+            with self.subTest(mode=mode):
+                result = DempsterShafer(FRAME, numeric_mode=mode).dempster_combine_multiple(*bpas)
+                self.assertAlmostEqual(sum(result.values()), 1.0, delta=tolerance)
+                self.assertBPAClose(result, expected, tolerance)
+
+    def test_log_commonality_near_total_conflict(self):
+        """Тест: конфликт 1 - 1e-34 не приводит к делению на ноль"""
+        eps = 1e-17
+        bpa1 = {frozenset({'1'}): 1 - eps, frozenset({'2'}): eps}
+        bpa2 = {frozenset({'1'}): eps, frozenset({'2'}): 1 - eps}
+        ds = DempsterShafer({'1', '2'}, numeric_mode='log_commonality')
+        result = ds.dempster_combine(bpa1, bpa2)
+        self.assertAlmostEqual(result[frozenset({'1'})], 0.5)
+        self.assertAlmostEqual(result[frozenset({'2'})], 0.5)
+
+    def test_total_conflict(self):
+        """Тест: полный конфликт во всех режимах"""
+        bpa1 = {frozenset({'1'}): 1.0}
+        bpa2 = {frozenset({'2'}): 1.0}
+        for mode in ('float32', 'log_commonality'):
+            ds = DempsterShafer({'1', '2'}, numeric_mode=mode)
+            with self.subTest(mode=mode), self.assertRaises(ValueError):
+                ds.dempster_combine(bpa1, bpa2)
+
+    def test_packed_round_trip(self):
+        """Тест: упаковка BPA в массивы масок и масс float32"""
+        bpa = random_bpa(self.rng, self.elements)
+        packed = PackedBPA.from_bpa(self.reference, bpa)
+        self.assertEqual(len(packed), len(bpa))
+        self.assertEqual(packed.nbytes, len(bpa) * (8 + 4))
+        self.assertBPAClose(packed.to_bpa(self.reference), bpa, FLOAT32_TOLERANCE)
+
+        combined = combine_packed(packed, packed).to_bpa(self.reference)
+        self.assertBPAClose(combined, self.reference.dempster_combine(bpa, bpa), FLOAT32_TOLERANCE)
+
+        buffers = []
+        data = pickle.dumps(packed, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(sum(buffer.raw().nbytes for buffer in buffers), packed.nbytes)
+        restored = pickle.loads(data, buffers=buffers)
+        self.assertEqual(restored.to_bpa(self.reference), packed.to_bpa(self.reference))
+
+    def test_unknown_mode(self):
+        """Тест: неизвестный численный режим"""
+        with self.assertRaises(ValueError):
+            DempsterShafer(FRAME, numeric_mode='float16')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import out_of_core
+from dempster_core import DempsterShafer
+from out_of_core import combine_out_of_core
+from synthetic_workload import WorkloadSpec, generate_workload
+
+
+class TestOutOfCore(unittest.TestCase):
+    """Тесты комбинирования во внешней памяти"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        spec = WorkloadSpec(frame_size=12, source_count=4, focal_count=25, conflict=0.4)
+        self.workload = generate_workload(spec, 2)
+        self.ds = self.workload.ds()
+        self.expected = self.ds.dempster_combine_multiple(*self.workload.bpas)
+
+    def assertBpaAlmostEqual(self, bpa1, bpa2, places=12):
+        """Сравнение BPA с точностью до нулевых масс"""
+        for subset in set(bpa1) | set(bpa2):
+            self.assertAlmostEqual(bpa1.get(subset, 0.0), bpa2.get(subset, 0.0), places=places)
+
+    def test_matches_in_memory(self):
+        """Тест: результат совпадает с комбинированием в памяти"""
+        with combine_out_of_core(self.ds, self.workload.bpas) as result:
+            directory = result.directory
+            self.assertEqual(len(result), sum(1 for m in self.expected.values() if m))
+            self.assertBpaAlmostEqual(result.to_bpa(self.ds), self.expected)
+        self.assertFalse(os.path.exists(directory))
+
+    def test_small_memory_limit_spills(self):
+        """Тест: маленький лимит - много блоков, корзин и повторное разбиение"""
+        with tempfile.TemporaryDirectory() as directory:
+            result = combine_out_of_core(self.ds, self.workload.bpas, memory_limit=4096,
+                                         directory=directory)
+            self.assertBpaAlmostEqual(result.to_bpa(self.ds), self.expected)
+            # Файлы лежат в собственном подкаталоге; остались только выходные файлы последнего шага
+            self.assertEqual(os.path.dirname(result.directory), directory)
+            self.assertEqual(sorted(os.listdir(result.directory)), ['step2-masks.bin', 'step2-masses.bin'])
+            blocks = list(result.blocks(100))
+            self.assertEqual(sum(len(block) for block in blocks), len(result))
+
+            restored = pickle.loads(pickle.dumps(result))
+            self.assertEqual(restored.to_bpa(self.ds), result.to_bpa(self.ds))
+            result.cleanup()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_shared_directory(self):
+        """Тест: вызовы с одним каталогом не перезаписывают файлы друг друга"""
+        with tempfile.TemporaryDirectory() as directory:
+            first = combine_out_of_core(self.ds, self.workload.bpas, directory=directory)
+            second = combine_out_of_core(self.ds, self.workload.bpas[:2], directory=directory)
+            self.assertNotEqual(first.directory, second.directory)
+            self.assertBpaAlmostEqual(first.to_bpa(self.ds), self.expected)
+            second.cleanup()
+            self.assertBpaAlmostEqual(first.to_bpa(self.ds), self.expected)
+            first.cleanup()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_bucket_over_limit_at_max_depth(self):
+        """Тест: корзина сверх лимита после MAX_DEPTH разбиений - ошибка, а не загрузка целиком"""
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.object(out_of_core, 'MAX_DEPTH', 0):
+                with self.assertRaises(ValueError):
+                    combine_out_of_core(self.ds, self.workload.bpas, memory_limit=4096,
+                                        directory=directory)
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_single_source(self):
+        """Тест: один источник нормируется без изменения"""
+        bpa = self.workload.bpas[0]
+        with combine_out_of_core(self.ds, [bpa]) as result:
+            self.assertBpaAlmostEqual(result.to_bpa(self.ds), bpa)
+
+    def test_total_conflict(self):
+        """Тест: полный конфликт и временный каталог удаляется"""
+        ds = DempsterShafer({'1', '2'})
+        before = set(os.listdir(tempfile.gettempdir()))
+        with self.assertRaises(ValueError):
+            combine_out_of_core(ds, [{frozenset({'1'}): 1.0}, {frozenset({'2'}): 1.0}])
+        leftover = {name for name in set(os.listdir(tempfile.gettempdir())) - before
+                    if name.startswith('ds-spill-')}
+        self.assertEqual(leftover, set())
+
+    def test_invalid_arguments(self):
+        """Тест: некорректные параметры"""
+        with self.assertRaises(ValueError):
+            combine_out_of_core(self.ds, [])
+        with self.assertRaises(ValueError):
+            combine_out_of_core(self.ds, self.workload.bpas, memory_limit=out_of_core.RECORD.itemsize)
+        with self.assertRaises(ValueError):
+            combine_out_of_core(DempsterShafer({str(i) for i in range(65)}), self.workload.bpas)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer
+from sensitivity import discount_grid, discount_sweep, random_discounts
+from synthetic_workload import WorkloadSpec, generate_workload
+
+
+class TestDiscountSweep(unittest.TestCase):
+    """Тесты анализа чувствительности к коэффициентам дисконтирования"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        workload = generate_workload(WorkloadSpec(frame_size=5, source_count=4, conflict=0.5), 3)
+        self.ds = workload.ds()
+        self.bpas = workload.bpas
+        self.targets = [{'1'}, {'2', '3'}, set(self.ds.frame), set()]
+
+    def reference(self, alphas):
+        combined = self.ds.dempster_combine_discounted(self.bpas, list(alphas))
+        return ([self.ds.belief(t, combined) for t in self.targets],
+                [self.ds.plausibility(t, combined) for t in self.targets])
+
+    def test_expansion_matches_recombination(self):
+        """Тест: полилинейное разложение совпадает с пересчетом в каждой точке"""
+        alphas = discount_grid([0.0, 0.3, 1.0], len(self.bpas))
+        self.assertEqual(alphas.shape, (81, 4))
+        result = discount_sweep(self.ds, self.bpas, alphas, self.targets, method='expansion')
+        for p, point in enumerate(alphas):
+            belief, plausibility = self.reference(point)
+            np.testing.assert_allclose(result.belief[p], belief, atol=1e-12)
+            np.testing.assert_allclose(result.plausibility[p], plausibility, atol=1e-12)
+
+    def test_methods_and_workers_agree(self):
+        """Тест: методы expansion/direct и пул процессов дают одинаковый результат"""
+        alphas = random_discounts(60, len(self.bpas), seed=1)
+        expansion = discount_sweep(self.ds, self.bpas, alphas, self.targets, method='expansion')
+        direct = discount_sweep(self.ds, self.bpas, alphas, self.targets, method='direct',
+                                workers=2, chunk_size=25)
+        np.testing.assert_allclose(expansion.belief, direct.belief, atol=1e-12)
+        np.testing.assert_allclose(expansion.plausibility, direct.plausibility, atol=1e-12)
+        np.testing.assert_allclose(expansion.conflict, direct.conflict, atol=1e-12)
+
+        records = expansion.as_records()
+        self.assertEqual(len(records), 60)
+        self.assertAlmostEqual(records[0]['plausibility']['{}'], 0.0)
+
+    def test_total_conflict_point(self):
+        """Тест: точка с полным конфликтом получает NaN, остальные считаются"""
+        ds = DempsterShafer({'1', '2'})
+        bpas = [{frozenset({'1'}): 1.0}, {frozenset({'2'}): 1.0}]
+        result = discount_sweep(ds, bpas, [[0.0, 0.0], [0.5, 0.0]], [{'1'}, {'2'}])
+        self.assertTrue(np.isnan(result.belief[0]).all())
+        self.assertAlmostEqual(result.conflict[0], 1.0)
+        np.testing.assert_allclose(result.belief[1], [0.0, 1.0])
+
+    def test_invalid_arguments(self):
+        """Тест: некорректные коэффициенты и метод"""
+        with self.assertRaises(ValueError):
+            discount_sweep(self.ds, self.bpas, [[1.5, 0, 0, 0]], self.targets)
+        with self.assertRaises(ValueError):
+            discount_sweep(self.ds, self.bpas, [[0, 0, 0, 0]], self.targets, method='newton')
+        with self.assertRaises(ValueError):
+            discount_sweep(self.ds, self.bpas * 4, np.zeros((1, 16)), self.targets, method='expansion')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dempster_core import DempsterShafer
+from shared_bpa import SharedBPAStore, parallel_combine
+
+FRAME = {'1', '2', '3', '4', '5', '6'}
+
+
+def random_bpa(rng: random.Random, elements):
+    """Случайная нормированная BPA с массой на Ω"""
+    bpa = {}
+    for _ in range(4):
+        subset = frozenset(rng.sample(elements, rng.randint(1, 4)))
+        bpa[subset] = bpa.get(subset, 0.0) + rng.randint(1, 9)
+    bpa[frozenset(elements)] = 3
+    total = sum(bpa.values())
+    return {subset: mass / total for subset, mass in bpa.items()}
+
+
+def read_in_worker(name, i):
+    """Чтение BPA из хранилища в другом процессе"""
+    with SharedBPAStore.attach(name) as store:
+        return store.get_bpa(i)
+
+
+def write_in_worker(name, i):
+    """Запись BPA в хранилище из другого процесса"""
+    with SharedBPAStore.attach(name) as store:
+        store.set_bpa(i, {frozenset({'1'}): 0.25, frozenset({'2', '3'}): 0.75})
+
+
+class TestSharedBPAStore(unittest.TestCase):
+    """Тесты хранилища BPA в разделяемой памяти"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        self.ds = DempsterShafer(FRAME)
+        rng = random.Random(5)
+        self.bpas = [random_bpa(rng, sorted(FRAME)) for _ in range(12)]
+
+    def assertBPAEqual(self, actual, expected):
+        keys = {k for k, v in actual.items() if v} | {k for k, v in expected.items() if v}
+        for subset in keys:
+            self.assertAlmostEqual(actual.get(subset, 0.0), expected.get(subset, 0.0))
+
+    def test_round_trip(self):
+        """Тест: BPA читаются из хранилища без изменений"""
+        with SharedBPAStore.from_bpas(self.ds, self.bpas) as store:
+            self.assertEqual(len(store), len(self.bpas))
+            for i, bpa in enumerate(self.bpas):
+                self.assertBPAEqual(store.get_bpa(i), bpa)
+
+    def test_attach_from_other_process(self):
+        """Тест: другой процесс читает и пишет BPA по имени блока"""
+        with SharedBPAStore.from_bpas(self.ds, self.bpas) as store, \
+                ProcessPoolExecutor(max_workers=1) as executor:
+            self.assertBPAEqual(executor.submit(read_in_worker, store.name, 3).result(), self.bpas[3])
+            executor.submit(write_in_worker, store.name, 0).result()
+            self.assertBPAEqual(store.get_bpa(0), {frozenset({'1'}): 0.25, frozenset({'2', '3'}): 0.75})
+
+    def test_attached_view_is_zero_copy(self):
+        """Тест: изменения через одно подключение видны в другом без копирования"""
+        with SharedBPAStore.from_bpas(self.ds, self.bpas) as store, \
+                SharedBPAStore.attach(store.name) as view:
+            store.packed(2).masses[0] = 0.5
+            self.assertEqual(view.packed(2).masses[0], 0.5)
+
+    def test_parallel_combine(self):
+        """Тест: параллельное комбинирование совпадает с последовательным"""
+        expected = self.ds.dempster_combine_multiple(*self.bpas)
+        with SharedBPAStore.from_bpas(self.ds, self.bpas) as store:
+            self.assertBPAEqual(parallel_combine(store, workers=2, chunks=3), expected)
+
+    def test_capacity_and_release(self):
+        """Тест: запись сверх емкости слота и удаление блока владельцем"""
+        store = SharedBPAStore.create(FRAME, [1, 2])
+        with self.assertRaises(ValueError):
+            store.set_bpa(0, self.bpas[0])
+        name = store.name
+        store.release()
+        with self.assertRaises(FileNotFoundError):
+            SharedBPAStore.attach(name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Добавляем путь к родительской директории
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import combination_rules
+import sliding_window
+from dempster_core import DempsterShafer
+from sliding_window import SlidingWindowFuser, fuse_stream
+from synthetic_workload import WorkloadSpec, generate_workload
+
+
+class TestSlidingWindowFuser(unittest.TestCase):
+    """Тесты комбинирования по скользящему окну"""
+
+    def setUp(self):
+        """Настройка перед каждым тестом"""
+        workload = generate_workload(WorkloadSpec(frame_size=5, source_count=40, conflict=0.3), 11)
+        self.ds = workload.ds()
+        self.bpas = workload.bpas
+
+    def assertBpaAlmostEqual(self, bpa1, bpa2, places=10):
+        """Сравнение BPA с точностью до нулевых масс"""
+        for subset in set(bpa1) | set(bpa2):
+            self.assertAlmostEqual(bpa1.get(subset, 0.0), bpa2.get(subset, 0.0), places=places)
+
+    def smets_multiple(self, bpas):
+        omega = frozenset(self.ds.frame)
+        result = bpas[0]
+        for bpa in bpas[1:]:
+            result = combination_rules.combine(result, bpa, ('smets',), omega)['smets']
+        return result
+
+    def test_count_window_matches_recombination(self):
+        """Тест: окно по числу совпадает с комбинированием последних W отчетов"""
+        for rule in ('dempster', 'smets'):
+            fuser = SlidingWindowFuser(self.ds, size=7, rule=rule)
+            for i, bpa in enumerate(self.bpas):
+                fuser.push('sensor', bpa)
+                window = self.bpas[max(0, i - 6):i + 1]
+                expected = (self.ds.dempster_combine_multiple(*window) if rule == 'dempster'
+                            else self.smets_multiple(window))
+                with self.subTest(rule=rule, tick=i):
+                    self.assertBpaAlmostEqual(fuser.fused('sensor'), expected)
+            self.assertEqual(fuser.window_length('sensor'), 7)
+
+    def test_amortized_combinations(self):
+        """Тест: в среднем O(1) комбинирований на отчет независимо от размера окна"""
+        calls = []
+        original = sliding_window.conjunctive_pass
+
+        def counting(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+
+        sliding_window.conjunctive_pass = counting
+        try:
+            fuser = SlidingWindowFuser(self.ds, size=20)
+            for bpa in self.bpas * 5:
+                fuser.push('sensor', bpa)
+                fuser.fused('sensor')
+        finally:
+            sliding_window.conjunctive_pass = original
+        self.assertLessEqual(len(calls), 4 * len(self.bpas) * 5)
+
+    def test_time_window(self):
+        """Тест: окно по времени вытесняет устаревшие отчеты"""
+        fuser = SlidingWindowFuser(self.ds, duration=10.0)
+        times = [0.0, 3.0, 9.0, 12.0, 25.0]
+        for t, bpa in zip(times, self.bpas):
+            fuser.push('a', bpa, t)
+        # В окне (15, 25] остался только последний отчет
+        self.assertEqual(fuser.window_length('a'), 1)
+        self.assertBpaAlmostEqual(fuser.fused('a'), self.ds.dempster_combine_multiple(self.bpas[4]))
+
+        fuser.push('a', self.bpas[5], 30.0)
+        self.assertBpaAlmostEqual(fuser.fused('a'), self.ds.dempster_combine(self.bpas[4], self.bpas[5]))
+        self.assertEqual(fuser.fused('a', now=100.0), {frozenset(self.ds.frame): 1.0})
+        with self.assertRaises(ValueError):
+            fuser.push('a', self.bpas[6], 5.0)
+        with self.assertRaises(ValueError):
+            fuser.push('b', self.bpas[6])
+
+    def test_entities_are_independent(self):
+        """Тест: окна разных сущностей не смешиваются"""
+        reports = [(i % 3, float(i), bpa) for i, bpa in enumerate(self.bpas[:12])]
+        last = {}
+        for entity, _, fused in fuse_stream(self.ds, reports, size=2):
+            last[entity] = fused
+        for entity in range(3):
+            own = [bpa for e, _, bpa in reports if e == entity][-2:]
+            self.assertBpaAlmostEqual(last[entity], self.ds.dempster_combine_multiple(*own))
+
+    def test_total_conflict(self):
+        """Тест: полный конфликт в окне по Демпстеру и по Сметсу"""
+        ds = DempsterShafer({'1', '2'})
+        a, b = {frozenset({'1'}): 1.0}, {frozenset({'2'}): 1.0}
+        fuser = SlidingWindowFuser(ds, size=2)
+        fuser.push('x', a)
+        fuser.push('x', b)
+        with self.assertRaises(ValueError):
+            fuser.fused('x')
+        fuser.push('x', b)
+        self.assertAlmostEqual(fuser.fused('x')[frozenset({'2'})], 1.0)
+
+        smets = SlidingWindowFuser(ds, size=2, rule='smets')
+        smets.push('x', a)
+        smets.push('x', b)
+        self.assertAlmostEqual(smets.fused('x')[frozenset()], 1.0)
+
+    def test_long_window_stays_normalized(self):
+        """Тест: длинное окно одинаковых отчетов остается нормированным и не дает ложного конфликта"""
+        ds = DempsterShafer({'1', '2'})
+        report = {frozenset({'1'}): 0.6, frozenset({'2'}): 0.4}
+        for size in (60, 100, 3000):
+            fuser = SlidingWindowFuser(ds, size=size)
+            for _ in range(size + 5):
+                fuser.push('x', report)
+            fused = fuser.fused('x')
+            with self.subTest(size=size):
+                self.assertAlmostEqual(sum(fused.values()), 1.0, places=12)
+                if size <= 100:
+                    self.assertBpaAlmostEqual(fused, ds.dempster_combine_multiple(*[report] * size))
+                else:
+                    # 0.4^3000 уходит в ноль в любом порядке вычислений
+                    self.assertAlmostEqual(fused[frozenset({'1'})], 1.0)
+
+        smets = SlidingWindowFuser(ds, size=3000, rule='smets')
+        for _ in range(3000):
+            smets.push('x', report)
+        self.assertAlmostEqual(smets.fused('x')[frozenset()], 1.0)
+
+    def test_invalid_parameters(self):
+        """Тест: некорректные параметры окна"""
+        with self.assertRaises(ValueError):
+            SlidingWindowFuser(self.ds)
+        with self.assertRaises(ValueError):
+            SlidingWindowFuser(self.ds, size=0)
+        with self.assertRaises(ValueError):
+            SlidingWindowFuser(self.ds, size=3, rule='yager')
+
+
+if __name__ == '__main__':
+    unittest.main()
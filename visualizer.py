@@ -1,22 +1,44 @@
 """
 Улучшенная визуализация с использованием последних версий библиотек
 """
-import matplotlib.pyplot as plt
-import numpy as np
-import seaborn as sns
-import pandas as pd
+# Графические библиотеки импортируются лениво (см. _load_plotting_backend):
+# их загрузка занимает больше секунды, а ядро и консольный режим без графиков
+# не должны платить за неё при старте.
+plt = None
+np = None
+sns = None
+pd = None
+go = None
+PLOTLY_AVAILABLE = None
 
-try:
-    from plotly import graph_objects as go
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-    print("Plotly не установлен. Интерактивные графики будут недоступны.")
+
+def _load_plotting_backend():
+    """Загружает matplotlib, seaborn, pandas, NumPy и Plotly при первом построении графика"""
+    global plt, np, sns, pd, go, PLOTLY_AVAILABLE
+    if plt is not None:
+        return
+
+    import matplotlib.pyplot as _plt
+    import numpy as _np
+    import seaborn as _sns
+    import pandas as _pd
+
+    try:
+        from plotly import graph_objects as _go
+        go = _go
+        PLOTLY_AVAILABLE = True
+    except ImportError:
+        PLOTLY_AVAILABLE = False
+        print("Plotly не установлен. Интерактивные графики будут недоступны.")
+
+    np, sns, pd = _np, _sns, _pd
+    plt = _plt
 
 class DSVisualizer:
     """Улучшенный визуализатор с использованием современных библиотек"""
     
     def __init__(self):
+        _load_plotting_backend()
         # Настраиваем стиль для лучшего отображения
         plt.style.use('default')
         sns.set_theme(style="whitegrid")
@@ -32,6 +54,7 @@ class DSVisualizer:
     @staticmethod
     def plot_belief_plausibility(bpa, title="Функции доверия и правдоподобия"):
         """Визуализация Bel и Pl с использованием современных возможностей"""
+        _load_plotting_backend()
         elements = set()
         for subset in bpa.keys():
             elements.update(subset)
@@ -107,6 +130,7 @@ class DSVisualizer:
     @staticmethod
     def plot_bpa_distribution(bpa, title="Распределение базовых вероятностей"):
         """Улучшенная визуализация распределения BPA"""
+        _load_plotting_backend()
         # Создаем DataFrame для визуализации
         subsets = []
         masses = []
@@ -167,6 +191,7 @@ class DSVisualizer:
     @staticmethod
     def create_interactive_plot(bpa, title="Интерактивная визуализация"):
         """Интерактивная визуализация с использованием Plotly"""
+        _load_plotting_backend()
         if not PLOTLY_AVAILABLE:
             print("Plotly не установлен. Используйте: pip install plotly")
             return None
@@ -218,6 +243,7 @@ class DSVisualizer:
     @staticmethod
     def compare_combination_methods(bpa1, bpa2, dempster_result, yager_result, title="Сравнение методов комбинирования"):
         """Сравнение правил Демпстера и Ягера"""
+        _load_plotting_backend()
         # Получаем все элементарные события из фрейма
         elements = set()
         for bpa in [bpa1, bpa2]:
@@ -296,6 +322,7 @@ class DSVisualizer:
     @staticmethod
     def plot_interval_comparison(results_dict, title="Сравнение интервалов доверия"):
         """Сравнение интервалов [Bel, Pl] для разных методов или сценариев"""
+        _load_plotting_backend()
         fig, ax = plt.subplots(figsize=(12, 8))
         
         scenarios = list(results_dict.keys())
@@ -342,6 +369,7 @@ class DSVisualizer:
     @staticmethod
     def compare_combination_methods_detailed(bpa1, bpa2, dempster_result, yager_result, title="Детальное сравнение методов"):
         """Детальное сравнение с отображением ВСЕХ множеств"""
+        _load_plotting_backend()
         
         # Собираем ВСЕ множества из всех источников
         all_subsets = set()